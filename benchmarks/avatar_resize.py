@@ -0,0 +1,63 @@
+"""
+Measure the avatar pre-processing stage on representative image sizes.
+
+For each source image the benchmark reports the uploaded size before and
+after resize_avatar and the time one resize takes. Sources are synthetic
+noisy photos, so JPEG and PNG sizes are close to real camera output.
+
+Run from the repository root:
+
+    python -m benchmarks.avatar_resize
+"""
+
+import io
+import os
+import timeit
+
+from PIL import Image
+
+from src.services.uplaod import resize_avatar
+
+SOURCES = [
+    ("640x480 jpeg", (640, 480), "JPEG"),
+    ("1920x1080 jpeg", (1920, 1080), "JPEG"),
+    ("4032x3024 jpeg", (4032, 3024), "JPEG"),
+    ("1024x1024 png", (1024, 1024), "PNG"),
+]
+NUMBER = 5
+
+
+def build_source(size: tuple, image_format: str) -> bytes:
+    """
+    Build a synthetic photo.
+    Parameters:
+    - size (tuple): Width and height of the image.
+    - image_format (str): Pillow format name.
+    Returns:
+    - bytes: The encoded image.
+    """
+    gradient = Image.linear_gradient("L").resize(size)
+    noise = Image.frombytes("L", size, os.urandom(size[0] * size[1]))
+    img = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.ROTATE_180)))
+    out = io.BytesIO()
+    img.save(out, format=image_format, quality=90)
+    return out.getvalue()
+
+
+def main():
+    print(f"{'source':<18}{'format':<8}{'in KiB':>10}{'out KiB':>10}{'ms':>10}")
+    for label, size, source_format in SOURCES:
+        data = build_source(size, source_format)
+        for image_format in ("webp", "jpeg"):
+            result = resize_avatar(data, 250, image_format, 80)
+            seconds = timeit.timeit(
+                lambda: resize_avatar(data, 250, image_format, 80), number=NUMBER
+            )
+            print(
+                f"{label:<18}{image_format:<8}{len(data) / 1024:>10.0f}"
+                f"{len(result) / 1024:>10.1f}{seconds / NUMBER * 1000:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
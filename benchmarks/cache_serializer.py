@@ -0,0 +1,93 @@
+"""
+Compare the versioned JSON cache serializer with the pickle serializer.
+
+Run from the repository root:
+
+    python -m benchmarks.cache_serializer
+"""
+
+import timeit
+from datetime import date, datetime
+
+from aiocache.serializers import PickleSerializer
+
+from src.database.models import Contact, User, UserRole
+from src.schemas.schemas import ContactResponse
+from src.services.cache import VersionedJsonSerializer, user_to_snapshot
+
+NUMBER = 2000
+
+
+def build_payloads():
+    """
+    Build the values the application caches, in their old and new shapes.
+    Returns:
+    - dict: Payload name mapped to (pickle value, JSON value).
+    """
+    user = User(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        avatar="https://example.com/avatar.jpg",
+        confirmed=True,
+        role=UserRole.USER,
+        created_at=datetime(2025, 1, 1, 12, 0),
+        hashed_password="$2b$12$" + "x" * 53,
+    )
+    contacts = [
+        Contact(
+            id=i,
+            name=f"Name{i}",
+            last_name=f"LastName{i}",
+            email=f"contact{i}@example.com",
+            phone="111-222-3333",
+            birthday=date(1990, 1, 1 + i % 28),
+            additional_data="Met at the conference",
+            user_id=1,
+        )
+        for i in range(50)
+    ]
+    responses = [
+        ContactResponse.model_validate(c, from_attributes=True) for c in contacts
+    ]
+    return {
+        "user": (user, user_to_snapshot(user)),
+        "birthdays (50 contacts)": (
+            contacts,
+            [r.model_dump(mode="json") for r in responses],
+        ),
+    }
+
+
+def measure(serializer, value):
+    """
+    Measure size and encode/decode time of one value.
+    Parameters:
+    - serializer: aiocache serializer.
+    - value: Value to serialize.
+    Returns:
+    - tuple: (bytes, encode microseconds, decode microseconds).
+    """
+    data = serializer.dumps(value)
+    encode = timeit.timeit(lambda: serializer.dumps(value), number=NUMBER)
+    decode = timeit.timeit(lambda: serializer.loads(data), number=NUMBER)
+    return len(data), encode / NUMBER * 1e6, decode / NUMBER * 1e6
+
+
+def main():
+    pickle_serializer = PickleSerializer()
+    json_serializer = VersionedJsonSerializer()
+    print(
+        f"{'payload':<26}{'serializer':<12}{'bytes':>8}{'encode us':>12}{'decode us':>12}"
+    )
+    for name, (orm_value, json_value) in build_payloads().items():
+        for label, serializer, value in (
+            ("pickle", pickle_serializer, orm_value),
+            ("json-v1", json_serializer, json_value),
+        ):
+            size, encode, decode = measure(serializer, value)
+            print(f"{name:<26}{label:<12}{size:>8}{encode:>12.1f}{decode:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
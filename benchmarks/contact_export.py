@@ -0,0 +1,101 @@
+"""
+Measure the peak memory and throughput of the streaming contact export.
+
+"load all" reads every contact with one query into a list, as a
+non-streaming export would, and renders the whole file at once. "stream"
+consumes ContactService.export_contacts chunk by chunk, the way
+StreamingResponse sends it. Peak memory is measured with tracemalloc
+against in-memory SQLite for growing numbers of contacts.
+
+Run from the repository root:
+
+    python -m benchmarks.contact_export
+"""
+
+import asyncio
+import time
+import tracemalloc
+from datetime import date
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database.models import Base, Contact, User
+from src.repository.contacts import EXPORT_COLUMNS
+from src.services.contact_export import EXPORT_FORMATS
+from src.services.contacts import ContactService
+
+SIZES = (10_000, 50_000)
+
+
+async def measure(func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = await func()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, seconds, peak
+
+
+async def run(count: int):
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_maker() as session:
+        user = User(username="user", email="user@example.com", role="user")
+        session.add(user)
+        await session.commit()
+        await session.execute(
+            insert(Contact),
+            [
+                {
+                    "name": f"Name{i}",
+                    "last_name": f"Last{i}",
+                    "email": f"c{i}@example.com",
+                    "phone": f"000-{i}",
+                    "birthday": date(1990, 1, i % 28 + 1),
+                    "user_id": user.id,
+                }
+                for i in range(count)
+            ],
+        )
+        await session.commit()
+
+        async def load_all():
+            result = await session.execute(
+                select(*EXPORT_COLUMNS).where(Contact.user_id == user.id)
+            )
+            csv_format = EXPORT_FORMATS["csv"]
+            return len((csv_format.header + csv_format.render(result.all())).encode())
+
+        async def stream():
+            size = 0
+            async for chunk in ContactService(session).export_contacts(user, "csv"):
+                size += len(chunk)
+            return size
+
+        results = [("load all", *await measure(load_all))]
+        results.append(("stream", *await measure(stream)))
+    await engine.dispose()
+    for label, size, seconds, peak in results:
+        print(
+            f"{count:>8}{label:>10}{size / 2**20:>10.1f}"
+            f"{count / seconds:>10.0f}{peak / 2**20:>10.1f}"
+        )
+
+
+async def main():
+    print(f"{'rows':>8}{'mode':>10}{'MiB out':>10}{'rows/s':>10}{'peak MiB':>10}")
+    for count in SIZES:
+        await run(count)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
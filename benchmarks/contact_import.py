@@ -0,0 +1,93 @@
+"""
+Measure the bulk contact import against creating contacts one by one.
+
+"create_contact" posts every row through ContactRepository.create_contact,
+one INSERT and one commit per contact, which is what a client without the
+import endpoint has to do. "import" streams the same rows as CSV through
+ContactService.import_contacts. Both run against in-memory SQLite, so the
+numbers show the statement and commit overhead, not network round trips,
+which make the difference larger on PostgreSQL.
+
+Run from the repository root:
+
+    python -m benchmarks.contact_import
+"""
+
+import asyncio
+import time
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import src.services.contacts as contacts_service
+from src.database.models import Base, User
+from src.repository.contacts import ContactRepository
+from src.schemas.schemas import ContactBase
+from src.services.contact_import import iter_csv_records
+from src.services.contacts import ContactService
+
+ROWS = 20_000
+CHUNK = 64 * 1024
+
+
+def csv_body(prefix: str) -> bytes:
+    lines = ["name,last_name,email,phone,birthday\n"]
+    lines += [
+        f"Name{i},Last{i},{prefix}{i}@example.com,000-{i},1990-01-{i % 28 + 1:02d}\n"
+        for i in range(ROWS)
+    ]
+    return "".join(lines).encode()
+
+
+async def chunks(data: bytes):
+    for start in range(0, len(data), CHUNK):
+        yield data[start : start + CHUNK]
+
+
+async def main():
+    contacts_service.get_cache = lambda: MagicMock(delete=AsyncMock())
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_maker() as session:
+        user = User(username="user", email="user@example.com", role="user")
+        session.add(user)
+        await session.commit()
+
+        repository = ContactRepository(session)
+        started = time.perf_counter()
+        for i in range(ROWS):
+            await repository.create_contact(
+                ContactBase(
+                    name=f"Name{i}",
+                    last_name=f"Last{i}",
+                    email=f"single{i}@example.com",
+                    phone=f"000-{i}",
+                    birthday=date(1990, 1, i % 28 + 1),
+                ),
+                user,
+            )
+        single = time.perf_counter() - started
+
+        started = time.perf_counter()
+        result = await ContactService(session).import_contacts(
+            iter_csv_records(chunks(csv_body("bulk"))), user
+        )
+        bulk = time.perf_counter() - started
+    await engine.dispose()
+
+    assert result.imported == ROWS, result
+    print(f"{'mode':<16}{'rows':>8}{'seconds':>10}{'rows/s':>10}")
+    for label, seconds in (("create_contact", single), ("import", bulk)):
+        print(f"{label:<16}{ROWS:>8}{seconds:>10.2f}{ROWS / seconds:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+Measure the CPU cost of rendering an email per message.
+
+"lookup per message" reproduces what fastapi-mail did for every message. It
+created a new Jinja environment and looked up the template, which means
+parsing and compiling it again. "previous build" adds the EmailMessage that
+was built before this change. "compiled cache" renders the template that
+src.services.email compiled at import. "build_message" is the full message
+build: cached render plus the MIME message.
+
+Run from the repository root:
+
+    python -m benchmarks.email_render
+"""
+
+import timeit
+from email.message import EmailMessage
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from src.config.config import config
+from src.services.email import build_message, compiled_templates
+
+NUMBER = 2000
+FOLDER = Path(__file__).parent.parent / "src" / "services" / "templates"
+CONTEXTS = {
+    "email_verify.html": {
+        "host": "http://localhost:8000/",
+        "username": "user",
+        "token": "x" * 180,
+    },
+    "reset_password.html": {
+        "reset_link": "http://localhost:8000/api/auth/confirm_reset_password/"
+        + "x" * 250,
+        "username": "user",
+    },
+}
+
+
+def lookup_per_message(name: str, context: dict) -> str:
+    env = Environment(
+        loader=FileSystemLoader(FOLDER), autoescape=select_autoescape(["html"])
+    )
+    return env.get_template(name).render(**context)
+
+
+def previous_build(name: str, context: dict) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = "Subject"
+    message["From"] = config.MAIL_FROM
+    message["To"] = "user@example.com"
+    message.set_content(lookup_per_message(name, context), subtype="html")
+    return message
+
+
+def main():
+    config.MAIL_FROM = config.MAIL_FROM or "noreply@example.com"
+    print(f"{'template':<22}{'mode':<22}{'us/message':>12}")
+    for name, context in CONTEXTS.items():
+        cases = [
+            ("lookup per message", lambda: lookup_per_message(name, context)),
+            ("previous build", lambda: previous_build(name, context)),
+            ("compiled cache", lambda: compiled_templates[name].render(**context)),
+            (
+                "build_message",
+                lambda: build_message("user@example.com", "Subject", name, **context),
+            ),
+        ]
+        for label, func in cases:
+            seconds = timeit.timeit(func, number=NUMBER)
+            print(f"{name:<22}{label:<22}{seconds / NUMBER * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Measure how a burst of logins affects the latency of an unrelated endpoint.
+
+A small app exposes /login, which verifies a bcrypt password, and /ping,
+which does no work. While a burst of logins is in flight, /ping is polled on
+a fixed schedule and its latency percentiles are reported, once with bcrypt called inline (the old
+behaviour) and once through the password hash worker pool.
+
+Run from the repository root:
+
+    python -m benchmarks.login_load
+"""
+
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from src.services.auth import Hash, password_hash_pool
+
+LOGINS = 16
+PINGS = 200
+INTERVAL = 0.01
+
+
+def build_app(hashed_password: str, inline: bool) -> FastAPI:
+    """
+    Build the benchmark application.
+    Parameters:
+    - hashed_password (str): bcrypt hash the logins are verified against.
+    - inline (bool): Verify passwords on the event loop instead of the pool.
+    Returns:
+    - FastAPI: Application with /login and /ping endpoints.
+    """
+    app = FastAPI()
+    hash_handler = Hash()
+
+    @app.post("/login")
+    async def login():
+        if inline:
+            return hash_handler.pwd_context.verify("secret", hashed_password)
+        return await hash_handler.verify_password("secret", hashed_password)
+
+    @app.get("/ping")
+    async def ping():
+        return "pong"
+
+    return app
+
+
+async def run(inline: bool, hashed_password: str) -> list:
+    """
+    Fire a login burst and poll /ping while it runs.
+    Parameters:
+    - inline (bool): Verify passwords on the event loop instead of the pool.
+    - hashed_password (str): bcrypt hash the logins are verified against.
+    Returns:
+    - list: /ping latencies in milliseconds.
+    """
+    transport = httpx.ASGITransport(app=build_app(hashed_password, inline))
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def ping():
+            # Latency is measured from the time each ping was due, so a
+            # blocked event loop shows up even when no ping was in flight.
+            latencies = []
+            started = time.perf_counter()
+            for i in range(PINGS):
+                due = started + i * INTERVAL
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await client.get("/ping")
+                latencies.append((time.perf_counter() - due) * 1000)
+            return latencies
+
+        pinger = asyncio.create_task(ping())
+        await asyncio.gather(*(client.post("/login") for _ in range(LOGINS)))
+        return await pinger
+
+
+def percentile(values: list, q: int) -> float:
+    """
+    Get a percentile of the values.
+    Parameters:
+    - values (list): Measured values.
+    - q (int): Percentile, 1-99.
+    Returns:
+    - float: The percentile.
+    """
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+def main():
+    hashed_password = Hash.pwd_context.hash("secret")
+    print(f"{LOGINS} concurrent logins, {PINGS} /ping requests")
+    print(f"{'mode':<10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label, inline in (("inline", True), ("pool", False)):
+        latencies = asyncio.run(run(inline, hashed_password))
+        print(
+            f"{label:<10}{percentile(latencies, 50):>10.1f}"
+            f"{percentile(latencies, 99):>10.1f}{max(latencies):>10.1f}"
+        )
+    print(f"pool stats: {password_hash_pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure the per-request overhead of MetricsMiddleware.
+
+A FastAPI app with one parametrized route is called directly through
+ASGI, without a server or HTTP client, so the difference between the
+plain and the instrumented app is the cost of the middleware itself.
+
+Run from the repository root:
+
+    python -m benchmarks.metrics_overhead
+"""
+
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from src.services.metrics import MetricsMiddleware
+
+REQUESTS = 20_000
+ROUNDS = 5
+
+
+def build_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{id}")
+    async def item(id: int):
+        return {"id": id}
+
+    return app
+
+
+async def call(app, path: str):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"test")],
+        "client": ("127.0.0.1", 1),
+        "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for i in range(REQUESTS):
+            await call(app, f"/items/{i}")
+        best = min(best, (time.perf_counter() - started) / REQUESTS)
+    return best
+
+
+async def main():
+    plain = await measure(build_app(False))
+    instrumented = await measure(build_app(True))
+    print(f"{'app':>14}{'us/request':>12}")
+    print(f"{'plain':>14}{plain * 1e6:>12.1f}")
+    print(f"{'instrumented':>14}{instrumented * 1e6:>12.1f}")
+    print(f"{'overhead':>14}{(instrumented - plain) * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+Compare sending mail over a fresh SMTP connection per message with the pool.
+
+A local aiosmtpd server is started with implicit TLS, like the production
+SMTPS setup, using a self-signed certificate generated with the openssl
+command line tool. Both modes send the same messages with the same number of
+concurrent background tasks and report messages per second.
+
+Run from the repository root:
+
+    python -m benchmarks.smtp_throughput
+"""
+
+import asyncio
+import socket
+import ssl
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import aiosmtplib
+from aiosmtpd.controller import Controller
+
+from src.services.email import build_message
+from src.services.smtp import SMTPPool
+
+MESSAGES = 200
+CONCURRENCY = 10
+POOL_SIZE = 2
+
+
+class NullHandler:
+    async def handle_DATA(self, server, session, envelope):
+        return "250 OK"
+
+
+def server_context(directory: Path) -> ssl.SSLContext:
+    """
+    Create a TLS context with a self-signed certificate.
+    Parameters:
+    - directory (Path): Directory for the key and the certificate.
+    Returns:
+    - ssl.SSLContext: Server TLS context.
+    """
+    key, cert = directory / "key.pem", directory / "cert.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"]
+        + ["-subj", "/CN=localhost", "-keyout", str(key), "-out", str(cert)],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run(send) -> float:
+    """
+    Send MESSAGES messages from CONCURRENCY tasks.
+    Parameters:
+    - send: Coroutine function sending one message.
+    Returns:
+    - float: Messages per second.
+    """
+    queue = asyncio.Queue()
+    for n in range(MESSAGES):
+        queue.put_nowait(
+            build_message(
+                f"user{n}@example.com",
+                "Confirm your email",
+                "email_verify.html",
+                host="http://localhost:8000/",
+                username=f"user{n}",
+                token="token",
+            )
+        )
+
+    async def worker():
+        while not queue.empty():
+            await send(queue.get_nowait())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return MESSAGES / (time.perf_counter() - start)
+
+
+async def main(port: int):
+    options = dict(hostname="127.0.0.1", port=port, use_tls=True, validate_certs=False)
+
+    async def send_fresh(message):
+        await aiosmtplib.send(message, sender="noreply@example.com", **options)
+
+    pool = SMTPPool(start_tls=False, size=POOL_SIZE, **options)
+
+    async def send_pooled(message):
+        await pool.send(message)
+
+    print(f"{MESSAGES} messages, {CONCURRENCY} concurrent senders, SMTPS")
+    print(f"{'mode':<22}{'msg/s':>10}")
+    print(f"{'connection per msg':<22}{await run(send_fresh):>10.1f}")
+    print(f"{f'pool of {POOL_SIZE}':<22}{await run(send_pooled):>10.1f}")
+    print(f"pool stats: {pool.stats()}")
+    await pool.close()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        port = free_port()
+        controller = Controller(
+            NullHandler(),
+            hostname="127.0.0.1",
+            port=port,
+            ssl_context=server_context(Path(directory)),
+        )
+        controller.start()
+        try:
+            asyncio.run(main(port))
+        finally:
+            controller.stop()
@@ -0,0 +1,96 @@
+"""
+Measure the per-request overhead of OpenTelemetry tracing.
+
+A FastAPI app whose route calls a traced service method is called directly
+through ASGI, as in benchmarks.metrics_overhead. The method does no I/O, so
+the route is about as cheap as a request gets and the overhead is an upper
+bound; a database query adds a span of its own to sampled requests only.
+The tracer provider can only be installed once per process, so every
+sample ratio is measured in a subprocess; the subprocesses are run in
+turns for several passes and the best time of each ratio is kept. Spans
+are exported as JSON lines to os.devnull, so serializing them is part of
+the cost.
+
+Run from the repository root:
+
+    python -m benchmarks.tracing_overhead
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from fastapi import FastAPI
+
+from benchmarks.metrics_overhead import call
+from src.config.config import config
+from src.services.tracing import TracingMiddleware, setup_tracing, traced
+
+SETTINGS = ("off", "0.01", "0.1", "1.0")
+REQUESTS = 20_000
+ROUNDS = 3
+PASSES = 3
+
+
+def build_app(tracing: bool) -> FastAPI:
+    @traced("service")
+    class ItemService:
+        async def get_item(self, id: int) -> int:
+            return id
+
+    app = FastAPI()
+    if tracing:
+        app.add_middleware(TracingMiddleware)
+
+    @app.get("/items/{id}")
+    async def item(id: int):
+        return {"id": await ItemService().get_item(id)}
+
+    return app
+
+
+async def measure(app) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for i in range(REQUESTS):
+            await call(app, f"/items/{i}")
+        best = min(best, (time.perf_counter() - started) / REQUESTS)
+    return best
+
+
+async def run(setting: str) -> float:
+    if setting != "off":
+        config.TRACING_ENABLED = True
+        config.TRACING_SAMPLE_RATIO = float(setting)
+        config.TRACING_EXPORTER = "file"
+        config.TRACING_FILE = os.devnull
+        setup_tracing()
+    return await measure(build_app(setting != "off"))
+
+
+def main():
+    if len(sys.argv) > 1:
+        print(asyncio.run(run(sys.argv[1])))
+        return
+    results = dict.fromkeys(SETTINGS, float("inf"))
+    for _ in range(PASSES):
+        for setting in SETTINGS:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.tracing_overhead", setting],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            seconds = float(output.stdout.strip().splitlines()[-1])
+            results[setting] = min(results[setting], seconds)
+    print(f"{'sampling':>10}{'us/request':>12}{'overhead':>10}")
+    for setting, seconds in results.items():
+        overhead = seconds / results["off"] - 1
+        print(f"{setting:>10}{seconds * 1e6:>12.1f}{overhead:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import signal
+
+from src.config.config import config
+from src.database.db import sessionmanager
+from src.services.email import smtp_pool
+from src.services.outbox import OutboxService
+from src.services.tracing import setup_tracing
+
+logger = logging.getLogger("email_worker")
+
+
+async def run(stop: asyncio.Event) -> None:
+    """
+    Drain the email outbox until stop is set.
+    Full batches are followed by the next batch right away, otherwise the
+    worker sleeps OUTBOX_POLL_INTERVAL seconds before polling again. Every
+    OUTBOX_PURGE_INTERVAL seconds old sent and failed emails are deleted.
+    Parameters:
+    - stop (asyncio.Event): Event that ends the loop.
+    """
+    loop = asyncio.get_running_loop()
+    next_purge = loop.time()
+    try:
+        while not stop.is_set():
+            try:
+                async with sessionmanager.session() as session:
+                    service = OutboxService(session)
+                    if loop.time() >= next_purge:
+                        next_purge = loop.time() + config.OUTBOX_PURGE_INTERVAL
+                        if deleted := await service.purge():
+                            logger.info("Purged %s old emails", deleted)
+                    result = await service.process_batch(smtp_pool)
+                if result["claimed"]:
+                    logger.info("Outbox batch: %s", result)
+                if result["claimed"] >= config.OUTBOX_BATCH_SIZE:
+                    continue
+            except Exception:
+                logger.exception("Outbox batch failed")
+            try:
+                await asyncio.wait_for(stop.wait(), config.OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await smtp_pool.close()
+
+
+async def main() -> None:
+    """
+    Run the worker until SIGINT or SIGTERM.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await run(stop)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    setup_tracing()
+    asyncio.run(main())
@@ -1,14 +1,42 @@
-from fastapi import FastAPI, Request, status
-from starlette.responses import JSONResponse
-from slowapi.errors import RateLimitExceeded
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+
+from src.config.config import config
+from src.routers import healthcheck, contacts, users, auth, metrics
+from src.services.metrics import (
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    mark_process_dead,
+)
+from src.services.tracing import TracingMiddleware, setup_tracing
+from src.services.rate_limit import (
+    RateLimitExceeded,
+    RateLimitMiddleware,
+    rate_limited_response,
+)
 
-from src.routers import healthcheck, contacts, users, auth
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    mark_process_dead()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = ["<http://localhost:8000>"]
 
+if config.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        rate=config.RATE_LIMIT_DEFAULT,
+        exempt=config.RATE_LIMIT_EXEMPT,
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -17,19 +45,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(QueryStatsMiddleware, server_timing=config.SERVER_TIMING_ENABLED)
+
+# Metrics and tracing are added last, so they are the outermost middlewares
+# and also cover responses of the rate limiter and CORS preflights.
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+if setup_tracing():
+    app.add_middleware(TracingMiddleware)
+
 
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    return JSONResponse(
-        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content={"error": "Request limit exceeded. Please try again later."},
-    )
+    return rate_limited_response(exc.result)
 
 
 app.include_router(healthcheck.router, prefix="/api")
 app.include_router(contacts.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
+if config.METRICS_ENABLED:
+    app.include_router(metrics.router)
+
+if config.AVATAR_STORAGE == "local":
+    os.makedirs(config.AVATAR_LOCAL_DIR, exist_ok=True)
+    app.mount(
+        config.AVATAR_LOCAL_URL,
+        StaticFiles(directory=config.AVATAR_LOCAL_DIR),
+        name="avatars",
+    )
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,62 @@
+"""add email_outbox table
+
+Revision ID: 0d4b7e91c3a5
+Revises: e27d9b3f5a80
+Create Date: 2026-10-17 15:02:41.338120
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0d4b7e91c3a5"
+down_revision: Union[str, None] = "e27d9b3f5a80"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("recipient", sa.String(length=255), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "SENT", "FAILED", name="outboxstatus"),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_email_outbox_status_next_attempt_at",
+        "email_outbox",
+        ["status", "next_attempt_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ux_email_outbox_pending_kind_recipient",
+        "email_outbox",
+        ["kind", "recipient"],
+        unique=True,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ux_email_outbox_pending_kind_recipient", table_name="email_outbox")
+    op.drop_index("ix_email_outbox_status_next_attempt_at", table_name="email_outbox")
+    op.drop_table("email_outbox")
+    sa.Enum(name="outboxstatus").drop(op.get_bind(), checkfirst=True)
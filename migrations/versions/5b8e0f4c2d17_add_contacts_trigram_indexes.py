@@ -0,0 +1,40 @@
+"""add pg_trgm indexes for contact search
+
+Revision ID: 5b8e0f4c2d17
+Revises: a3c1d6e2f907
+Create Date: 2026-10-17 11:03:42.905716
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8e0f4c2d17"
+down_revision: Union[str, None] = "a3c1d6e2f907"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_FIELDS = ("name", "last_name", "email")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for field in SEARCH_FIELDS:
+        op.create_index(
+            f"ix_contacts_{field}_trgm",
+            "contacts",
+            [sa.text(f"lower({field}) gin_trgm_ops")],
+            unique=False,
+            postgresql_using="gin",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for field in SEARCH_FIELDS:
+        op.drop_index(f"ix_contacts_{field}_trgm", table_name="contacts")
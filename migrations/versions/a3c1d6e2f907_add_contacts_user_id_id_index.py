@@ -0,0 +1,31 @@
+"""add (user_id, id) index to contacts
+
+Revision ID: a3c1d6e2f907
+Revises: edae6279fd80
+Create Date: 2026-10-17 10:12:04.118254
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c1d6e2f907"
+down_revision: Union[str, None] = "edae6279fd80"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_contacts_user_id_id", "contacts", ["user_id", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_contacts_user_id_id", table_name="contacts")
@@ -0,0 +1,48 @@
+"""add generated birthday_md column to contacts
+
+Revision ID: e27d9b3f5a80
+Revises: 5b8e0f4c2d17
+Create Date: 2026-10-17 12:37:55.610192
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e27d9b3f5a80"
+down_revision: Union[str, None] = "5b8e0f4c2d17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "contacts",
+        sa.Column(
+            "birthday_md",
+            sa.Integer(),
+            sa.Computed(
+                "CAST(EXTRACT(month FROM birthday) * 100"
+                " + EXTRACT(day FROM birthday) AS INTEGER)",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_contacts_user_id_birthday_md",
+        "contacts",
+        ["user_id", "birthday_md"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_contacts_user_id_birthday_md", table_name="contacts")
+    op.drop_column("contacts", "birthday_md")
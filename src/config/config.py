@@ -1,3 +1,4 @@
+import ipaddress
 import os
 from dotenv import load_dotenv
 
@@ -6,12 +7,120 @@ load_dotenv()
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT")
+DB_PORT = os.getenv("DB_PORT") or 5432
 DB_NAME = os.getenv("DB_NAME")
 
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE") or 5)
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW") or 10)
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT") or 30)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE") or 1800)
+DB_POOL_PRE_PING = (os.getenv("DB_POOL_PRE_PING") or "true").lower() == "true"
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(
+    os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE") or 100
+)
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE") or 100)
+
+DB_REPLICA_URLS = [
+    url.strip()
+    for url in (os.getenv("DB_REPLICA_URLS") or "").split(",")
+    if url.strip()
+]
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG") or 5)
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL") or 5)
+DB_REPLICA_CHECK_TIMEOUT = float(os.getenv("DB_REPLICA_CHECK_TIMEOUT") or 1)
+
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS") or 200)
+DB_QUERY_COUNT_WARNING = int(os.getenv("DB_QUERY_COUNT_WARNING") or 50)
+
 JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
-JWT_EXPIRATION_SECONDS = os.getenv("JWT_EXPIRATION_SECONDS")
+JWT_EXPIRATION_SECONDS = int(os.getenv("JWT_EXPIRATION_SECONDS") or 3600)
+
+REDIS_HOST = os.getenv("REDIS_HOST") or "localhost"
+REDIS_PORT = int(os.getenv("REDIS_PORT") or 6379)
+
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL") or 300)
+USER_CACHE_LOCAL_TTL = int(os.getenv("USER_CACHE_LOCAL_TTL") or 30)
+USER_CACHE_LOCAL_SIZE = int(os.getenv("USER_CACHE_LOCAL_SIZE") or 1024)
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or 4)
+
+MAIL_USERNAME = os.getenv("MAIL_USERNAME")
+MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
+MAIL_FROM = os.getenv("MAIL_FROM")
+MAIL_FROM_NAME = os.getenv("MAIL_FROM_NAME")
+MAIL_SERVER = os.getenv("MAIL_SERVER") or "localhost"
+MAIL_PORT = int(os.getenv("MAIL_PORT") or 465)
+MAIL_SSL_TLS = (os.getenv("MAIL_SSL_TLS") or "true").lower() == "true"
+MAIL_STARTTLS = (os.getenv("MAIL_STARTTLS") or "false").lower() == "true"
+MAIL_VALIDATE_CERTS = (os.getenv("MAIL_VALIDATE_CERTS") or "false").lower() == "true"
+MAIL_POOL_SIZE = int(os.getenv("MAIL_POOL_SIZE") or 2)
+MAIL_NOOP_INTERVAL = float(os.getenv("MAIL_NOOP_INTERVAL") or 30)
+MAIL_MAX_IDLE = float(os.getenv("MAIL_MAX_IDLE") or 240)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE") or 50)
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL") or 2)
+OUTBOX_LEASE = float(os.getenv("OUTBOX_LEASE") or 300)
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS") or 8)
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE") or 30)
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX") or 3600)
+OUTBOX_RETENTION_DAYS = float(os.getenv("OUTBOX_RETENTION_DAYS") or 7)
+OUTBOX_PURGE_INTERVAL = float(os.getenv("OUTBOX_PURGE_INTERVAL") or 3600)
+
+CLD_NAME = os.getenv("CLD_NAME")
+CLD_API_KEY = os.getenv("CLD_API_KEY")
+CLD_API_SECRET = os.getenv("CLD_API_SECRET")
+
+AVATAR_STORAGE = os.getenv("AVATAR_STORAGE") or "cloudinary"
+AVATAR_LOCAL_DIR = os.getenv("AVATAR_LOCAL_DIR") or "media/avatars"
+AVATAR_LOCAL_URL = os.getenv("AVATAR_LOCAL_URL") or "/media/avatars"
+AVATAR_MAX_SIZE = int(os.getenv("AVATAR_MAX_SIZE") or 5 * 1024 * 1024)
+AVATAR_UPLOAD_WORKERS = int(os.getenv("AVATAR_UPLOAD_WORKERS") or 4)
+AVATAR_IMAGE_WORKERS = int(os.getenv("AVATAR_IMAGE_WORKERS") or 2)
+AVATAR_SIZE = int(os.getenv("AVATAR_SIZE") or 250)
+AVATAR_FORMAT = (os.getenv("AVATAR_FORMAT") or "webp").lower()
+AVATAR_QUALITY = int(os.getenv("AVATAR_QUALITY") or 80)
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE") or 1000)
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS") or 1000)
+IMPORT_MAX_RECORD_SIZE = int(os.getenv("IMPORT_MAX_RECORD_SIZE") or 65536)
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE") or 1000)
+
+RATE_LIMIT_ENABLED = (os.getenv("RATE_LIMIT_ENABLED") or "true").lower() == "true"
+RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT") or "120/minute"
+RATE_LIMIT_EXEMPT = [
+    path.strip()
+    for path in (os.getenv("RATE_LIMIT_EXEMPT") or "/api/healthchecker,/metrics").split(
+        ","
+    )
+    if path.strip()
+]
+RATE_LIMIT_TIMEOUT = float(os.getenv("RATE_LIMIT_TIMEOUT") or 0.25)
+RATE_LIMIT_RETRY = float(os.getenv("RATE_LIMIT_RETRY") or 5)
+
+LOGIN_USER_MAX_FAILURES = int(os.getenv("LOGIN_USER_MAX_FAILURES") or 5)
+LOGIN_IP_MAX_FAILURES = int(os.getenv("LOGIN_IP_MAX_FAILURES") or 20)
+LOGIN_LOCKOUT_BASE = float(os.getenv("LOGIN_LOCKOUT_BASE") or 1)
+LOGIN_LOCKOUT_MAX = float(os.getenv("LOGIN_LOCKOUT_MAX") or 900)
+LOGIN_FAILURE_WINDOW = float(os.getenv("LOGIN_FAILURE_WINDOW") or 900)
+
+METRICS_ENABLED = (os.getenv("METRICS_ENABLED") or "true").lower() == "true"
+METRICS_ALLOWED_NETWORKS = [
+    ipaddress.ip_network(network.strip())
+    for network in (
+        os.getenv("METRICS_ALLOWED_NETWORKS") or "127.0.0.0/8,::1/128"
+    ).split(",")
+    if network.strip()
+]
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or None
+SERVER_TIMING_ENABLED = (os.getenv("SERVER_TIMING_ENABLED") or "true").lower() == "true"
+
+TRACING_ENABLED = (os.getenv("TRACING_ENABLED") or "false").lower() == "true"
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME") or "contacts-api"
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO") or 0.05)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER") or "otlp"
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT") or None
+TRACING_FILE = os.getenv("TRACING_FILE") or "traces.jsonl"
 
 
 class Config:
@@ -23,6 +132,84 @@ class Config:
     DB_URL = (
         f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
+    DB_POOL_SIZE = DB_POOL_SIZE
+    DB_MAX_OVERFLOW = DB_MAX_OVERFLOW
+    DB_POOL_TIMEOUT = DB_POOL_TIMEOUT
+    DB_POOL_RECYCLE = DB_POOL_RECYCLE
+    DB_POOL_PRE_PING = DB_POOL_PRE_PING
+    DB_PREPARED_STATEMENT_CACHE_SIZE = DB_PREPARED_STATEMENT_CACHE_SIZE
+    DB_STATEMENT_CACHE_SIZE = DB_STATEMENT_CACHE_SIZE
+    DB_REPLICA_URLS = DB_REPLICA_URLS
+    DB_REPLICA_MAX_LAG = DB_REPLICA_MAX_LAG
+    DB_REPLICA_CHECK_INTERVAL = DB_REPLICA_CHECK_INTERVAL
+    DB_REPLICA_CHECK_TIMEOUT = DB_REPLICA_CHECK_TIMEOUT
+    DB_SLOW_QUERY_MS = DB_SLOW_QUERY_MS
+    DB_QUERY_COUNT_WARNING = DB_QUERY_COUNT_WARNING
+    JWT_SECRET = JWT_SECRET
+    JWT_ALGORITHM = JWT_ALGORITHM
+    JWT_EXPIRATION_SECONDS = JWT_EXPIRATION_SECONDS
+    REDIS_HOST = REDIS_HOST
+    REDIS_PORT = REDIS_PORT
+    USER_CACHE_TTL = USER_CACHE_TTL
+    USER_CACHE_LOCAL_TTL = USER_CACHE_LOCAL_TTL
+    USER_CACHE_LOCAL_SIZE = USER_CACHE_LOCAL_SIZE
+    PASSWORD_HASH_WORKERS = PASSWORD_HASH_WORKERS
+    MAIL_USERNAME = MAIL_USERNAME
+    MAIL_PASSWORD = MAIL_PASSWORD
+    MAIL_FROM = MAIL_FROM
+    MAIL_FROM_NAME = MAIL_FROM_NAME
+    MAIL_SERVER = MAIL_SERVER
+    MAIL_PORT = MAIL_PORT
+    MAIL_SSL_TLS = MAIL_SSL_TLS
+    MAIL_STARTTLS = MAIL_STARTTLS
+    MAIL_VALIDATE_CERTS = MAIL_VALIDATE_CERTS
+    MAIL_POOL_SIZE = MAIL_POOL_SIZE
+    MAIL_NOOP_INTERVAL = MAIL_NOOP_INTERVAL
+    MAIL_MAX_IDLE = MAIL_MAX_IDLE
+    OUTBOX_BATCH_SIZE = OUTBOX_BATCH_SIZE
+    OUTBOX_POLL_INTERVAL = OUTBOX_POLL_INTERVAL
+    OUTBOX_LEASE = OUTBOX_LEASE
+    OUTBOX_MAX_ATTEMPTS = OUTBOX_MAX_ATTEMPTS
+    OUTBOX_BACKOFF_BASE = OUTBOX_BACKOFF_BASE
+    OUTBOX_BACKOFF_MAX = OUTBOX_BACKOFF_MAX
+    OUTBOX_RETENTION_DAYS = OUTBOX_RETENTION_DAYS
+    OUTBOX_PURGE_INTERVAL = OUTBOX_PURGE_INTERVAL
+    CLD_NAME = CLD_NAME
+    CLD_API_KEY = CLD_API_KEY
+    CLD_API_SECRET = CLD_API_SECRET
+    AVATAR_STORAGE = AVATAR_STORAGE
+    AVATAR_LOCAL_DIR = AVATAR_LOCAL_DIR
+    AVATAR_LOCAL_URL = AVATAR_LOCAL_URL
+    AVATAR_MAX_SIZE = AVATAR_MAX_SIZE
+    AVATAR_UPLOAD_WORKERS = AVATAR_UPLOAD_WORKERS
+    AVATAR_IMAGE_WORKERS = AVATAR_IMAGE_WORKERS
+    AVATAR_SIZE = AVATAR_SIZE
+    AVATAR_FORMAT = AVATAR_FORMAT
+    AVATAR_QUALITY = AVATAR_QUALITY
+    IMPORT_BATCH_SIZE = IMPORT_BATCH_SIZE
+    IMPORT_MAX_ERRORS = IMPORT_MAX_ERRORS
+    IMPORT_MAX_RECORD_SIZE = IMPORT_MAX_RECORD_SIZE
+    EXPORT_BATCH_SIZE = EXPORT_BATCH_SIZE
+    RATE_LIMIT_ENABLED = RATE_LIMIT_ENABLED
+    RATE_LIMIT_DEFAULT = RATE_LIMIT_DEFAULT
+    RATE_LIMIT_EXEMPT = RATE_LIMIT_EXEMPT
+    RATE_LIMIT_TIMEOUT = RATE_LIMIT_TIMEOUT
+    RATE_LIMIT_RETRY = RATE_LIMIT_RETRY
+    LOGIN_USER_MAX_FAILURES = LOGIN_USER_MAX_FAILURES
+    LOGIN_IP_MAX_FAILURES = LOGIN_IP_MAX_FAILURES
+    LOGIN_LOCKOUT_BASE = LOGIN_LOCKOUT_BASE
+    LOGIN_LOCKOUT_MAX = LOGIN_LOCKOUT_MAX
+    LOGIN_FAILURE_WINDOW = LOGIN_FAILURE_WINDOW
+    METRICS_ENABLED = METRICS_ENABLED
+    METRICS_ALLOWED_NETWORKS = METRICS_ALLOWED_NETWORKS
+    PROMETHEUS_MULTIPROC_DIR = PROMETHEUS_MULTIPROC_DIR
+    SERVER_TIMING_ENABLED = SERVER_TIMING_ENABLED
+    TRACING_ENABLED = TRACING_ENABLED
+    TRACING_SERVICE_NAME = TRACING_SERVICE_NAME
+    TRACING_SAMPLE_RATIO = TRACING_SAMPLE_RATIO
+    TRACING_EXPORTER = TRACING_EXPORTER
+    TRACING_OTLP_ENDPOINT = TRACING_OTLP_ENDPOINT
+    TRACING_FILE = TRACING_FILE
 
 
 config = Config
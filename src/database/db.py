@@ -1,27 +1,287 @@
+import asyncio
 import contextlib
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.config.config import config
 
+logger = logging.getLogger(__name__)
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+@dataclass
+class QueryStats:
+    """
+    Statements run on behalf of one request.
+    Attributes:
+        scope (dict): ASGI scope of the request.
+        count (int): Number of statements executed.
+        duration (float): Total time spent in the database, in seconds.
+    """
+
+    scope: Dict[str, Any] = field(default_factory=dict, repr=False)
+    count: int = 0
+    duration: float = 0.0
+
+    def describe(self) -> str:
+        """
+        Get the route of the request, as a template once it has been routed.
+        Returns:
+        - str: E.g. "GET /api/contacts/{id}".
+        """
+        route = self.scope.get("route")
+        path = route.path if route else self.scope.get("path", "-")
+        return f"{self.scope.get('method', '-')} {path}"
+
+
+# Set by the request middleware; statements run outside of a request,
+# e.g. by the email worker, are only checked against the slow query limit.
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+    if elapsed * 1000 >= config.DB_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s",
+            elapsed * 1000,
+            stats.describe() if stats else "-",
+            statement,
+        )
+
+
+def _handle_error(context):
+    started = (
+        context.connection.info.get("query_started") if context.connection else None
+    )
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> AsyncEngine:
+    """
+    Count and time the statements of the engine for the current request
+    and log the slow ones.
+    Parameters:
+    - engine (AsyncEngine): Engine to instrument.
+    Returns:
+    - AsyncEngine: The same engine.
+    """
+    sync_engine: Engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    return engine
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Connection pool that records how long callers wait for a connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+
+    def connect(self):
+        """
+        Check out a connection, recording the wait time and timeouts.
+        """
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.wait_count += 1
+            self.wait_time_total += elapsed
+            self.wait_time_max = max(self.wait_time_max, elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the pool statistics.
+        Returns:
+        - dict: Pool size, checked-out and overflow connections, wait times.
+        """
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self.wait_count,
+            "wait_time_total": self.wait_time_total,
+            "wait_time_max": self.wait_time_max,
+            "timeouts": self.timeouts,
+        }
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """
+    Build the engine keyword arguments from the configuration.
+    Parameters:
+    - url (str): Database URL.
+    Returns:
+    - dict: Keyword arguments for create_async_engine.
+    """
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "prepared_statement_cache_size": config.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+class Replica:
+    """
+    Read replica with its engine and the result of the last lag check.
+    """
+
+    def __init__(self, url: str, **options):
+        self.engine: AsyncEngine = instrument_engine(
+            create_async_engine(url, **options)
+        )
+        self.session_maker: async_sessionmaker = async_sessionmaker(
+            autoflush=False, autocommit=False, expire_on_commit=False, bind=self.engine
+        )
+        self.lag: Optional[float] = None
+        self.checked_at = float("-inf")
+        self._check: Optional[asyncio.Task] = None
+
+    async def check_lag(self, timeout: float) -> float:
+        """
+        Measure the replication lag of the replica.
+        Only PostgreSQL reports lag, other databases are assumed up to date.
+        Parameters:
+        - timeout (float): Seconds to wait for the replica to answer.
+        Returns:
+        - float: Lag in seconds, infinity if the replica is unreachable.
+        """
+        try:
+            self.lag = await asyncio.wait_for(self._measure_lag(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Replica %s did not answer within %ss", self.engine.url, timeout
+            )
+            self.lag = float("inf")
+        except Exception as e:
+            logger.warning("Replica %s is unavailable: %s", self.engine.url, e)
+            self.lag = float("inf")
+        return self.lag
+
+    async def _measure_lag(self) -> float:
+        if self.engine.dialect.name != "postgresql":
+            return 0.0
+        async with self.engine.connect() as connection:
+            result = await connection.execute(REPLICA_LAG_QUERY)
+            return float(result.scalar() or 0)
+
+    def refresh_lag(self, timeout: float) -> None:
+        """
+        Start a lag check in the background unless one is already running.
+        Parameters:
+        - timeout (float): Seconds to wait for the replica to answer.
+        """
+        if self._check is None or self._check.done():
+            self._check = asyncio.create_task(self.check_lag(timeout))
+
+    async def wait_for_check(self) -> None:
+        """
+        Wait for the running lag check, which is shielded from cancellation
+        so that other requests waiting for it still get its result.
+        """
+        if self._check is not None:
+            await asyncio.shield(self._check)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the replica statistics.
+        Returns:
+        - dict: Host, last measured lag and pool statistics.
+        """
+        pool = self.engine.pool
+        return {
+            "host": self.engine.url.host or self.engine.url.database,
+            "lag": self.lag,
+            "pool": pool.stats() if isinstance(pool, InstrumentedQueuePool) else {},
+        }
+
 
 class DatabaseSessionManager:
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        replica_urls: Optional[List[str]] = None,
+        max_replica_lag: float = config.DB_REPLICA_MAX_LAG,
+        replica_check_interval: float = config.DB_REPLICA_CHECK_INTERVAL,
+        replica_check_timeout: float = config.DB_REPLICA_CHECK_TIMEOUT,
+        **options,
+    ):
         """
         Initialize the database session manager.
         Parameters:
         - url (str): Database URL.
+        - replica_urls (Optional[List[str]]): URLs of read replicas.
+        - max_replica_lag (float): Lag in seconds above which a replica is skipped.
+        - replica_check_interval (float): Seconds between lag checks of a replica.
+        - replica_check_timeout (float): Seconds a lag check may take.
+        - options: Engine keyword arguments, built from the configuration by default.
 
         """
-        self._engine: AsyncEngine | None = create_async_engine(url)
+        self._engine: AsyncEngine | None = instrument_engine(
+            create_async_engine(url, **(options or engine_options(url)))
+        )
+        # Objects stay loaded after commit, so rows returned by
+        # INSERT/UPDATE/DELETE ... RETURNING can be used without a refresh.
         self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
+            autoflush=False, autocommit=False, expire_on_commit=False, bind=self._engine
         )
+        self._replicas = [
+            Replica(replica_url, **(options or engine_options(replica_url)))
+            for replica_url in replica_urls or []
+        ]
+        self._next_replica = 0
+        self.max_replica_lag = max_replica_lag
+        self.replica_check_interval = replica_check_interval
+        self.replica_check_timeout = replica_check_timeout
 
     @contextlib.asynccontextmanager
     async def session(self):
@@ -32,7 +292,31 @@ class DatabaseSessionManager:
         """
         if self._session_maker is None:
             raise Exception("Database session is not initialized")
-        session = self._session_maker()
+        async with self._session_scope(self._session_maker) as session:
+            yield session
+
+    @contextlib.asynccontextmanager
+    async def read_session(self):
+        """
+        Context manager for read-only database sessions.
+        Replicas are used in round-robin order, skipping those lagging more
+        than max_replica_lag. Without a usable replica the primary is used.
+        """
+        replica = await self._choose_replica()
+        session_maker = replica.session_maker if replica else self._session_maker
+        if session_maker is None:
+            raise Exception("Database session is not initialized")
+        async with self._session_scope(session_maker) as session:
+            yield session
+
+    @contextlib.asynccontextmanager
+    async def _session_scope(self, session_maker: async_sessionmaker):
+        """
+        Create a session, rolling it back on errors and always closing it.
+        Parameters:
+        - session_maker (async_sessionmaker): Factory of the session.
+        """
+        session = session_maker()
         try:
             yield session
         except SQLAlchemyError as e:
@@ -41,8 +325,50 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    async def _choose_replica(self) -> Optional[Replica]:
+        """
+        Pick the next replica whose lag is within the limit.
+        Lag is re-checked in the background when the last check is older than
+        replica_check_interval, so requests use the last measured lag and do
+        not wait for a slow replica. Only a replica that has never been
+        checked is waited for, at most replica_check_timeout seconds.
+        Returns:
+        - Replica: The chosen replica, or None to fall back to the primary.
+        """
+        now = time.monotonic()
+        for _ in range(len(self._replicas)):
+            replica = self._replicas[self._next_replica % len(self._replicas)]
+            self._next_replica += 1
+            if now - replica.checked_at >= self.replica_check_interval:
+                replica.checked_at = now
+                replica.refresh_lag(self.replica_check_timeout)
+            if replica.lag is None:
+                await replica.wait_for_check()
+            if replica.lag is not None and replica.lag <= self.max_replica_lag:
+                return replica
+        return None
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics of the connection pool.
+        Returns:
+        - dict: Pool statistics, empty if the pool is not instrumented.
+        """
+        pool = self._engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            return pool.stats()
+        return {}
 
-sessionmanager = DatabaseSessionManager(config.DB_URL)
+    def replica_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get statistics of the read replicas.
+        Returns:
+        - List[dict]: Lag and pool statistics of every replica.
+        """
+        return [replica.stats() for replica in self._replicas]
+
+
+sessionmanager = DatabaseSessionManager(config.DB_URL, config.DB_REPLICA_URLS)
 
 
 async def get_db():
@@ -51,3 +377,20 @@ async def get_db():
     """
     async with sessionmanager.session() as session:
         yield session
+
+
+async def get_read_db():
+    """
+    Dependency that get a read-only database session, served by a replica when available.
+    """
+    async with sessionmanager.read_session() as session:
+        yield session
+
+
+def get_read_session_factory():
+    """
+    Dependency that get the read-only session context manager.
+    Used by streaming responses, whose body is produced after the request
+    dependencies are closed and needs a session of its own.
+    """
+    return sessionmanager.read_session
@@ -10,7 +10,14 @@ from sqlalchemy import (
     String,
     Boolean,
     Column,
+    Computed,
     DateTime,
+    Index,
+    JSON,
+    Text,
+    cast,
+    column,
+    extract,
     func,
 )
 
@@ -29,18 +36,35 @@ class Contact(Base):
         email (str): Email address of the contact.
         phone (str): Phone number of the contact.
         birthday (Date): Birthday of the contact.
+        birthday_md (int): Generated month and day of the birthday as MMDD (e.g. 229).
         additional_data (Optional[str]): Additional data related to the contact.
         user_id (int): Foreign key referencing the user who owns this contact.
         user (User): Relationship to the User model.
     """
 
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index("ix_contacts_user_id_birthday_md", "user_id", "birthday_md"),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(50), nullable=False)
     last_name: Mapped[str] = mapped_column(String(255), nullable=False)
     email: Mapped[str] = mapped_column(String(128), nullable=False, unique=True)
     phone: Mapped[str] = mapped_column(String(128), nullable=False)
     birthday: Mapped[Date] = mapped_column(Date, nullable=False)
+    birthday_md: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        Computed(
+            cast(
+                extract("month", column("birthday")) * 100
+                + extract("day", column("birthday")),
+                Integer,
+            ),
+            persisted=True,
+        ),
+    )
     additional_data: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     user_id = Column(
         "user_id", ForeignKey("users.id", ondelete="CASCADE"), default=None
@@ -82,3 +106,63 @@ class User(Base):
     avatar = Column(String(255), nullable=True)
     confirmed = Column(Boolean, default=False)
     role = Column(SQLAlchemyEnum(UserRole), default=UserRole.USER, nullable=False)
+
+
+class OutboxStatus(str, Enum):
+    """
+    Enum representing the delivery status of an outbox email.
+    Attributes:
+        PENDING (str): Waiting to be sent or retried.
+        SENT (str): Delivered to the SMTP server.
+        FAILED (str): Gave up after the maximum number of attempts.
+    """
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class EmailOutbox(Base):
+    """
+    Represents an email waiting to be sent by the email worker.
+    Attributes:
+        id (int): Unique identifier for the email.
+        kind (str): Kind of the email, selects the template (e.g. "verify").
+        recipient (str): Email address of the recipient.
+        payload (dict): Template variables of the email.
+        status (OutboxStatus): Delivery status.
+        attempts (int): Number of delivery attempts so far.
+        next_attempt_at (DateTime): Earliest time of the next attempt.
+        last_error (Optional[str]): Error of the last failed attempt.
+        created_at (DateTime): Timestamp when the email was enqueued.
+        sent_at (Optional[DateTime]): Timestamp when the email was sent.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    recipient: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    status: Mapped[OutboxStatus] = mapped_column(
+        SQLAlchemyEnum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+
+# One pending email per kind and recipient: enqueueing again replaces it.
+Index(
+    "ux_email_outbox_pending_kind_recipient",
+    EmailOutbox.kind,
+    EmailOutbox.recipient,
+    unique=True,
+    postgresql_where=EmailOutbox.status == OutboxStatus.PENDING,
+    sqlite_where=EmailOutbox.status == OutboxStatus.PENDING,
+)
@@ -1,14 +1,44 @@
-from datetime import datetime, timedelta
-from typing import Dict, Literal, Optional, Sequence
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Row,
+    Select,
+    and_,
+    any_,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import ARRAY
 from src.schemas.auth import User
 
 
 from src.database.models import Contact
 from src.schemas.schemas import ContactBase, ContactUpdate
+from src.services.tracing import traced
 
+EXPORT_COLUMNS = (
+    Contact.name,
+    Contact.last_name,
+    Contact.email,
+    Contact.phone,
+    Contact.birthday,
+    Contact.additional_data,
+)
 
+
+@traced("repository")
 class ContactRepository:
     def __init__(self, session: AsyncSession):
         self.db = session
@@ -26,27 +56,155 @@ class ContactRepository:
         contact = await self.db.execute(stmt)
         return contact.scalar_one_or_none()
 
+    def _is_postgresql(self) -> bool:
+        """
+        Check whether the session is bound to a PostgreSQL database.
+        Returns:
+        - bool: True for PostgreSQL, False otherwise (e.g. SQLite in tests).
+        """
+        bind = self.db.bind
+        return bind is not None and bind.dialect.name == "postgresql"
+
     async def search_contacts(
         self,
         filters: Optional[Dict[str, str]],
         user: User,
+        limit: int = 100,
+        after: Optional[List[Any]] = None,
     ) -> Sequence[Contact]:
         """
         Search for contacts based on the provided filters.
         Parameters:
         - filters (Dict[str, str]): Dictionary of filters to apply.
         - user (User): Currently authenticated user.
+        - limit (int): Maximum number of contacts to return.
+        - after (Optional[List]): (rank, id) of the last contact of the previous page.
         Returns:
         - List[Contact]: List of contacts matching the filters.
         """
-        stmt = select(Contact)
+        rows = await self.search_contacts_ranked(filters, user, limit, after)
+        return [contact for contact, _ in rows]
+
+    async def search_contacts_ranked(
+        self,
+        filters: Optional[Dict[str, str]],
+        user: User,
+        limit: int = 100,
+        after: Optional[List[Any]] = None,
+    ) -> Sequence[Tuple[Contact, float]]:
+        """
+        Search for the user's contacts and return them together with their rank.
 
-        for field, value in filters.items():
-            if value:
-                stmt = stmt.where(getattr(Contact, field).ilike(f"%{value}%"))
+        Every filter is a case-insensitive substring match on
+        ``lower(field)``, which PostgreSQL serves from the pg_trgm GIN
+        indexes. On PostgreSQL results are ranked by trigram similarity,
+        other databases fall back to ordering by ID with a rank of 0.
 
+        Parameters:
+        - filters (Dict[str, str]): Dictionary of filters to apply.
+        - user (User): Currently authenticated user.
+        - limit (int): Maximum number of contacts to return.
+        - after (Optional[List]): (rank, id) of the last contact of the previous page.
+        Returns:
+        - List[Tuple[Contact, float]]: Contacts matching the filters with their rank.
+        """
+        stmt = self._search_stmt(filters, user, limit, after)
         result = await self.db.execute(stmt)
-        return list(result.scalars().all())
+        return [tuple(row) for row in result.all()]
+
+    def _search_stmt(
+        self,
+        filters: Dict[str, str],
+        user: User,
+        limit: int,
+        after: Optional[List[Any]] = None,
+    ) -> Select:
+        """
+        Build the search statement.
+
+        The owner predicate always comes first and all filters are combined
+        into one conjunction, so the planner can either start from the
+        (user_id, id) index and only look at the caller's rows or combine
+        it with the pg_trgm GIN indexes of the filtered fields.
+
+        Parameters:
+        - filters (Dict[str, str]): Dictionary of filters to apply.
+        - user (User): Currently authenticated user.
+        - limit (int): Maximum number of contacts to return.
+        - after (Optional[List]): (rank, id) of the last contact of the previous page.
+        Returns:
+        - Select: Statement selecting (Contact, rank) rows.
+        """
+        rank = self._search_rank(filters)
+        conditions = [Contact.user_id == user.id, *self._filter_conditions(filters)]
+        if after is not None:
+            after_rank, after_id = after
+            conditions.append(
+                or_(rank < after_rank, and_(rank == after_rank, Contact.id > after_id))
+            )
+
+        return (
+            select(Contact, rank.label("rank"))
+            .where(and_(*conditions))
+            .order_by(rank.desc(), Contact.id)
+            .limit(limit)
+        )
+
+    @staticmethod
+    def _filter_conditions(filters: Dict[str, str]) -> List[ColumnElement[bool]]:
+        """
+        Build the case-insensitive substring conditions of the filters.
+        Parameters:
+        - filters (Dict[str, str]): Dictionary of filters to apply.
+        Returns:
+        - List[ColumnElement]: One condition per filter with a value.
+        """
+        return [
+            func.lower(getattr(Contact, field)).contains(value.lower(), autoescape=True)
+            for field, value in filters.items()
+            if value
+        ]
+
+    def _selection_conditions(
+        self, user: User, ids: Optional[List[int]], filters: Dict[str, str]
+    ) -> List[ColumnElement[bool]]:
+        """
+        Build the conditions selecting the user's contacts of a bulk operation.
+        On PostgreSQL the IDs are bound as one array for ``id = ANY(:ids)``,
+        so the statement does not grow with the number of IDs.
+        Parameters:
+        - user (User): Currently authenticated user.
+        - ids (Optional[List[int]]): IDs of the contacts.
+        - filters (Dict[str, str]): Dictionary of filters to apply.
+        Returns:
+        - List[ColumnElement]: Conditions combined with AND.
+        """
+        conditions = [Contact.user_id == user.id, *self._filter_conditions(filters)]
+        if ids:
+            if self._is_postgresql():
+                conditions.append(
+                    Contact.id == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+                )
+            else:
+                conditions.append(Contact.id.in_(ids))
+        return conditions
+
+    def _search_rank(self, filters: Dict[str, str]):
+        """
+        Build the ranking expression used to order search results.
+        Parameters:
+        - filters (Dict[str, str]): Dictionary of filters to apply.
+        Returns:
+        - ColumnElement: Sum of pg_trgm similarities on PostgreSQL, 0 otherwise.
+        """
+        if not self._is_postgresql():
+            return literal(0.0)
+        similarities = [
+            func.similarity(func.lower(getattr(Contact, field)), value.lower())
+            for field, value in filters.items()
+            if value
+        ]
+        return sum(similarities[1:], similarities[0])
 
     async def get_contacts(
         self, limit: int, offset: int, user: User
@@ -64,26 +222,153 @@ class ContactRepository:
         contacts = await self.db.execute(stmt)
         return list(contacts.scalars().all())
 
+    async def get_contacts_after(
+        self, limit: int, after_id: Optional[int], user: User
+    ) -> Sequence[Contact]:
+        """
+        Get a list of contacts using keyset pagination.
+        Parameters:
+        - limit (int): Number of contacts to return.
+        - after_id (Optional[int]): ID of the last contact of the previous page.
+        - user (User): Currently authenticated user.
+        Returns:
+        - List[Contact]: List of contacts ordered by ID.
+        """
+        stmt = select(Contact).filter_by(user=user)
+        if after_id is not None:
+            stmt = stmt.where(Contact.id > after_id)
+        stmt = stmt.order_by(Contact.id).limit(limit)
+        contacts = await self.db.execute(stmt)
+        return list(contacts.scalars().all())
+
     async def create_contact(self, contact: ContactBase, user: User) -> Contact:
         """
-        Create a new contact.
+        Create a new contact with a single INSERT ... RETURNING statement.
         Parameters:
         - contact (ContactBase): Contact data to create.
         - user (User): Currently authenticated user.
         Returns:
         - Contact: The created contact object.
         """
-        new_contact = Contact(**contact.model_dump(exclude_unset=True), user=user)
-        self.db.add(new_contact)
+        stmt = (
+            insert(Contact)
+            .values(**contact.model_dump(exclude_unset=True), user_id=user.id)
+            .returning(Contact)
+        )
+        result = await self.db.execute(stmt)
+        new_contact = result.scalar_one()
         await self.db.commit()
-        await self.db.refresh(new_contact)
         return new_contact
 
+    async def insert_contacts(self, rows: List[Dict[str, Any]], user: User) -> set:
+        """
+        Insert a batch of contacts with a single statement, without committing.
+        Rows whose email is already taken are skipped.
+        Parameters:
+        - rows (List[Dict]): Contact data to insert, with distinct emails.
+        - user (User): Currently authenticated user.
+        Returns:
+        - set: Emails of the inserted contacts.
+        """
+        dialect = postgresql if self._is_postgresql() else sqlite
+        stmt = (
+            dialect.insert(Contact)
+            .on_conflict_do_nothing(index_elements=[Contact.email])
+            .returning(Contact.email)
+        )
+        # Passing the rows as parameters keeps the compiled statement cached,
+        # SQLAlchemy still sends them as multi-row INSERT ... VALUES batches.
+        result = await self.db.execute(
+            stmt, [{**row, "user_id": user.id} for row in rows]
+        )
+        return set(result.scalars().all())
+
+    async def update_contacts(
+        self,
+        user: User,
+        ids: Optional[List[int]],
+        filters: Dict[str, str],
+        values: Dict[str, Any],
+    ) -> List[int]:
+        """
+        Update the selected contacts of the user with a single statement.
+        Parameters:
+        - user (User): Currently authenticated user.
+        - ids (Optional[List[int]]): IDs of the contacts.
+        - filters (Dict[str, str]): Dictionary of filters to apply.
+        - values (Dict[str, Any]): Columns to set.
+        Returns:
+        - List[int]: IDs of the updated contacts.
+        """
+        stmt = (
+            update(Contact)
+            .where(*self._selection_conditions(user, ids, filters))
+            .values(**values)
+            .returning(Contact.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        updated = sorted(result.scalars().all())
+        await self.db.commit()
+        return updated
+
+    async def delete_contacts(
+        self, user: User, ids: Optional[List[int]], filters: Dict[str, str]
+    ) -> List[int]:
+        """
+        Delete the selected contacts of the user with a single statement.
+        Parameters:
+        - user (User): Currently authenticated user.
+        - ids (Optional[List[int]]): IDs of the contacts.
+        - filters (Dict[str, str]): Dictionary of filters to apply.
+        Returns:
+        - List[int]: IDs of the deleted contacts.
+        """
+        stmt = (
+            delete(Contact)
+            .where(*self._selection_conditions(user, ids, filters))
+            .returning(Contact.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        deleted = sorted(result.scalars().all())
+        await self.db.commit()
+        return deleted
+
+    async def stream_contacts(
+        self, user: User, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream all contacts of the user in batches, ordered by ID.
+        A server-side cursor is used, so at most one batch is held in memory.
+        Parameters:
+        - user (User): Currently authenticated user.
+        - batch_size (int): Number of contacts fetched per batch.
+        Returns:
+        - AsyncIterator[Sequence[Row]]: Batches of rows with the contact columns.
+        """
+        stmt = (
+            select(*EXPORT_COLUMNS)
+            .where(Contact.user_id == user.id)
+            .order_by(Contact.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(stmt)
+        async for rows in result.partitions():
+            yield rows
+
+    async def commit(self) -> None:
+        """
+        Commit the current transaction.
+        """
+        await self.db.commit()
+
     async def update_contact(
         self, id: int, body: ContactUpdate, user: User
     ) -> Contact | None:
         """
-        Update an existing contact.
+        Update an existing contact with a single UPDATE ... RETURNING statement.
+        Only the fields set in the body are changed.
         Parameters:
         - id (int): ID of the contact to update.
         - body (ContactUpdate): Updated contact data.
@@ -91,56 +376,84 @@ class ContactRepository:
         Returns:
         - Contact: The updated contact object if found, otherwise None.
         """
-        contact = await self.get_contact_by_id(id, user)
-        if contact:
-            contact.name = body.name
-            contact.last_name = body.last_name
-            contact.email = body.email
-            contact.phone = body.phone
-            contact.birthday = body.birthday
-            contact.additional_data = body.additional_data
-
-            await self.db.commit()
-            await self.db.refresh(contact)
+        values = body.model_dump(exclude_unset=True)
+        if not values:
+            return await self.get_contact_by_id(id, user)
+        stmt = (
+            update(Contact)
+            .where(Contact.id == id, Contact.user_id == user.id)
+            .values(**values)
+            .returning(Contact)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one_or_none()
+        await self.db.commit()
         return contact
 
-    async def delete_contact(self, id: int, user: User) -> Contact:
+    async def delete_contact(self, id: int, user: User) -> Contact | None:
         """
-        Delete a contact by its ID.
+        Delete a contact by its ID with a single DELETE ... RETURNING statement.
         Parameters:
         - id (int): ID of the contact to delete.
         - user (User): Currently authenticated user.
         Returns:
         - Contact: The deleted contact object if found, otherwise None.
         """
-        contact = await self.get_contact_by_id(id, user)
-        if contact:
-            await self.db.delete(contact)
-            await self.db.commit()
+        stmt = (
+            delete(Contact)
+            .where(Contact.id == id, Contact.user_id == user.id)
+            .returning(Contact)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one_or_none()
+        await self.db.commit()
         return contact
 
-    async def get_upcoming_birthdays(self, user: User, limit: int = 100):
+    async def get_upcoming_birthdays(
+        self,
+        user: User,
+        limit: int = 100,
+        days: int = 7,
+        today: Optional[date] = None,
+    ):
         """
-        Get contacts with upcoming birthdays within the next 7 days.
+        Get contacts with upcoming birthdays within the next days.
+
+        The window is matched against the generated birthday_md (MMDD)
+        column, so the query is a range scan on the (user_id, birthday_md)
+        index. Windows crossing the new year are split into two ranges, and
+        in non-leap years contacts born on February 29 are included when
+        the window ends on February 28.
+
         Parameters:
         - user (User): Currently authenticated user.
         - limit (int): Maximum number of contacts to return.
+        - days (int): Number of days to look ahead.
+        - today (Optional[date]): First day of the window, defaults to today.
         Returns:
         - List[Contact]: List of contacts with upcoming birthdays.
-        Raises:
-        - ValueError: If the limit is less than 1.
         """
-        today = datetime.today().date()
-        seven_days_later = today + timedelta(days=7)
+        today = today or datetime.today().date()
+        end = today + timedelta(days=days)
+        start_md = today.month * 100 + today.day
+        end_md = end.month * 100 + end.day
+        if (end.month, end.day) == (2, 28) and not calendar.isleap(end.year):
+            end_md = 229
 
-        stmt = (
-            select(Contact)
-            .filter_by(user=user)
-            .filter(Contact.birthday >= today)
-            .filter(Contact.birthday <= seven_days_later)
-            .order_by(Contact.birthday)
-            .limit(limit)
-        )
+        stmt = select(Contact).filter_by(user=user)
+        if days < 365:
+            if start_md <= end_md:
+                stmt = stmt.where(Contact.birthday_md.between(start_md, end_md))
+            else:
+                stmt = stmt.where(
+                    or_(Contact.birthday_md >= start_md, Contact.birthday_md <= end_md)
+                )
+
+        stmt = stmt.order_by(
+            case((Contact.birthday_md >= start_md, 0), else_=1),
+            Contact.birthday_md,
+            Contact.id,
+        ).limit(limit)
 
         result = await self.db.execute(stmt)
         return result.scalars().all()
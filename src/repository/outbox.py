@@ -0,0 +1,177 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, delete, func, select, text, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import EmailOutbox, OutboxStatus
+from src.services.tracing import traced
+
+
+@traced("repository")
+class OutboxRepository:
+    def __init__(self, session: AsyncSession):
+        self.db = session
+
+    async def enqueue(
+        self, kind: str, recipient: str, payload: dict, now: datetime
+    ) -> None:
+        """
+        Add an email to the outbox.
+        A pending email of the same kind to the same recipient is replaced,
+        so repeated requests result in a single email with the latest payload.
+        Parameters:
+        - kind (str): Kind of the email.
+        - recipient (str): Email address of the recipient.
+        - payload (dict): Template variables of the email.
+        - now (datetime): Current time, the email is due immediately.
+        """
+        dialect = postgresql if self.db.bind.dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(EmailOutbox).values(
+            kind=kind,
+            recipient=recipient,
+            payload=payload,
+            status=OutboxStatus.PENDING,
+            attempts=0,
+            next_attempt_at=now,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EmailOutbox.kind, EmailOutbox.recipient],
+            # A literal predicate, PostgreSQL cannot match a bound parameter
+            # against the partial index.
+            index_where=text(f"status = '{OutboxStatus.PENDING.name}'"),
+            set_={
+                "payload": stmt.excluded.payload,
+                "attempts": 0,
+                "next_attempt_at": stmt.excluded.next_attempt_at,
+                "last_error": None,
+            },
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+    async def claim(self, limit: int, now: datetime, lease: float) -> List[Row]:
+        """
+        Claim a batch of due emails.
+        The rows are locked with SKIP LOCKED, so several workers can drain the
+        outbox in parallel, and their next attempt is moved lease seconds ahead
+        so that emails of a crashed worker are retried after the lease expires.
+        Parameters:
+        - limit (int): Maximum number of emails to claim.
+        - now (datetime): Current time.
+        - lease (float): Seconds the claimed emails are reserved for.
+        Returns:
+        - List[Row]: Claimed emails with id, kind, recipient, payload and attempts.
+        """
+        due = (
+            select(EmailOutbox.id)
+            .where(
+                EmailOutbox.status == OutboxStatus.PENDING,
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due.scalar_subquery()))
+            .values(
+                attempts=EmailOutbox.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=lease),
+            )
+            .returning(
+                EmailOutbox.id,
+                EmailOutbox.kind,
+                EmailOutbox.recipient,
+                EmailOutbox.payload,
+                EmailOutbox.attempts,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        rows = sorted(result.all(), key=lambda row: row.id)
+        await self.db.commit()
+        return rows
+
+    async def complete(
+        self,
+        sent: Sequence[Row],
+        failed: Sequence[Tuple[Row, str, Optional[datetime]]],
+        now: datetime,
+    ) -> None:
+        """
+        Record the results of a claimed batch in one transaction.
+        An email that was enqueued again while it was being sent has its
+        attempts reset, so it is not marked as sent and goes out again with
+        the new payload. The payload of sent and abandoned emails is cleared,
+        it is not needed anymore.
+        Parameters:
+        - sent (Sequence[Row]): Claimed emails that were delivered.
+        - failed (Sequence[tuple]): Claimed emails that failed, with the error
+          and the time of the retry (None to give up).
+        - now (datetime): Time of delivery.
+        """
+        if sent:
+            await self.db.execute(
+                update(EmailOutbox)
+                .where(
+                    tuple_(EmailOutbox.id, EmailOutbox.attempts).in_(
+                        [(row.id, row.attempts) for row in sent]
+                    )
+                )
+                .values(
+                    status=OutboxStatus.SENT, sent_at=now, last_error=None, payload={}
+                )
+                .execution_options(synchronize_session=False)
+            )
+        for row, error, next_attempt_at in failed:
+            values = {"last_error": error}
+            if next_attempt_at is None:
+                values["status"] = OutboxStatus.FAILED
+                values["payload"] = {}
+            else:
+                values["next_attempt_at"] = next_attempt_at
+            await self.db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id == row.id, EmailOutbox.attempts == row.attempts)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+        await self.db.commit()
+
+    async def delete_finished(self, before: datetime, limit: int) -> int:
+        """
+        Delete a batch of sent and failed emails enqueued before a given time.
+        Parameters:
+        - before (datetime): Emails enqueued before this time are deleted.
+        - limit (int): Maximum number of emails to delete.
+        Returns:
+        - int: Number of deleted emails.
+        """
+        finished = (
+            select(EmailOutbox.id)
+            .where(
+                EmailOutbox.status.in_([OutboxStatus.SENT, OutboxStatus.FAILED]),
+                EmailOutbox.created_at < before,
+            )
+            .limit(limit)
+        )
+        result = await self.db.execute(
+            delete(EmailOutbox)
+            .where(EmailOutbox.id.in_(finished.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def count_by_status(self) -> Dict[str, int]:
+        """
+        Count the emails in each status.
+        Returns:
+        - dict: Status value mapped to the number of emails.
+        """
+        stmt = select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status)
+        result = await self.db.execute(stmt)
+        return {status.value: count for status, count in result.all()}
@@ -1,10 +1,12 @@
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import User
 from src.schemas.auth import UserCreate
+from src.services.tracing import traced
 
 
+@traced("repository")
 class UserRepository:
     def __init__(self, session: AsyncSession):
         self.db = session
@@ -45,34 +47,48 @@ class UserRepository:
         user = await self.db.execute(stmt)
         return user.scalar_one_or_none()
 
-    async def create_user(self, body: UserCreate, avatar: str = None) -> User:
+    async def create_user(
+        self, body: UserCreate, avatar: str = None, commit: bool = True
+    ) -> User:
         """
-        Create a new user.
+        Create a new user with a single INSERT ... RETURNING statement.
+        The ID and avatar of the body are ignored, the database assigns the ID.
         Parameters:
         - body (UserCreate): User creation data.
         - avatar (str): Avatar URL.
+        - commit (bool): Commit the transaction, False leaves it to the caller.
         Returns:
         - User: The created user object.
         """
-        user = User(
-            **body.model_dump(exclude_unset=True, exclude={"password"}),
-            hashed_password=body.password,
-            avatar=avatar
+        stmt = (
+            insert(User)
+            .values(
+                **body.model_dump(
+                    exclude_unset=True, exclude={"id", "avatar", "password"}
+                ),
+                hashed_password=body.password,
+                avatar=avatar,
+            )
+            .returning(User)
         )
-        self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        result = await self.db.execute(stmt)
+        user = result.scalar_one()
+        if commit:
+            await self.db.commit()
         return user
 
-    async def confirmed_email(self, email: str) -> None:
+    async def confirmed_email(self, email: str) -> User:
         """
         Confirm the user's email.
         Parameters:
         - email (str): Email of the user to confirm.
+        Returns:
+        - User: The confirmed user object.
         """
         user = await self.get_user_by_email(email)
         user.confirmed = True
         await self.db.commit()
+        return user
 
     async def update_avatar_url(self, email: str, url: str) -> User:
         """
@@ -86,5 +102,19 @@ class UserRepository:
         user = await self.get_user_by_email(email)
         user.avatar = url
         await self.db.commit()
-        await self.db.refresh(user)
+        return user
+
+    async def reset_password(self, user_id: int, password: str) -> User | None:
+        """
+        Replace the user's password hash.
+        Parameters:
+        - user_id (int): ID of the user.
+        - password (str): New hashed password.
+        Returns:
+        - User: The updated user object if found, otherwise None.
+        """
+        user = await self.get_user_by_id(user_id)
+        if user:
+            user.hashed_password = password
+            await self.db.commit()
         return user
@@ -1,10 +1,11 @@
+import math
+
 from fastapi import (
     APIRouter,
     HTTPException,
     Depends,
     status,
     Security,
-    BackgroundTasks,
     Request,
 )
 from sqlalchemy.orm import Session
@@ -20,8 +21,10 @@ from src.services.auth import (
     get_password_from_token,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.services.cache import cache_user
+from src.services.login_throttle import get_login_throttle
+from src.services.outbox import OutboxService
 from src.services.users import UserService
-from src.services.email import send_email, send_reset_password_email
 from src.database.db import get_db
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -30,16 +33,16 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_data: UserCreate,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: Session = Depends(get_db),
 ):
     """
     Registration of a new user.
+    The user and their verification email are written in one transaction,
+    so a failure cannot leave a user whose email was never queued.
 
     Parameters:
     - user_data (UserCreate): Data of the new user.
-    - background_tasks (BackgroundTasks): Object for executing background tasks.
     - request (Request): Request to get the base URL.
     - db (AsyncSession): Database session.
 
@@ -58,22 +61,30 @@ async def register_user(
             detail="User with this email already exists",
         )
 
-    user_data.password = Hash().get_password_hash(user_data.password)
-    new_user = await user_service.create_user(user_data)
-    background_tasks.add_task(
-        send_email, new_user.email, new_user.username, request.base_url
+    user_data.password = await Hash().get_password_hash(user_data.password)
+    new_user = await user_service.create_user(user_data, commit=False)
+    # Queueing the email commits the transaction of both rows.
+    await OutboxService(db).enqueue_verification_email(
+        new_user.email, new_user.username, request.base_url
     )
     return new_user
 
 
 @router.post("/login", response_model=Token)
 async def login_user(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(get_db),
 ):
     """
     User authorization.
 
+    Too many failed attempts for a username or from an address lock them
+    out for a growing time; locked out attempts are rejected before the
+    user lookup and the password check.
+
     Parameters:
+    - request (Request): Request to get the client address.
     - form_data (OAuth2PasswordRequestForm): Data for authorization.
     - db (AsyncSession): Database session.
 
@@ -82,22 +93,40 @@ async def login_user(
 
     Raises:
     - HTTPException (401): If the login or password is incorrect, or the email is not confirmed.
+    - HTTPException (429): If the username or the address is locked out.
     """
 
+    throttle = get_login_throttle()
+    address = request.client.host if request.client else "unknown"
+    wait = await throttle.check(form_data.username, address)
+    if wait:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts. Please try again later.",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
     user_service = UserService(db)
     user = await user_service.get_user_by_username(form_data.username)
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    if not user or not await Hash().verify_password(
+        form_data.password, user.hashed_password
+    ):
+        await throttle.failure(form_data.username, address)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    await throttle.success(form_data.username)
     if not user.confirmed:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email not confirmed",
         )
-    access_token = await create_access_token(data={"sub": user.username})
+    await cache_user(user)
+    access_token = await create_access_token(
+        data={"sub": user.username, "uid": user.id}
+    )
     return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -133,7 +162,6 @@ async def confirmed_email(token: str, db: Session = Depends(get_db)):
 @router.post("/request_email")
 async def request_email(
     body: RequestEmail,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: Session = Depends(get_db),
 ):
@@ -142,7 +170,6 @@ async def request_email(
 
     Parameters:
     - body (RequestEmail): Request data (user's email).
-    - background_tasks (BackgroundTasks): Object for executing background tasks.
     - request (Request): Request to get the base URL.
     - db (AsyncSession): Database session.
 
@@ -152,11 +179,11 @@ async def request_email(
     user_service = UserService(db)
     user = await user_service.get_user_by_email(body.email)
 
-    if user.confirmed:
+    if user and user.confirmed:
         return {"message": "Email address confirmed"}
     if user:
-        background_tasks.add_task(
-            send_email, user.email, user.username, request.base_url
+        await OutboxService(db).enqueue_verification_email(
+            user.email, user.username, request.base_url
         )
     return {"message": "Check your email for confirmation link"}
 
@@ -164,7 +191,6 @@ async def request_email(
 @router.post("/reset_password")
 async def reset_password_request(
     body: ResetPassword,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
@@ -172,7 +198,6 @@ async def reset_password_request(
     Requesting a password reset.
     Parameters:
     - body (ResetPassword): Request data (user's email).
-    - background_tasks (BackgroundTasks): Object for executing background tasks.
     - request (Request): Request to get the base URL.
     - db (AsyncSession): Database session.
     Returns:
@@ -190,16 +215,12 @@ async def reset_password_request(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email not confirmed",
         )
-    hashed_password = Hash().get_password_hash(body.password)
-    reset_token = await create_access_token(
-        data={"sub": user.email, "password": hashed_password}
-    )
-    background_tasks.add_task(
-        send_reset_password_email,
-        to_email=body.email,
+    hashed_password = await Hash().get_password_hash(body.password)
+    await OutboxService(db).enqueue_reset_password_email(
+        to_email=user.email,
         username=user.username,
         host=str(request.base_url),
-        reset_token=reset_token,
+        password_hash=hashed_password,
     )
     return {"message": "Check your email for password reset link"}
 
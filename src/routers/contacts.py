@@ -1,10 +1,22 @@
-from typing import List, Literal, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.services.contacts import ContactService
-from src.database.db import get_db
-from src.schemas.schemas import ContactBase, ContactResponse, ContactUpdate
+from src.services.contact_export import EXPORT_FORMATS
+from src.services.contact_import import IMPORT_PARSERS, ImportFormatError, import_format
+from src.database.db import get_db, get_read_db, get_read_session_factory
+from src.schemas.schemas import (
+    ContactBase,
+    ContactBulkResult,
+    ContactBulkUpdate,
+    ContactImportResult,
+    ContactPage,
+    ContactResponse,
+    ContactSelection,
+    ContactUpdate,
+)
 from src.schemas.auth import User
 from src.services.auth import get_current_user
 
@@ -14,50 +26,79 @@ router = APIRouter(prefix="/contacts", tags=["contacts"])
 SearchField = Literal["email", "name", "last_name"]
 
 
-@router.get("/", response_model=List[ContactResponse])
+@router.get("/", response_model=Union[List[ContactResponse], ContactPage])
 async def get_contacts(
     offset: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     """
     Getting the full list of contacts
 
+    Offset pagination is used by default. Passing ``cursor`` (an empty value
+    for the first page) switches to keyset pagination, which costs the same
+    regardless of page depth.
+
     Parameters:
     - offset (int): Number of contacts to skip.
     - limit (int): Number of limits to search for (minimum 1).
-    - db (AsyncSession): Database session.
+    - cursor (str): Cursor returned as next_cursor by the previous page.
+    - db (AsyncSession): Read-only database session.
     - user (User): Currently authenticated user.
 
     Returns:
     - List[ContactResponse]: List of contacts
+    - ContactPage: Page of contacts with next_cursor, when cursor is passed.
+
+    Raises:
+    - HTTPException (400): If the cursor is malformed.
     """
     contact_service = ContactService(db)
+    if cursor is not None:
+        try:
+            return await contact_service.get_contacts_page(limit, cursor, user)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
     contacts = await contact_service.get_contacts(limit, offset, user)
     return contacts
 
 
-@router.get("/search", response_model=List[ContactResponse])
+@router.get("/search", response_model=Union[List[ContactResponse], ContactPage])
 async def search_contacts(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     email: Optional[str] = Query(None),
     name: Optional[str] = Query(None),
     last_name: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
     user: User = Depends(get_current_user),
 ):
     """
     Search for the list of contacts by parameters
 
+    Results are ranked by similarity to the search terms. Passing ``cursor``
+    (an empty value for the first page) returns a ContactPage with
+    next_cursor for fetching the following results.
+
     Parameters:
-    - db (AsyncSession): Database session.
+    - db (AsyncSession): Read-only database session.
     - email (str): Email of the contact to search for.
     - name (str): Name of the contact to search for.
     - last_name (str): Last name of the contact to search for.
+    - limit (int): Number of contacts to return (1 to 1000).
+    - cursor (str): Cursor returned as next_cursor by the previous page.
     - user (User): Currently authenticated user.
 
     Returns:
     - List[ContactResponse]: List of contacts
+    - ContactPage: Page of contacts with next_cursor, when cursor is passed.
+
+    Raises:
+    - HTTPException (400): If no filter is provided or the cursor is malformed.
     """
     filters = {"email": email, "name": name, "last_name": last_name}
     if not any(filters.values()):
@@ -67,7 +108,16 @@ async def search_contacts(
         )
 
     contact_service = ContactService(db)
-    contacts = await contact_service.search_contacts(filters, user)
+    if cursor is not None:
+        try:
+            return await contact_service.search_contacts_page(
+                filters, user, limit, cursor
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+    contacts = await contact_service.search_contacts(filters, user, limit)
     return contacts
 
 
@@ -92,9 +142,161 @@ async def create_contact(
     return await contact_service.create_contact(body, user)
 
 
+@router.post(
+    "/import",
+    response_model=ContactImportResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_contacts(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Importing contacts from a CSV or NDJSON file
+
+    The file is sent as the request body and parsed while it is received.
+    A CSV file starts with a header naming the columns (name, last_name,
+    email, phone, birthday, additional_data); an NDJSON file holds one JSON
+    object per line. Invalid rows and rows with an existing email are
+    reported and skipped, the other rows are imported in one transaction.
+
+    Parameters:
+    - request (Request): Request whose body is the file.
+    - format (str): "csv" or "ndjson", taken from Content-Type when omitted.
+    - db (AsyncSession): Database session.
+    - user (User): Currently authenticated user.
+    Returns:
+    - ContactImportResult: Number of read, imported and failed rows and the row errors.
+    Raises:
+    - HTTPException (415): If the format is not supported.
+    - HTTPException (400): If the file cannot be parsed.
+    """
+    format = format or import_format(request.headers.get("content-type"))
+    if format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload text/csv or application/x-ndjson",
+        )
+    contact_service = ContactService(db)
+    try:
+        return await contact_service.import_contacts(
+            IMPORT_PARSERS[format](request.stream()), user
+        )
+    except ImportFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/bulk/update", response_model=ContactBulkResult)
+async def bulk_update_contacts(
+    body: ContactBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Updating many contacts at once
+
+    The contacts are chosen by IDs and/or search filters and updated with a
+    single statement. Only the fields passed in ``changes`` are set.
+
+    Parameters:
+    - body (ContactBulkUpdate): Selected contacts and fields to set.
+    - db (AsyncSession): Database session.
+    - user (User): Currently authenticated user.
+    Returns:
+    - ContactBulkResult: Number and IDs of the updated contacts.
+    """
+    contact_service = ContactService(db)
+    return await contact_service.bulk_update_contacts(body, user)
+
+
+@router.post("/bulk/delete", response_model=ContactBulkResult)
+async def bulk_delete_contacts(
+    body: ContactSelection,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Deleting many contacts at once
+
+    The contacts are chosen by IDs and/or search filters and deleted with a
+    single statement.
+
+    Parameters:
+    - body (ContactSelection): Selected contacts.
+    - db (AsyncSession): Database session.
+    - user (User): Currently authenticated user.
+    Returns:
+    - ContactBulkResult: Number and IDs of the deleted contacts.
+    """
+    contact_service = ContactService(db)
+    return await contact_service.bulk_delete_contacts(body, user)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {
+                export_format.media_type: {}
+                for export_format in EXPORT_FORMATS.values()
+            }
+        }
+    },
+)
+async def export_contacts(
+    format: Literal["csv", "ndjson", "vcard"] = Query("csv"),
+    gzip: bool = Query(False),
+    read_session=Depends(get_read_session_factory),
+    user: User = Depends(get_current_user),
+):
+    """
+    Exporting all contacts as a CSV, NDJSON or vCard file
+
+    The file is streamed while the contacts are read from the database.
+    CSV and NDJSON exports use the columns accepted by the import.
+
+    Parameters:
+    - format (str): "csv", "ndjson" or "vcard".
+    - gzip (bool): Whether to send the file gzip-compressed (.gz).
+    - read_session: Factory of the read-only session used by the stream.
+    - user (User): Currently authenticated user.
+    Returns:
+    - StreamingResponse: The export file as an attachment.
+    """
+    export_format = EXPORT_FORMATS[format]
+    media_type = export_format.media_type
+    filename = f"contacts.{export_format.extension}"
+    if gzip:
+        media_type = "application/gzip"
+        filename += ".gz"
+
+    async def body():
+        async with read_session() as db:
+            async for chunk in ContactService(db).export_contacts(user, format, gzip):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/birthdays", response_model=List[ContactResponse])
 async def get_upcoming_birthdays(
     limit: int = 100,
+    days: int = Query(7, ge=0, le=366),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -103,6 +305,7 @@ async def get_upcoming_birthdays(
 
     Parameters:
     - limit (int): Number of limits to search for (minimum 1).
+    - days (int): Number of days to look ahead (0 to 366, default 7).
     - db (AsyncSession): Database session.
     - user (User): Currently authenticated user.
 
@@ -111,19 +314,21 @@ async def get_upcoming_birthdays(
     """
 
     contact_service = ContactService(db)
-    contacts = await contact_service.get_upcoming_birthdays(user, limit)
+    contacts = await contact_service.get_upcoming_birthdays(user, limit, days)
     return contacts
 
 
 @router.get("/{id}", response_model=ContactResponse)
 async def get_contact(
-    id: int, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)
+    id: int,
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_user),
 ):
     """
     Getting a contact by ID
     Parameters:
     - id (int): ID of the contact to retrieve.
-    - db (AsyncSession): Database session.
+    - db (AsyncSession): Read-only database session.
     - user (User): Currently authenticated user.
     Returns:
     - ContactResponse: Contact data.
@@ -2,7 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from src.database.db import get_db
+from src.database.db import get_db, sessionmanager
+from src.services.cache import get_cache_stats
+from src.services.login_throttle import get_login_throttle
+from src.services.outbox import OutboxService
+from src.services.rate_limit import get_rate_limiter
+from src.services.workers import get_worker_stats
 
 router = APIRouter(tags=["healthcheck"])
 
@@ -31,3 +36,60 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the database",
         )
+
+
+@router.get("/healthchecker/cache")
+async def cache_stats():
+    """
+    Cache statistics endpoint.
+    This endpoint returns hit and miss counters of the application caches.
+    """
+    return get_cache_stats()
+
+
+@router.get("/healthchecker/pool")
+async def pool_stats():
+    """
+    Connection pool statistics endpoint.
+    This endpoint returns pool statistics of the primary and the lag of the replicas.
+    """
+    return {
+        "primary": sessionmanager.pool_stats(),
+        "replicas": sessionmanager.replica_stats(),
+    }
+
+
+@router.get("/healthchecker/workers")
+async def worker_stats():
+    """
+    Worker pool statistics endpoint.
+    This endpoint returns the queue depth and wait times of the worker pools.
+    """
+    return get_worker_stats()
+
+
+@router.get("/healthchecker/outbox")
+async def outbox_stats(db: AsyncSession = Depends(get_db)):
+    """
+    Email outbox statistics endpoint.
+    This endpoint returns the number of pending, sent and failed emails.
+    """
+    return await OutboxService(db).stats()
+
+
+@router.get("/healthchecker/ratelimit")
+async def rate_limit_stats():
+    """
+    Rate limiter statistics endpoint.
+    This endpoint returns the number of allowed and limited requests and Redis errors.
+    """
+    return get_rate_limiter().stats()
+
+
+@router.get("/healthchecker/login")
+async def login_throttle_stats():
+    """
+    Login throttle statistics endpoint.
+    This endpoint returns the number of rejected attempts, failed logins and Redis errors.
+    """
+    return get_login_throttle().stats()
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.db import get_db
+from src.services.metrics import (
+    generate_metrics,
+    is_allowed_client,
+    update_outbox_metrics,
+)
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Prometheus metrics endpoint.
+    This endpoint returns request latencies, database pool, cache, worker pool
+    and email outbox statistics in the Prometheus text format.
+    Only clients in METRICS_ALLOWED_NETWORKS (loopback by default) may read it.
+    When the app runs several worker processes, PROMETHEUS_MULTIPROC_DIR must
+    point to an empty directory shared by the workers, which is cleared before
+    they start, so that request metrics are aggregated over all of them.
+    Parameters:
+    - request (Request): Request to get the client address.
+    - db (AsyncSession): Database session.
+    Raises:
+    - HTTPException (403): If the client is not allowed to read the metrics.
+    """
+    if not is_allowed_client(request.client.host if request.client else None):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    await update_outbox_metrics(db)
+    return Response(generate_metrics(), media_type=CONTENT_TYPE_LATEST)
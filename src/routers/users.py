@@ -1,23 +1,27 @@
-from fastapi import APIRouter, Depends, Request, UploadFile, File
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 from src.schemas.auth import User
 from src.services.auth import get_current_admin_user, get_current_user
-from src.config.config import config
-from src.services.uplaod import UploadFileService
+from src.services.rate_limit import RateLimit
+from src.services.uplaod import (
+    FileTooLargeError,
+    InvalidImageError,
+    UploadFileService,
+    get_upload_service,
+)
 from src.services.users import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
-limiter = Limiter(key_func=get_remote_address)
 
 
 @router.get(
-    "/me", response_model=User, description="No more than 10 requests per minute"
+    "/me",
+    response_model=User,
+    description="No more than 10 requests per minute",
+    dependencies=[Depends(RateLimit("10/minute", "users_me"))],
 )
-@limiter.limit("10/minute")
 async def me(request: Request, user: User = Depends(get_current_user)):
     """
     This endpoint retrieves the details of the currently authenticated user.
@@ -41,6 +45,7 @@ async def update_avatar_user(
     file: UploadFile = File(),
     user: User = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db),
+    upload_service: UploadFileService = Depends(get_upload_service),
 ):
     """
     This endpoint allows the Admin to update their avatar.
@@ -49,16 +54,28 @@ async def update_avatar_user(
     - file (UploadFile): The new avatar file to be uploaded.
     - user (User): The currently authenticated Admin.
     - db (AsyncSession): The database session.
+    - upload_service (UploadFileService): Service uploading the file to the storage.
     Returns:
     - User: The updated user details with the new avatar URL.
     Raises:
     - HTTPException: If no file is uploaded or if the upload fails.
+    - HTTPException (413): If the file is larger than AVATAR_MAX_SIZE.
+    - HTTPException (400): If the file is not a supported image.
     """
     if not file:
         return {"message": "No file uploaded"}
-    avatar_url = UploadFileService(
-        config.CLD_NAME, config.CLD_API_KEY, config.CLD_API_SECRET
-    ).upload_file(file, user.username)
+    try:
+        avatar_url = await upload_service.upload_file(file, user.username)
+    except FileTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File is too large",
+        )
+    except InvalidImageError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported image",
+        )
 
     user_service = UserService(db)
     user = await user_service.update_avatar_url(user.email, avatar_url)
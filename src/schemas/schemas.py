@@ -1,8 +1,8 @@
 from pydantic import BaseModel
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import Field, EmailStr
+from pydantic import ConfigDict, Field, EmailStr, model_validator
 
 
 class ContactBase(BaseModel):
@@ -35,9 +35,72 @@ class ContactResponse(ContactBase):
     id: int
 
 
+class ContactPage(BaseModel):
+    """
+    ContactPage schema for keyset pagination.
+    Attributes:
+        items (List[ContactResponse]): Contacts of the current page.
+        next_cursor (Optional[str]): Cursor of the next page, None on the last page.
+    """
+
+    items: List[ContactResponse]
+    next_cursor: Optional[str] = None
+
+
+class ContactImport(ContactBase):
+    """
+    ContactImport schema for validating rows of a bulk import.
+    Adds the column limits of the contacts table to ContactBase, so invalid
+    rows are reported instead of failing the whole import transaction.
+    Attributes:
+        name (str): Name of the contact, up to 50 characters.
+        last_name (str): Last name of the contact, up to 255 characters.
+        email (str): Email address of the contact, up to 128 characters.
+        phone (str): Phone number of the contact, up to 128 characters.
+        birthday (date): Birthday of the contact.
+        additional_data (Optional[str]): Additional data, up to 255 characters.
+    """
+
+    name: str = Field(min_length=1, max_length=50)
+    last_name: str = Field(min_length=1, max_length=255)
+    email: str = Field(min_length=1, max_length=128)
+    phone: str = Field(min_length=1, max_length=128)
+    birthday: date
+    additional_data: Optional[str] = Field(None, max_length=255)
+
+
+class ContactImportError(BaseModel):
+    """
+    ContactImportError schema describing a rejected import row.
+    Attributes:
+        row (int): Number of the row in the file, starting at 1 for the first record.
+        error (str): Why the row was rejected.
+    """
+
+    row: int
+    error: str
+
+
+class ContactImportResult(BaseModel):
+    """
+    ContactImportResult schema for the outcome of a bulk import.
+    Attributes:
+        rows (int): Number of records read from the file.
+        imported (int): Number of contacts created.
+        failed (int): Number of rejected rows.
+        errors (List[ContactImportError]): Rejected rows, at most IMPORT_MAX_ERRORS of them.
+    """
+
+    rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[ContactImportError] = []
+
+
 class ContactUpdate(ContactBase):
     """
     ContactUpdate schema for Pydantic validation."
+    Only the passed fields are changed; only additional_data can be set to null.
     Attributes:
         name (Optional[str]): Name of the contact.
         last_name (Optional[str]): Last name of the contact.
@@ -50,6 +113,17 @@ class ContactUpdate(ContactBase):
     email: Optional[str] = None
     phone: Optional[str] = None
 
+    @model_validator(mode="after")
+    def check_required_not_null(self):
+        nulls = sorted(
+            field
+            for field in self.model_fields_set
+            if field != "additional_data" and getattr(self, field) is None
+        )
+        if nulls:
+            raise ValueError(f"{', '.join(nulls)} cannot be null")
+        return self
+
 
 class ContactSearchParams(BaseModel):
     """
@@ -65,6 +139,93 @@ class ContactSearchParams(BaseModel):
     last_name: Optional[str] = None
 
 
+class ContactSelection(BaseModel):
+    """
+    ContactSelection schema for choosing the contacts of a bulk operation.
+    Contacts matching both the IDs and the filters are selected; the filters
+    are the case-insensitive substring matches of the search endpoint.
+    Attributes:
+        ids (Optional[List[int]]): IDs of the contacts.
+        filters (Optional[ContactSearchParams]): Name, last name or email to match.
+    """
+
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    filters: Optional[ContactSearchParams] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.ids and not (self.filters and self.filter_values()):
+            raise ValueError("Pass ids or at least one filter")
+        return self
+
+    def filter_values(self) -> dict:
+        """
+        Get the filters that have a value.
+        Returns:
+        - dict: Filter values by field name.
+        """
+        if self.filters is None:
+            return {}
+        return {field: value for field, value in self.filters if value}
+
+
+class ContactBulkChanges(BaseModel):
+    """
+    ContactBulkChanges schema for the fields set by a bulk update.
+    Only the passed fields are changed. The email cannot be changed in bulk,
+    since it is unique.
+    Attributes:
+        name (Optional[str]): Name of the contacts.
+        last_name (Optional[str]): Last name of the contacts.
+        phone (Optional[str]): Phone number of the contacts.
+        birthday (Optional[date]): Birthday of the contacts.
+        additional_data (Optional[str]): Additional data of the contacts.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: Optional[str] = Field(None, min_length=1, max_length=50)
+    last_name: Optional[str] = Field(None, min_length=1, max_length=255)
+    phone: Optional[str] = Field(None, min_length=1, max_length=128)
+    birthday: Optional[date] = None
+    additional_data: Optional[str] = Field(None, max_length=255)
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        if not self.model_fields_set:
+            raise ValueError("Pass at least one field to change")
+        nulls = sorted(
+            field
+            for field in self.model_fields_set
+            if field != "additional_data" and getattr(self, field) is None
+        )
+        if nulls:
+            raise ValueError(f"{', '.join(nulls)} cannot be null")
+        return self
+
+
+class ContactBulkUpdate(ContactSelection):
+    """
+    ContactBulkUpdate schema for updating many contacts at once.
+    Attributes:
+        changes (ContactBulkChanges): Fields to set on the selected contacts.
+    """
+
+    changes: ContactBulkChanges
+
+
+class ContactBulkResult(BaseModel):
+    """
+    ContactBulkResult schema for the outcome of a bulk operation.
+    Attributes:
+        count (int): Number of affected contacts.
+        ids (List[int]): IDs of the affected contacts.
+    """
+
+    count: int
+    ids: List[int]
+
+
 class Contact(ContactBase):
     """
     Contact schema for Pydantic validation.
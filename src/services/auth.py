@@ -1,6 +1,5 @@
 from datetime import datetime, timedelta, UTC
 from typing import Optional
-from aiocache import cached
 
 from fastapi import Depends, HTTPException, status
 from passlib.context import CryptContext
@@ -13,16 +12,23 @@ from src.database.db import get_db
 from src.config.config import config
 from src.services.users import UserService
 from src.database.models import User, UserRole
+from src.services.cache import cache_user, get_cached_user, user_from_snapshot
+from src.services.workers import WorkerPool
+
+password_hash_pool = WorkerPool("password_hash", config.PASSWORD_HASH_WORKERS)
 
 
 class Hash:
     """ "
     Hashing class for password hashing and verification.
+
+    bcrypt is CPU bound, so both operations run in the password_hash_pool
+    worker pool instead of the event loop.
     """
 
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-    def verify_password(self, plain_password, hashed_password):
+    async def verify_password(self, plain_password, hashed_password):
         """
         Verify the provided password against the hashed password.
         Parameters:
@@ -31,9 +37,11 @@ class Hash:
         Returns:
         - bool: True if the password matches, False otherwise.
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return await password_hash_pool.run(
+            self.pwd_context.verify, plain_password, hashed_password
+        )
 
-    def get_password_hash(self, password: str):
+    async def get_password_hash(self, password: str):
         """
         Hash the provided password.
         Parameters:
@@ -41,7 +49,7 @@ class Hash:
         Returns:
         - str: The hashed password.
         """
-        return self.pwd_context.hash(password)
+        return await password_hash_pool.run(self.pwd_context.hash, password)
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -73,11 +81,16 @@ async def get_current_user(
 ) -> User:
     """
     Get the current user from the JWT token.
+
+    Tokens carry the user ID in the "uid" claim, which is used to look up
+    a user snapshot in the in-process cache and then in Redis. The database
+    is only queried on a cache miss or for tokens without the claim.
+
     Parameters:
     - token (str): The JWT token.
     - db (AsyncSession): The database session.
     Returns:
-    - User: The user object.
+    - User: Detached user object.
     Raises:
     - HTTPException (401): If the token is invalid or user not found.
     """
@@ -94,13 +107,18 @@ async def get_current_user(
         username = payload["sub"]
         if username is None:
             raise credentials_exception
-    except JWTError as e:
+    except (JWTError, KeyError) as e:
         raise credentials_exception
-    user_service = UserService(db)
-    user = await user_service.get_user_by_username(username)
-    if user is None:
-        raise credentials_exception
-    return user
+
+    user_id = payload.get("uid")
+    snapshot = await get_cached_user(user_id) if user_id is not None else None
+    if snapshot is None or snapshot["username"] != username:
+        user_service = UserService(db)
+        user = await user_service.get_user_by_username(username)
+        if user is None:
+            raise credentials_exception
+        snapshot = await cache_user(user)
+    return user_from_snapshot(snapshot)
 
 
 def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
@@ -119,27 +137,6 @@ def get_current_admin_user(current_user: User = Depends(get_current_user)) -> Us
     return current_user
 
 
-def cache_key_builder(func, args, kwargs) -> str:
-    """
-    Build a cache key for the user based on the username.
-    Parameters:
-    - func: The function being cached.
-    - args: The positional arguments passed to the function.
-    """
-    return f"username: {args[0]}"
-
-
-@cached(ttl=300, key_builder=cache_key_builder)
-async def get_user_from_db(username: str, db: AsyncSession) -> User:
-    """
-    Отримує користувача з бази даних, використовуючи кешування.
-    """
-    print("NOT CACHED USER")
-    user_service = UserService(db)
-    user = await user_service.get_user_by_username(username)
-    return user
-
-
 def create_email_token(data: dict):
     """
     Create a JWT token for email confirmation.
@@ -155,6 +152,20 @@ def create_email_token(data: dict):
     return token
 
 
+def create_reset_password_token(email: str, password_hash: str) -> str:
+    """
+    Create a JWT token confirming a password reset.
+    Parameters:
+    - email (str): The email address of the user.
+    - password_hash (str): Hash of the new password.
+    Returns:
+    - str: The encoded JWT token, valid for JWT_EXPIRATION_SECONDS.
+    """
+    expire = datetime.now(UTC) + timedelta(seconds=config.JWT_EXPIRATION_SECONDS)
+    to_encode = {"sub": email, "password": password_hash, "exp": expire}
+    return jwt.encode(to_encode, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
+
+
 async def get_email_from_token(token: str):
     """ "
     Decode the JWT token to get the email.
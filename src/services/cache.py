@@ -1,13 +1,336 @@
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, Optional
+
+import orjson
 from aiocache import caches
+from aiocache.serializers import BaseSerializer
+from pydantic import BaseModel
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.config.config import config
+from src.database.models import User, UserRole
+from src.services.tracing import traced_span
+
+logger = logging.getLogger(__name__)
+
+# Span attributes of calls to the Redis cache.
+REDIS = {"db.system": "redis"}
+
+
+class VersionedJsonSerializer(BaseSerializer):
+    """
+    Serialize cache values to JSON with a schema version prefix.
+
+    Values are stored as ``b"<version>:<json>"``. Entries written with a
+    different version (or by another serializer) are treated as misses, so
+    deploys that change cached shapes only need to bump VERSION.
+    """
+
+    DEFAULT_ENCODING = None
+    VERSION = b"v1"
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Serialize a value.
+        Parameters:
+        - value: JSON-compatible value, Pydantic models are dumped to dicts.
+        Returns:
+        - bytes: Versioned JSON document.
+        """
+        return self.VERSION + b":" + orjson.dumps(value, default=self._default)
+
+    def loads(self, value: Optional[bytes]) -> Any:
+        """
+        Deserialize a value.
+        Parameters:
+        - value (bytes): Stored value.
+        Returns:
+        - The decoded value, or None if it is missing or has another version.
+        """
+        if value is None:
+            return None
+        version, _, body = value.partition(b":")
+        if version != self.VERSION:
+            return None
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return None
+
+    @staticmethod
+    def _default(value: Any) -> Any:
+        """
+        Convert values orjson does not support natively.
+        Parameters:
+        - value: Value to convert.
+        Returns:
+        - JSON-compatible representation of the value.
+        Raises:
+        - TypeError: If the value is not supported.
+        """
+        if isinstance(value, BaseModel):
+            return value.model_dump(mode="json")
+        raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
 
 caches.set_config(
     {
         "default": {
             "cache": "aiocache.RedisCache",
-            "endpoint": "localhost",
-            "port": 6379,
+            "endpoint": config.REDIS_HOST,
+            "port": config.REDIS_PORT,
             "timeout": 10,
-            "serializer": {"class": "aiocache.serializers.PickleSerializer"},
+            "serializer": {"class": "src.services.cache.VersionedJsonSerializer"},
         }
     }
 )
+
+
+class CacheCounter:
+    """
+    Hit and miss counters of a single cache.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self) -> None:
+        """
+        Record a cache hit.
+        """
+        self.hits += 1
+
+    def miss(self) -> None:
+        """
+        Record a cache miss.
+        """
+        self.misses += 1
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Get the counters as a dictionary.
+        Returns:
+        - dict: Hits, misses and the hit ratio.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+cache_counters: Dict[str, CacheCounter] = defaultdict(CacheCounter)
+
+
+def get_cache():
+    """
+    Get the shared application cache.
+    Returns:
+    - BaseCache: The cache configured under the "default" alias.
+    """
+    return caches.get("default")
+
+
+def get_cache_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Get hit and miss counters of every named cache.
+    Returns:
+    - dict: Counters keyed by cache name.
+    """
+    return {name: counter.as_dict() for name, counter in cache_counters.items()}
+
+
+def seconds_until_midnight(now: Optional[datetime] = None) -> int:
+    """
+    Get the number of seconds left until the next local midnight.
+    Parameters:
+    - now (Optional[datetime]): Current time, defaults to now.
+    Returns:
+    - int: Seconds until midnight, at least 1.
+    """
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max(int((midnight - now).total_seconds()), 1)
+
+
+class LocalTTLCache:
+    """
+    In-process LRU cache with a time to live for every entry.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Get a value by key.
+        Parameters:
+        - key: Key of the entry.
+        Returns:
+        - The cached value, or None if it is missing or expired.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+        Parameters:
+        - key: Key of the entry.
+        - value: Value to store.
+        """
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove an entry.
+        Parameters:
+        - key: Key of the entry.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        self._data.clear()
+
+
+user_local_cache = LocalTTLCache(
+    config.USER_CACHE_LOCAL_SIZE, config.USER_CACHE_LOCAL_TTL
+)
+
+
+def _user_key(user_id: int) -> str:
+    """
+    Build the cache key of a user snapshot.
+    Parameters:
+    - user_id (int): ID of the user.
+    Returns:
+    - str: Cache key.
+    """
+    return f"user:{user_id}"
+
+
+def user_to_snapshot(user: User) -> Dict[str, Any]:
+    """
+    Convert a user into a snapshot safe to share between requests.
+    The password hash is deliberately left out.
+    Parameters:
+    - user (User): The user object.
+    Returns:
+    - dict: Snapshot of the user.
+    """
+    role = user.role or UserRole.USER
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "avatar": user.avatar,
+        "confirmed": user.confirmed,
+        "role": UserRole(role).value,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+    }
+
+
+def user_from_snapshot(snapshot: Dict[str, Any]) -> User:
+    """
+    Build a detached user object from a snapshot.
+    Parameters:
+    - snapshot (dict): Snapshot produced by user_to_snapshot.
+    Returns:
+    - User: Detached user object that can be used in queries of any session.
+    """
+    created_at = snapshot["created_at"]
+    user = User(
+        id=snapshot["id"],
+        username=snapshot["username"],
+        email=snapshot["email"],
+        avatar=snapshot["avatar"],
+        confirmed=snapshot["confirmed"],
+        role=UserRole(snapshot["role"]),
+        created_at=datetime.fromisoformat(created_at) if created_at else None,
+    )
+    make_transient_to_detached(user)
+    return user
+
+
+async def get_cached_user(user_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Get a user snapshot from the in-process cache, then from Redis.
+    Parameters:
+    - user_id (int): ID of the user.
+    Returns:
+    - dict: Snapshot of the user, or None if it is not cached.
+    """
+    key = _user_key(user_id)
+    snapshot = user_local_cache.get(key)
+    if snapshot is not None:
+        cache_counters["user_local"].hit()
+        return snapshot
+    cache_counters["user_local"].miss()
+
+    try:
+        with traced_span("cache get", **REDIS):
+            snapshot = await get_cache().get(key)
+    except Exception as e:
+        logger.warning("User cache get failed: %s", e)
+        snapshot = None
+    if snapshot is None:
+        cache_counters["user_redis"].miss()
+        return None
+    cache_counters["user_redis"].hit()
+    user_local_cache.set(key, snapshot)
+    return snapshot
+
+
+async def cache_user(user: User) -> Dict[str, Any]:
+    """
+    Store a user snapshot in both cache tiers.
+    Parameters:
+    - user (User): The user object.
+    Returns:
+    - dict: Snapshot of the user.
+    """
+    snapshot = user_to_snapshot(user)
+    key = _user_key(user.id)
+    user_local_cache.set(key, snapshot)
+    try:
+        with traced_span("cache set", **REDIS):
+            await get_cache().set(key, snapshot, ttl=config.USER_CACHE_TTL)
+    except Exception as e:
+        logger.warning("User cache set failed: %s", e)
+    return snapshot
+
+
+async def invalidate_user(user_id: int) -> None:
+    """
+    Remove a user snapshot from both cache tiers.
+    Other workers drop their in-process copy when its TTL expires.
+    Parameters:
+    - user_id (int): ID of the user.
+    """
+    key = _user_key(user_id)
+    user_local_cache.delete(key)
+    try:
+        with traced_span("cache delete", **REDIS):
+            await get_cache().delete(key)
+    except Exception as e:
+        logger.warning("User cache delete failed: %s", e)
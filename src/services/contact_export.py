@@ -0,0 +1,174 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Callable, Dict, NamedTuple, Sequence
+
+from sqlalchemy import Row
+
+FIELDS = ("name", "last_name", "email", "phone", "birthday", "additional_data")
+
+
+class ExportFormat(NamedTuple):
+    """
+    Output format of the contact export.
+    """
+
+    media_type: str
+    extension: str
+    header: str
+    render: Callable[[Sequence[Row]], str]
+
+
+def render_csv(rows: Sequence[Row]) -> str:
+    """
+    Render contacts as CSV records, in the column order of FIELDS.
+    Parameters:
+    - rows (Sequence[Row]): Contacts to render.
+    Returns:
+    - str: CSV records.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\r\n")
+    writer.writerows(
+        (
+            row.name,
+            row.last_name,
+            row.email,
+            row.phone,
+            row.birthday.isoformat(),
+            row.additional_data or "",
+        )
+        for row in rows
+    )
+    return buffer.getvalue()
+
+
+def render_ndjson(rows: Sequence[Row]) -> str:
+    """
+    Render contacts as one JSON object per line.
+    Parameters:
+    - rows (Sequence[Row]): Contacts to render.
+    Returns:
+    - str: NDJSON lines.
+    """
+    return "".join(
+        json.dumps(
+            {
+                "name": row.name,
+                "last_name": row.last_name,
+                "email": row.email,
+                "phone": row.phone,
+                "birthday": row.birthday.isoformat(),
+                "additional_data": row.additional_data,
+            },
+            ensure_ascii=False,
+        )
+        + "\n"
+        for row in rows
+    )
+
+
+def vcard_escape(value: str) -> str:
+    """
+    Escape a vCard text value.
+    Parameters:
+    - value (str): Value to escape.
+    Returns:
+    - str: Value with backslashes, commas, semicolons and newlines escaped.
+    """
+    return (
+        value.replace("\\", "\\\\")
+        .replace(",", "\\,")
+        .replace(";", "\\;")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def vcard_fold(line: str) -> str:
+    """
+    Fold a vCard content line into lines of at most 75 octets.
+    Parameters:
+    - line (str): Content line without the line break.
+    Returns:
+    - str: Folded line ending with CRLF.
+    """
+    if len(line.encode()) <= 75:
+        return line + "\r\n"
+    parts, part, size = [], "", 0
+    for char in line:
+        char_size = len(char.encode())
+        # Continuation lines start with a space, which counts towards the limit.
+        if size + char_size > (75 if not parts else 74):
+            parts.append(part)
+            part, size = "", 0
+        part += char
+        size += char_size
+    parts.append(part)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def render_vcard(rows: Sequence[Row]) -> str:
+    """
+    Render contacts as vCard 3.0 cards.
+    Parameters:
+    - rows (Sequence[Row]): Contacts to render.
+    Returns:
+    - str: vCard cards.
+    """
+    cards = []
+    for row in rows:
+        name, last_name = vcard_escape(row.name), vcard_escape(row.last_name)
+        lines = [
+            "BEGIN:VCARD",
+            "VERSION:3.0",
+            f"N:{last_name};{name};;;",
+            f"FN:{name} {last_name}",
+            f"EMAIL;TYPE=INTERNET:{vcard_escape(row.email)}",
+            f"TEL:{vcard_escape(row.phone)}",
+            f"BDAY:{row.birthday.isoformat()}",
+        ]
+        if row.additional_data:
+            lines.append(f"NOTE:{vcard_escape(row.additional_data)}")
+        lines.append("END:VCARD")
+        cards.append("".join(vcard_fold(line) for line in lines))
+    return "".join(cards)
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "csv": ExportFormat("text/csv", "csv", ",".join(FIELDS) + "\r\n", render_csv),
+    "ndjson": ExportFormat("application/x-ndjson", "ndjson", "", render_ndjson),
+    "vcard": ExportFormat("text/vcard", "vcf", "", render_vcard),
+}
+
+
+async def encode_export(
+    batches: AsyncIterator[Sequence[Row]], format: str, compress: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Render batches of contacts into chunks of the export file.
+    One chunk is produced per batch, optionally gzip-compressed on the fly.
+    Parameters:
+    - batches (AsyncIterator[Sequence[Row]]): Batches of contacts.
+    - format (str): Key of EXPORT_FORMATS.
+    - compress (bool): Whether to gzip the output.
+    Returns:
+    - AsyncIterator[bytes]: Chunks of the file.
+    """
+    export_format = EXPORT_FORMATS[format]
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode()
+        return compressor.compress(data) if compressor else data
+
+    chunk = encode(export_format.header)
+    if chunk:
+        yield chunk
+    async for rows in batches:
+        chunk = encode(export_format.render(rows))
+        if chunk:
+            yield chunk
+    if compressor:
+        yield compressor.flush()
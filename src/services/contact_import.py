@@ -0,0 +1,265 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from src.config.config import config
+from src.schemas.schemas import ContactImport
+
+ImportRecord = Tuple[int, Optional[Dict[str, str]], Optional[str]]
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/x-jsonlines": "ndjson",
+}
+
+
+class ImportFormatError(Exception):
+    """
+    Raised when an import file cannot be parsed at all.
+    """
+
+
+def import_format(content_type: Optional[str]) -> Optional[str]:
+    """
+    Get the import format of a request body from its content type.
+    Parameters:
+    - content_type (Optional[str]): Value of the Content-Type header.
+    Returns:
+    - str: "csv" or "ndjson", None if the content type is not supported.
+    """
+    if not content_type:
+        return None
+    return CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[str]]:
+    """
+    Decode a stream of UTF-8 chunks into lines.
+    Only the current chunk and an incomplete last line are kept in memory;
+    a line longer than IMPORT_MAX_RECORD_SIZE characters is skipped up to
+    its end and None is yielded in its place.
+    Parameters:
+    - chunks (AsyncIterator[bytes]): Body of the upload.
+    Returns:
+    - AsyncIterator[Optional[str]]: Lines including their line ending.
+    Raises:
+    - ImportFormatError: If the body is not valid UTF-8.
+    """
+    limit = config.IMPORT_MAX_RECORD_SIZE
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    skipping = False
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                if skipping:
+                    skipping = False
+                elif len(line) > limit:
+                    yield None
+                else:
+                    yield line + "\n"
+            if len(pending) > limit:
+                if not skipping:
+                    yield None
+                pending, skipping = "", True
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise ImportFormatError(f"File is not valid UTF-8: {e.reason}") from e
+    if skipping or len(pending) > limit:
+        yield None
+    elif pending:
+        yield pending
+
+
+class _RecordLines:
+    """
+    Iterator handing buffered lines to csv.reader, which pulls lines until
+    a record is complete. Running out of lines means the record continues
+    on a line that has not been read yet.
+    """
+
+    def __init__(self, lines: List[str]):
+        self._lines = iter(lines)
+        self.record: List[str] = []
+        self.exhausted = False
+
+    def __iter__(self) -> "_RecordLines":
+        return self
+
+    def __next__(self) -> str:
+        line = next(self._lines, None)
+        if line is None:
+            self.exhausted = True
+            raise StopIteration
+        self.record.append(line)
+        return line
+
+
+class _CsvParser:
+    """
+    Incremental CSV parser turning lines into import records.
+    csv.reader decides where a record ends, so quotes inside unquoted
+    values are kept as they are. Lines of a record that continues past the
+    lines read so far are buffered and parsed again once their size has
+    doubled, which keeps long quoted values linear; a record longer than
+    IMPORT_MAX_RECORD_SIZE characters is reported as an error.
+    """
+
+    def __init__(self):
+        self.limit = config.IMPORT_MAX_RECORD_SIZE
+        self.header: Optional[List[str]] = None
+        self.row = 0
+        self.pending: List[str] = []
+        self.size = 0
+        self.parsed = 0
+
+    def feed(self, line: Optional[str]) -> List[ImportRecord]:
+        """
+        Add a line of the upload.
+        Parameters:
+        - line (Optional[str]): Line from iter_lines, None for a line that is
+          too long.
+        Returns:
+        - List[ImportRecord]: Records completed by the line.
+        Raises:
+        - ImportFormatError: If the header is invalid.
+        """
+        if line is None:
+            records = self._parse()
+            self.pending, self.size, self.parsed = [], 0, 0
+            return records + self._record(None, self._too_long())
+        self.pending.append(line)
+        self.size += len(line)
+        if self.size < 2 * self.parsed and self.size <= self.limit:
+            return []
+        records = self._parse()
+        if self.size > self.limit:
+            self.pending, self.size, self.parsed = [], 0, 0
+            records += self._record(None, self._too_long())
+        return records
+
+    def close(self) -> List[ImportRecord]:
+        """
+        Finish the upload.
+        Returns:
+        - List[ImportRecord]: The remaining records.
+        Raises:
+        - ImportFormatError: If the header is missing or invalid.
+        """
+        records = self._parse()
+        if self.pending:
+            records += self._record(None, "Invalid CSV: unterminated quoted value")
+        if self.header is None:
+            raise ImportFormatError("File is empty")
+        return records
+
+    def _too_long(self) -> str:
+        return f"Record is longer than {self.limit} characters"
+
+    def _parse(self) -> List[ImportRecord]:
+        source = _RecordLines(self.pending)
+        reader = csv.reader(source)
+        records = []
+        while True:
+            source.record = []
+            try:
+                values = next(reader, None)
+            except csv.Error as e:
+                records += self._record(None, f"Invalid CSV: {e}")
+                continue
+            if source.exhausted:
+                break
+            if "".join(source.record).strip():
+                records += self._record(values, None)
+        self.pending = source.record
+        self.size = self.parsed = sum(len(line) for line in self.pending)
+        return records
+
+    def _record(
+        self, values: Optional[List[str]], error: Optional[str]
+    ) -> List[ImportRecord]:
+        if self.header is None:
+            if error is not None:
+                raise ImportFormatError(f"Invalid CSV header: {error}")
+            self.header = [name.strip().lower() for name in values]
+            missing = [
+                name
+                for name, field in ContactImport.model_fields.items()
+                if field.is_required() and name not in self.header
+            ]
+            if missing:
+                raise ImportFormatError(f"Missing columns: {', '.join(missing)}")
+            return []
+        self.row += 1
+        if error is not None:
+            return [(self.row, None, error)]
+        if len(values) != len(self.header):
+            error = f"Expected {len(self.header)} values, got {len(values)}"
+            return [(self.row, None, error)]
+        data = {name: value for name, value in zip(self.header, values) if value}
+        return [(self.row, data, None)]
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[ImportRecord]:
+    """
+    Parse a CSV upload record by record.
+    The first record is the header, column names are matched case-insensitively
+    and unknown columns are ignored. Empty values are treated as missing.
+    Quoted values may span several lines.
+    Parameters:
+    - chunks (AsyncIterator[bytes]): Body of the upload.
+    Returns:
+    - AsyncIterator[ImportRecord]: (row, data, error) of every record, where row
+      starts at 1 for the first record after the header and either data or
+      error is set.
+    Raises:
+    - ImportFormatError: If the header is missing or lacks a required column.
+    """
+    parser = _CsvParser()
+    async for line in iter_lines(chunks):
+        for record in parser.feed(line):
+            yield record
+    for record in parser.close():
+        yield record
+
+
+async def iter_ndjson_records(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[ImportRecord]:
+    """
+    Parse a newline-delimited JSON upload record by record.
+    Every non-empty line must hold one JSON object.
+    Parameters:
+    - chunks (AsyncIterator[bytes]): Body of the upload.
+    Returns:
+    - AsyncIterator[ImportRecord]: (row, data, error) of every record, where row
+      starts at 1 and either data or error is set.
+    """
+    row = 0
+    async for line in iter_lines(chunks):
+        if line is not None and not line.strip():
+            continue
+        row += 1
+        if line is None:
+            limit = config.IMPORT_MAX_RECORD_SIZE
+            yield row, None, f"Record is longer than {limit} characters"
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(data, dict):
+            yield row, None, "Expected a JSON object"
+            continue
+        yield row, data, None
+
+
+IMPORT_PARSERS = {"csv": iter_csv_records, "ndjson": iter_ndjson_records}
@@ -1,9 +1,43 @@
+import logging
+import uuid
+from datetime import date
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config.config import config
+
 from src.repository.contacts import ContactRepository
 from src.schemas.auth import User
+from src.schemas.schemas import (
+    ContactBulkResult,
+    ContactBulkUpdate,
+    ContactImport,
+    ContactImportError,
+    ContactImportResult,
+    ContactPage,
+    ContactResponse,
+    ContactSelection,
+)
+from src.services.cache import (
+    REDIS,
+    cache_counters,
+    get_cache,
+    seconds_until_midnight,
+)
+from src.services.contact_export import encode_export
+from src.services.contact_import import ImportRecord
+from src.services.pagination import decode_cursor, encode_cursor
+from src.services.tracing import traced, traced_span
+
+logger = logging.getLogger(__name__)
 
+# Generations outlive the birthdays digests, which expire at midnight.
+BIRTHDAYS_GENERATION_TTL = 2 * 24 * 3600
 
+
+@traced("service")
 class ContactService:
     """
     Service class for managing contacts.
@@ -26,6 +60,30 @@ class ContactService:
         """
         return await self.contact_repository.get_contacts(limit, offset, user)
 
+    async def get_contacts_page(self, limit: int, cursor: str, user: User):
+        """
+        Get a page of contacts using keyset pagination.
+        Parameters:
+        - limit (int): Number of contacts to return.
+        - cursor (str): Cursor of the page, an empty string for the first page.
+        - user (User): Currently authenticated user.
+        Returns:
+        - ContactPage: Contacts of the page and the cursor of the next one.
+        Raises:
+        - ValueError: If the cursor is malformed.
+        """
+        after_id = decode_cursor(cursor, 1)[0] if cursor else None
+        contacts = await self.contact_repository.get_contacts_after(
+            limit + 1, after_id, user
+        )
+        next_cursor = None
+        if len(contacts) > limit:
+            contacts = contacts[:limit]
+            next_cursor = encode_cursor(contacts[-1].id)
+        return ContactPage.model_validate(
+            {"items": contacts, "next_cursor": next_cursor}, from_attributes=True
+        )
+
     async def get_contact_by_id(self, id: int, user: User):
         """
         Get a contact by its ID.
@@ -37,16 +95,44 @@ class ContactService:
         """
         return await self.contact_repository.get_contact_by_id(id, user)
 
-    async def search_contacts(self, field: str, user: User):
+    async def search_contacts(self, filters, user: User, limit: int = 100):
         """
         Search for contacts based on the provided filters.
         Parameters:
-        - field (str): Field to search for.
+        - filters (Dict[str, str]): Filters to search for.
         - user (User): Currently authenticated user.
+        - limit (int): Number of contacts to return.
         Returns:
         - List[Contact]: List of contacts matching the filters.
         """
-        return await self.contact_repository.search_contacts(field, user)
+        return await self.contact_repository.search_contacts(filters, user, limit)
+
+    async def search_contacts_page(self, filters, user: User, limit: int, cursor: str):
+        """
+        Search for contacts and return one page of ranked results.
+        Parameters:
+        - filters (Dict[str, str]): Filters to search for.
+        - user (User): Currently authenticated user.
+        - limit (int): Number of contacts to return.
+        - cursor (str): Cursor of the page, an empty string for the first page.
+        Returns:
+        - ContactPage: Contacts of the page and the cursor of the next one.
+        Raises:
+        - ValueError: If the cursor is malformed.
+        """
+        after = decode_cursor(cursor, 2) if cursor else None
+        rows = await self.contact_repository.search_contacts_ranked(
+            filters, user, limit + 1, after
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_contact, last_rank = rows[-1]
+            next_cursor = encode_cursor(last_rank, last_contact.id)
+        return ContactPage.model_validate(
+            {"items": [contact for contact, _ in rows], "next_cursor": next_cursor},
+            from_attributes=True,
+        )
 
     async def create_contact(self, contact, user: User):
         """
@@ -57,7 +143,112 @@ class ContactService:
         Returns:
         - Contact: The created contact object.
         """
-        return await self.contact_repository.create_contact(contact, user)
+        new_contact = await self.contact_repository.create_contact(contact, user)
+        await self._invalidate_birthdays(user)
+        return new_contact
+
+    async def import_contacts(
+        self, records: AsyncIterator[ImportRecord], user: User
+    ) -> ContactImportResult:
+        """
+        Import contacts from parsed records of an upload.
+        Records are validated one by one and inserted in batches of
+        IMPORT_BATCH_SIZE as they arrive, so the upload is never held in
+        memory. All batches share one transaction, committed at the end.
+        Rows that fail validation or whose email already exists are reported
+        in the result instead of aborting the import.
+        Parameters:
+        - records (AsyncIterator[ImportRecord]): (row, data, error) records.
+        - user (User): Currently authenticated user.
+        Returns:
+        - ContactImportResult: Number of read, imported and failed rows and
+          the errors of the first IMPORT_MAX_ERRORS failed rows.
+        Raises:
+        - ImportFormatError: If the upload cannot be parsed at all.
+        """
+        result = ContactImportResult()
+        batch: Dict[str, Tuple[int, dict]] = {}
+        async for row, data, error in records:
+            result.rows += 1
+            if error is None:
+                try:
+                    contact = ContactImport.model_validate(data)
+                except ValidationError as e:
+                    error = "; ".join(
+                        f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}"
+                        for err in e.errors(include_url=False)
+                    )
+                else:
+                    if contact.email in batch:
+                        error = "Duplicate email in file"
+                    else:
+                        batch[contact.email] = (row, contact.model_dump())
+            if error is not None:
+                self._import_error(result, row, error)
+            if len(batch) >= config.IMPORT_BATCH_SIZE:
+                await self._import_batch(batch, user, result)
+                batch = {}
+        if batch:
+            await self._import_batch(batch, user, result)
+        await self.contact_repository.commit()
+        if result.imported:
+            await self._invalidate_birthdays(user)
+        return result
+
+    async def _import_batch(
+        self,
+        batch: Dict[str, Tuple[int, dict]],
+        user: User,
+        result: ContactImportResult,
+    ) -> None:
+        """
+        Insert a batch of validated rows and record the skipped ones.
+        Parameters:
+        - batch (Dict[str, Tuple[int, dict]]): (row, data) by email.
+        - user (User): Currently authenticated user.
+        - result (ContactImportResult): Result to update.
+        """
+        inserted = await self.contact_repository.insert_contacts(
+            [data for _, data in batch.values()], user
+        )
+        result.imported += len(inserted)
+        for email, (row, _) in batch.items():
+            if email not in inserted:
+                self._import_error(
+                    result, row, "Contact with this email already exists"
+                )
+
+    @staticmethod
+    def _import_error(result: ContactImportResult, row: int, error: str) -> None:
+        """
+        Record a rejected row, keeping at most IMPORT_MAX_ERRORS errors.
+        Parameters:
+        - result (ContactImportResult): Result to update.
+        - row (int): Number of the row.
+        - error (str): Why the row was rejected.
+        """
+        result.failed += 1
+        if len(result.errors) < config.IMPORT_MAX_ERRORS:
+            result.errors.append(ContactImportError(row=row, error=error))
+
+    def export_contacts(
+        self, user: User, format: str, compress: bool = False
+    ) -> AsyncIterator[bytes]:
+        """
+        Export all contacts of the user as a stream of file chunks.
+        Contacts are read with a server-side cursor in batches of
+        EXPORT_BATCH_SIZE, so memory use does not grow with their number.
+        Parameters:
+        - user (User): Currently authenticated user.
+        - format (str): "csv", "ndjson" or "vcard".
+        - compress (bool): Whether to gzip the output.
+        Returns:
+        - AsyncIterator[bytes]: Chunks of the export file.
+        """
+        batches = self.contact_repository.stream_contacts(
+            user, config.EXPORT_BATCH_SIZE
+        )
+        return encode_export(batches, format, compress)
 
     async def update_contact(self, id: int, body, user: User):
         """
@@ -69,7 +260,10 @@ class ContactService:
         Returns:
         - Contact: The updated contact object.
         """
-        return await self.contact_repository.update_contact(id, body, user)
+        contact = await self.contact_repository.update_contact(id, body, user)
+        if contact is not None:
+            await self._invalidate_birthdays(user)
+        return contact
 
     async def delete_contact(self, id: int, user: User):
         """
@@ -80,19 +274,182 @@ class ContactService:
         Returns:
         - bool: True if the contact was deleted, False otherwise.
         """
-        return await self.contact_repository.delete_contact(id, user)
+        contact = await self.contact_repository.delete_contact(id, user)
+        if contact is not None:
+            await self._invalidate_birthdays(user)
+        return contact
+
+    async def bulk_update_contacts(
+        self, body: ContactBulkUpdate, user: User
+    ) -> ContactBulkResult:
+        """
+        Update the selected contacts with one statement.
+        Parameters:
+        - body (ContactBulkUpdate): Selected contacts and fields to set.
+        - user (User): Currently authenticated user.
+        Returns:
+        - ContactBulkResult: Number and IDs of the updated contacts.
+        """
+        ids = await self.contact_repository.update_contacts(
+            user,
+            body.ids,
+            body.filter_values(),
+            body.changes.model_dump(exclude_unset=True),
+        )
+        if ids:
+            await self._invalidate_birthdays(user)
+        return ContactBulkResult(count=len(ids), ids=ids)
+
+    async def bulk_delete_contacts(
+        self, selection: ContactSelection, user: User
+    ) -> ContactBulkResult:
+        """
+        Delete the selected contacts with one statement.
+        Parameters:
+        - selection (ContactSelection): Selected contacts.
+        - user (User): Currently authenticated user.
+        Returns:
+        - ContactBulkResult: Number and IDs of the deleted contacts.
+        """
+        ids = await self.contact_repository.delete_contacts(
+            user, selection.ids, selection.filter_values()
+        )
+        if ids:
+            await self._invalidate_birthdays(user)
+        return ContactBulkResult(count=len(ids), ids=ids)
 
     async def get_upcoming_birthdays(
         self,
         user: User,
         limit: int,
+        days: int = 7,
     ):
         """
-        Get contacts with upcoming birthdays within the next 7 days.
+        Get contacts with upcoming birthdays within the next days.
+
+        Results are cached per user until midnight, keyed by
+        (date, days, limit), and dropped whenever the user creates, updates
+        or deletes a contact. Cache errors fall back to the database.
+
+        The digest records the generation of the user's contacts it was built
+        from and is only served while that generation is current, so a digest
+        stored after a concurrent write has invalidated it is never used.
+
         Parameters:
         - user (User): Currently authenticated user.
         - limit (int): Number of contacts to return.
+        - days (int): Number of days to look ahead.
+        Returns:
+        - List[ContactResponse]: List of contacts with upcoming birthdays.
+        """
+        today = date.today()
+        key = self._birthdays_key(user)
+        entry = f"{today.isoformat()}:{days}:{limit}"
+        counter = cache_counters["birthdays"]
+
+        generation_key = self._birthdays_generation_key(user)
+        generation, digest = await self._cache_call(
+            "multi_get", [generation_key, key]
+        ) or (None, None)
+        entries = {}
+        if digest and digest.get("generation") == generation:
+            entries = digest["entries"]
+        if entry in entries:
+            counter.hit()
+            return [ContactResponse.model_validate(item) for item in entries[entry]]
+        counter.miss()
+
+        contacts = await self.contact_repository.get_upcoming_birthdays(
+            user, limit, days, today
+        )
+        result = [
+            ContactResponse.model_validate(contact, from_attributes=True)
+            for contact in contacts
+        ]
+        entries = {
+            cached_entry: value
+            for cached_entry, value in entries.items()
+            if cached_entry.startswith(today.isoformat())
+        }
+        entries[entry] = [item.model_dump(mode="json") for item in result]
+        if generation is None:
+            generation = await self._start_birthdays_generation(user)
+        if generation is not None:
+            digest = {"generation": generation, "entries": entries}
+            await self._cache_call("set", key, digest, ttl=seconds_until_midnight())
+        return result
+
+    @staticmethod
+    def _birthdays_key(user: User) -> str:
+        """
+        Build the cache key of the user's birthdays digest.
+        Parameters:
+        - user (User): Currently authenticated user.
+        Returns:
+        - str: Cache key.
+        """
+        return f"birthdays:{user.id}"
+
+    @staticmethod
+    def _birthdays_generation_key(user: User) -> str:
+        """
+        Build the cache key of the generation of the user's contacts.
+        Parameters:
+        - user (User): Currently authenticated user.
+        Returns:
+        - str: Cache key.
+        """
+        return f"birthdays_generation:{user.id}"
+
+    async def _invalidate_birthdays(self, user: User) -> None:
+        """
+        Invalidate the cached birthdays digest of the user by starting a new
+        generation. Generations are random, so one that was evicted from the
+        cache cannot make an old digest current again.
+        Parameters:
+        - user (User): Currently authenticated user.
+        """
+        await self._cache_call(
+            "set",
+            self._birthdays_generation_key(user),
+            uuid.uuid4().hex,
+            ttl=BIRTHDAYS_GENERATION_TTL,
+        )
+
+    async def _start_birthdays_generation(self, user: User) -> Optional[str]:
+        """
+        Start the first generation of the user's contacts if none is cached.
+        The generation is only added when the key is still missing, so it
+        never replaces one set by a concurrent invalidation.
+        Parameters:
+        - user (User): Currently authenticated user.
+        Returns:
+        - Optional[str]: The new generation, or None if another one was set
+          first or the cache is unavailable.
+        """
+        generation = uuid.uuid4().hex
+        added = await self._cache_call(
+            "add",
+            self._birthdays_generation_key(user),
+            generation,
+            ttl=BIRTHDAYS_GENERATION_TTL,
+        )
+        return generation if added else None
+
+    @staticmethod
+    async def _cache_call(method: str, *args, **kwargs):
+        """
+        Call a cache method, treating cache errors as a miss.
+        Parameters:
+        - method (str): Name of the cache method.
+        - args: Positional arguments of the method.
+        - kwargs: Keyword arguments of the method.
         Returns:
-        - List[Contact]: List of contacts with upcoming birthdays.
+        - The method result, or None if the cache is unavailable.
         """
-        return await self.contact_repository.get_upcoming_birthdays(user, limit)
+        try:
+            with traced_span(f"cache {method}", **REDIS):
+                return await getattr(get_cache(), method)(*args, **kwargs)
+        except Exception as e:
+            logger.warning("Birthdays cache %s failed: %s", method, e)
+            return None
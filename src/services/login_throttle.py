@@ -0,0 +1,175 @@
+import logging
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config.config import config
+from src.services.rate_limit import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Each key is a hash with the number of recent failures (f) and the time in
+# milliseconds until which the key is locked (u). Both scripts return the
+# longest remaining lockout of the passed keys in milliseconds.
+CHECK_SCRIPT = """
+local now = tonumber(ARGV[1])
+local wait = 0
+for _, key in ipairs(KEYS) do
+    local locked_until = tonumber(redis.call('HGET', key, 'u'))
+    if locked_until and locked_until - now > wait then
+        wait = locked_until - now
+    end
+end
+return wait
+"""
+
+# Every failure past the allowed number doubles the lockout, up to the cap.
+# Failures are forgotten once the key has seen none for a whole window.
+FAILURE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local base = tonumber(ARGV[3])
+local cap = tonumber(ARGV[4])
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local over = redis.call('HINCRBY', key, 'f', 1) - tonumber(ARGV[4 + i])
+    local ttl = window
+    if over >= 0 then
+        local lockout = math.min(base * 2 ^ over, cap)
+        redis.call('HSET', key, 'u', string.format('%.0f', now + lockout))
+        wait = math.max(wait, lockout)
+        ttl = math.max(window, lockout)
+    end
+    redis.call('PEXPIRE', key, string.format('%.0f', ttl))
+end
+return wait
+"""
+
+
+class LoginThrottle:
+    """
+    Counter of failed logins per username and per client address.
+
+    After too many failures the username or address is locked out for a
+    time that doubles with every further failure, so login attempts can
+    be rejected before the user lookup and the password hash check.
+    Redis errors fail open like the rate limiter does.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        prefix: str = "login",
+        clock: Callable[[], float] = time.time,
+        retry: float = 5,
+    ):
+        self.redis = redis
+        self.prefix = prefix
+        self.clock = clock
+        self.retry = retry
+        self.check_script = redis.register_script(CHECK_SCRIPT)
+        self.failure_script = redis.register_script(FAILURE_SCRIPT)
+        self.rejected = 0
+        self.failures = 0
+        self.errors = 0
+        self._down_until = float("-inf")
+
+    def _keys(self, username: str, address: str) -> List[str]:
+        return [
+            f"{self.prefix}:user:{username.lower()}",
+            f"{self.prefix}:ip:{address}",
+        ]
+
+    async def _run(self, script, keys: List[str], args: list) -> int:
+        now = time.monotonic()
+        if now < self._down_until:
+            return 0
+        try:
+            return await script(keys=keys, args=args)
+        except (RedisError, OSError) as e:
+            self.errors += 1
+            self._down_until = now + self.retry
+            logger.warning("Login throttle is unavailable, allowing logins: %s", e)
+            return 0
+
+    async def check(self, username: str, address: str) -> float:
+        """
+        Check whether a login attempt is locked out.
+        Parameters:
+        - username (str): Username of the attempt.
+        - address (str): Client address of the attempt.
+        Returns:
+        - float: Seconds until the attempt is allowed, 0 if it is allowed now.
+        """
+        wait = await self._run(
+            self.check_script,
+            self._keys(username, address),
+            [int(self.clock() * 1000)],
+        )
+        if wait:
+            self.rejected += 1
+        return wait / 1000
+
+    async def failure(self, username: str, address: str) -> float:
+        """
+        Record a failed login attempt.
+        Parameters:
+        - username (str): Username of the attempt.
+        - address (str): Client address of the attempt.
+        Returns:
+        - float: Seconds the username or address is now locked out for.
+        """
+        self.failures += 1
+        wait = await self._run(
+            self.failure_script,
+            self._keys(username, address),
+            [
+                int(self.clock() * 1000),
+                int(config.LOGIN_FAILURE_WINDOW * 1000),
+                int(config.LOGIN_LOCKOUT_BASE * 1000),
+                int(config.LOGIN_LOCKOUT_MAX * 1000),
+                config.LOGIN_USER_MAX_FAILURES,
+                config.LOGIN_IP_MAX_FAILURES,
+            ],
+        )
+        return wait / 1000
+
+    async def success(self, username: str) -> None:
+        """
+        Forget the failed attempts of a username after a successful login.
+        The address counter is kept, so one valid account does not reset
+        the limit of an address guessing the passwords of other users.
+        Parameters:
+        - username (str): Username that logged in.
+        """
+        if time.monotonic() < self._down_until:
+            return
+        try:
+            await self.redis.delete(self._keys(username, "")[0])
+        except (RedisError, OSError) as e:
+            logger.warning("Login throttle is unavailable: %s", e)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the throttle statistics.
+        Returns:
+        - dict: Number of rejected attempts, failed logins and Redis errors.
+        """
+        return {
+            "rejected": self.rejected,
+            "failures": self.failures,
+            "errors": self.errors,
+        }
+
+
+@lru_cache
+def get_login_throttle() -> LoginThrottle:
+    """
+    Get the application login throttle, sharing the rate limiter Redis client.
+    Returns:
+    - LoginThrottle: Shared login throttle.
+    """
+    return LoginThrottle(get_rate_limiter().redis, retry=config.RATE_LIMIT_RETRY)
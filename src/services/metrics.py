@@ -0,0 +1,324 @@
+import ipaddress
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from prometheus_client import (
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.config import config
+from src.database.db import QueryStats, query_stats, sessionmanager
+from src.services.cache import get_cache_stats
+from src.services.outbox import OutboxService
+from src.services.workers import get_worker_stats
+
+logger = logging.getLogger(__name__)
+
+# Requests that match no route share one label, so scanners probing random
+# paths cannot create a time series per path.
+UNMATCHED_ROUTE = "<unmatched>"
+# Likewise, methods outside the HTTP standard are all labelled OTHER.
+HTTP_METHODS = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "DELETE", "CONNECT", "OPTIONS", "TRACE", "PATCH")
+)
+OTHER_METHOD = "OTHER"
+
+registry = CollectorRegistry()
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time spent processing HTTP requests, its count is the number of requests.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    registry=registry,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Number of HTTP requests being processed.",
+    registry=registry,
+    multiprocess_mode="livesum",
+)
+OUTBOX_EMAILS = Gauge(
+    "email_outbox_emails",
+    "Number of emails in the outbox by status.",
+    ["status"],
+    registry=registry,
+    multiprocess_mode="mostrecent",
+)
+
+
+class ApplicationCollector(Collector):
+    """
+    Collector reading the statistics the application already keeps.
+    The values are read when /metrics is scraped, so requests pay nothing
+    for them. They describe the process that answers the scrape; with
+    several worker processes they are labelled with its process ID.
+    """
+
+    def __init__(self, process: Optional[str] = None):
+        self.process = process
+
+    def collect(self) -> Iterable:
+        yield from self._pool_metrics()
+        yield from self._cache_metrics()
+        yield from self._worker_metrics()
+
+    def _family(self, family: type, name: str, documentation: str, labels: List[str]):
+        if self.process is not None:
+            labels = [*labels, "process"]
+        return family(name, documentation, labels=labels)
+
+    def _add(self, family, labels: List[str], value: float) -> None:
+        if self.process is not None:
+            labels = [*labels, self.process]
+        family.add_metric(labels, value)
+
+    def _pool_metrics(self) -> Iterable:
+        # Replicas are labelled by position, their host names are not exposed.
+        pools = [("primary", sessionmanager.pool_stats())]
+        pools += [
+            (f"replica{index}", replica["pool"])
+            for index, replica in enumerate(sessionmanager.replica_stats())
+        ]
+        connections = self._family(
+            GaugeMetricFamily,
+            "db_pool_connections",
+            "Connections of the database pool by state.",
+            ["pool", "state"],
+        )
+        size = self._family(
+            GaugeMetricFamily,
+            "db_pool_size",
+            "Configured size of the database pool.",
+            ["pool"],
+        )
+        checkouts = self._family(
+            CounterMetricFamily, "db_pool_checkouts", "Connection checkouts.", ["pool"]
+        )
+        wait = self._family(
+            CounterMetricFamily,
+            "db_pool_wait_seconds",
+            "Time spent waiting for a connection.",
+            ["pool"],
+        )
+        timeouts = self._family(
+            CounterMetricFamily,
+            "db_pool_timeouts",
+            "Connection checkouts that timed out.",
+            ["pool"],
+        )
+        for name, stats in pools:
+            if not stats:
+                continue
+            for state in ("checked_in", "checked_out", "overflow"):
+                self._add(connections, [name, state], stats[state])
+            self._add(size, [name], stats["size"])
+            self._add(checkouts, [name], stats["checkouts"])
+            self._add(wait, [name], stats["wait_time_total"])
+            self._add(timeouts, [name], stats["timeouts"])
+        yield from (connections, size, checkouts, wait, timeouts)
+
+    def _cache_metrics(self) -> Iterable:
+        hits = self._family(CounterMetricFamily, "cache_hits", "Cache hits.", ["cache"])
+        misses = self._family(
+            CounterMetricFamily, "cache_misses", "Cache misses.", ["cache"]
+        )
+        ratio = self._family(
+            GaugeMetricFamily,
+            "cache_hit_ratio",
+            "Share of cache lookups that hit.",
+            ["cache"],
+        )
+        for name, stats in get_cache_stats().items():
+            self._add(hits, [name], stats["hits"])
+            self._add(misses, [name], stats["misses"])
+            self._add(ratio, [name], stats["hit_ratio"])
+        yield from (hits, misses, ratio)
+
+    def _worker_metrics(self) -> Iterable:
+        pending = self._family(
+            GaugeMetricFamily,
+            "worker_pool_pending",
+            "Calls queued in a worker pool.",
+            ["pool"],
+        )
+        running = self._family(
+            GaugeMetricFamily,
+            "worker_pool_running",
+            "Calls running in a worker pool.",
+            ["pool"],
+        )
+        completed = self._family(
+            CounterMetricFamily,
+            "worker_pool_completed",
+            "Calls finished by a worker pool.",
+            ["pool"],
+        )
+        for name, stats in get_worker_stats().items():
+            self._add(pending, [name], stats["pending"])
+            self._add(running, [name], stats["running"])
+            self._add(completed, [name], stats["completed"])
+        yield from (pending, running, completed)
+
+
+registry.register(ApplicationCollector())
+
+
+def generate_metrics() -> bytes:
+    """
+    Render the metrics in the Prometheus text format.
+    With PROMETHEUS_MULTIPROC_DIR set, the request and outbox metrics of all
+    worker processes are read from the files prometheus_client keeps there,
+    so every scrape sees the same totals whichever worker answers it.
+    Returns:
+    - bytes: The metrics.
+    """
+    if not config.PROMETHEUS_MULTIPROC_DIR:
+        return generate_latest(registry)
+    scrape = CollectorRegistry()
+    multiprocess.MultiProcessCollector(scrape)
+    scrape.register(ApplicationCollector(process=str(os.getpid())))
+    return generate_latest(scrape)
+
+
+def mark_process_dead() -> None:
+    """
+    Remove the in-progress gauge of this process from the multiprocess
+    directory when it shuts down, a no-op with a single process.
+    """
+    if config.PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def is_allowed_client(host: Optional[str]) -> bool:
+    """
+    Check whether a client may read the metrics.
+    Parameters:
+    - host (Optional[str]): Address of the client.
+    Returns:
+    - bool: True if the address is in one of METRICS_ALLOWED_NETWORKS.
+    """
+    try:
+        address = ipaddress.ip_address(host or "")
+    except ValueError:
+        return False
+    return any(address in network for network in config.METRICS_ALLOWED_NETWORKS)
+
+
+async def update_outbox_metrics(db: AsyncSession) -> None:
+    """
+    Refresh the outbox gauge, which needs a database query.
+    A failing query keeps the last values, so /metrics still answers.
+    Parameters:
+    - db (AsyncSession): Database session.
+    """
+    try:
+        counts = await OutboxService(db).stats()
+    except (SQLAlchemyError, OSError) as e:
+        logger.warning("Could not read the outbox statistics: %s", e)
+        return
+    for status, count in counts.items():
+        OUTBOX_EMAILS.labels(status).set(count)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the duration of every HTTP request by method,
+    route template and status code, and the number of requests in progress.
+    Histogram children are cached per label set, so a request costs two
+    clock reads and one observation.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._children: Dict[Tuple[str, str, int], Histogram] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            REQUESTS_IN_PROGRESS.dec()
+            route = scope.get("route")
+            method = scope["method"]
+            key = (
+                method if method in HTTP_METHODS else OTHER_METHOD,
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+            )
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = REQUEST_DURATION.labels(*key)
+            child.observe(duration)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware counting the SQL statements of every HTTP request.
+    The count and the database time are sent in the Server-Timing header
+    and requests running more than DB_QUERY_COUNT_WARNING statements are
+    logged with their route, which points at N+1 query patterns.
+    Statements of a streamed body run after the headers are sent and are
+    only included in the log.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats(scope)
+        token = query_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing:
+                total = (time.perf_counter() - start) * 1000
+                timing = (
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", '
+                    f"app;dur={total:.1f}"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timing.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_stats.reset(token)
+            if 0 < config.DB_QUERY_COUNT_WARNING < stats.count:
+                logger.warning(
+                    "%s ran %d queries in %.1f ms",
+                    stats.describe(),
+                    stats.count,
+                    stats.duration * 1000,
+                )
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.config import config
+from src.database.models import OutboxStatus
+from src.repository.outbox import OutboxRepository
+from src.services.email import MESSAGE_BUILDERS
+from src.services.smtp import SMTPPool
+from src.services.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """
+    Get the delay before the next delivery attempt.
+    The delay doubles with every attempt, starting at OUTBOX_BACKOFF_BASE
+    seconds and capped at OUTBOX_BACKOFF_MAX seconds.
+    Parameters:
+    - attempts (int): Number of attempts made so far.
+    Returns:
+    - timedelta: Delay before the next attempt.
+    """
+    delay = config.OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, config.OUTBOX_BACKOFF_MAX))
+
+
+@traced("service")
+class OutboxService:
+    def __init__(self, db: AsyncSession):
+        self.repository = OutboxRepository(db)
+
+    async def enqueue_verification_email(self, email: str, username: str, host: str):
+        """
+        Queue a verification email for the user.
+        Parameters:
+        - email (str): The email address of the user.
+        - username (str): The username of the user.
+        - host (str): The host URL for the email verification link.
+        """
+        await self.repository.enqueue(
+            "verify",
+            email,
+            {"username": username, "host": str(host)},
+            datetime.now(UTC),
+        )
+
+    async def enqueue_reset_password_email(
+        self, to_email: str, username: str, host: str, password_hash: str
+    ):
+        """
+        Queue a password reset email for the user.
+        Only the hash of the new password is stored, the reset token is
+        created when the email is built.
+        Parameters:
+        - to_email (str): The email address of the user.
+        - username (str): The username of the user.
+        - host (str): The host URL for the password reset link.
+        - password_hash (str): Hash of the new password.
+        """
+        await self.repository.enqueue(
+            "reset_password",
+            to_email,
+            {"username": username, "host": str(host), "password_hash": password_hash},
+            datetime.now(UTC),
+        )
+
+    async def process_batch(self, smtp_pool: SMTPPool) -> Dict[str, int]:
+        """
+        Claim a batch of due emails, send them and record the results.
+        The emails of a batch are sent concurrently over the SMTP pool.
+        Failed emails are retried with exponential backoff until
+        OUTBOX_MAX_ATTEMPTS is reached.
+        Parameters:
+        - smtp_pool (SMTPPool): Pool the emails are sent through.
+        Returns:
+        - dict: Number of claimed, sent and failed emails.
+        """
+        now = datetime.now(UTC)
+        rows = await self.repository.claim(
+            config.OUTBOX_BATCH_SIZE, now, config.OUTBOX_LEASE
+        )
+
+        async def send(row):
+            message = MESSAGE_BUILDERS[row.kind](row.recipient, **row.payload)
+            await smtp_pool.send(message)
+
+        results = await asyncio.gather(
+            *(send(row) for row in rows), return_exceptions=True
+        )
+        sent, failed = [], []
+        for row, result in zip(rows, results):
+            if not isinstance(result, Exception):
+                sent.append(row)
+                continue
+            give_up = row.attempts >= config.OUTBOX_MAX_ATTEMPTS
+            next_attempt_at = None if give_up else now + retry_delay(row.attempts)
+            logger.warning(
+                "Email %s (%s) to %s failed, attempt %s%s: %r",
+                row.id,
+                row.kind,
+                row.recipient,
+                row.attempts,
+                ", giving up" if give_up else "",
+                result,
+            )
+            failed.append((row, repr(result), next_attempt_at))
+        await self.repository.complete(sent, failed, datetime.now(UTC))
+        return {"claimed": len(rows), "sent": len(sent), "failed": len(failed)}
+
+    async def purge(self, batch_size: int = 1000) -> int:
+        """
+        Delete sent and failed emails older than OUTBOX_RETENTION_DAYS.
+        Rows are deleted in batches, so a large backlog does not hold long locks.
+        Parameters:
+        - batch_size (int): Maximum number of rows deleted per statement.
+        Returns:
+        - int: Number of deleted emails.
+        """
+        before = datetime.now(UTC) - timedelta(days=config.OUTBOX_RETENTION_DAYS)
+        total = 0
+        while True:
+            deleted = await self.repository.delete_finished(before, batch_size)
+            total += deleted
+            if deleted < batch_size:
+                return total
+
+    async def stats(self) -> Dict[str, int]:
+        """
+        Get the outbox statistics.
+        Returns:
+        - dict: Number of pending, sent and failed emails.
+        """
+        counts = await self.repository.count_by_status()
+        return {status.value: counts.get(status.value, 0) for status in OutboxStatus}
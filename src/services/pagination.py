@@ -0,0 +1,38 @@
+import base64
+import json
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last seen row into an opaque cursor token.
+    Parameters:
+    - values: Values of the sort key, the row ID is always the last one.
+    Returns:
+    - str: URL-safe cursor token.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor token produced by encode_cursor.
+    Parameters:
+    - cursor (str): Cursor token.
+    - size (int): Expected number of values in the sort key.
+    Returns:
+    - List: Values of the sort key.
+    Raises:
+    - ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values[-1], int):
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,301 @@
+import logging
+import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional
+
+from fastapi import Request
+from jose import JWTError, jwt
+from limits import RateLimitItem, parse
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.config import config
+
+logger = logging.getLogger(__name__)
+
+# Generic cell rate algorithm. The key holds the theoretical arrival time
+# (TAT) in microseconds; a request is allowed while the new TAT stays within
+# one period of now, which allows bursts of up to `limit` requests and then
+# one request per `interval`. Reading and updating the TAT in one script
+# keeps the check atomic across all workers.
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local period = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+if new_tat - now > period then
+    return {0, 0, new_tat - period - now, tat - now}
+end
+redis.call('SET', KEYS[1], string.format('%.0f', new_tat), 'PX',
+    math.ceil((new_tat - now) / 1000))
+return {1, math.floor((period - (new_tat - now)) / interval), 0, new_tat - now}
+"""
+
+LIMIT_EXCEEDED = {"error": "Request limit exceeded. Please try again later."}
+
+
+@dataclass
+class RateLimitResult:
+    """
+    Outcome of a rate limit check.
+    Attributes:
+        allowed (bool): Whether the request is allowed.
+        limit (int): Number of requests allowed per period.
+        remaining (int): Number of requests left right now.
+        retry_after (float): Seconds until the next request is allowed.
+        reset_after (float): Seconds until the full limit is available again.
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+    def headers(self) -> Dict[str, str]:
+        """
+        Get the rate limit headers of the response.
+        Returns:
+        - dict: X-RateLimit-* headers, plus Retry-After when limited.
+        """
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised by the RateLimit dependency when a request is over its limit.
+    """
+
+    def __init__(self, result: RateLimitResult):
+        super().__init__("Rate limit exceeded")
+        self.result = result
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate: str) -> RateLimitItem:
+    """
+    Parse a rate such as "10/minute".
+    Parameters:
+    - rate (str): Rate in the limits notation.
+    Returns:
+    - RateLimitItem: Parsed rate.
+    """
+    return parse(rate)
+
+
+class RateLimiter:
+    """
+    Rate limiter shared by all workers through Redis.
+
+    Redis errors fail open: the request is allowed and Redis is not asked
+    again for RATE_LIMIT_RETRY seconds, so an outage does not add a
+    timeout to every request.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        prefix: str = "ratelimit",
+        clock: Callable[[], float] = time.time,
+        retry: float = 5,
+    ):
+        self.redis = redis
+        self.prefix = prefix
+        self.clock = clock
+        self.retry = retry
+        self.script = redis.register_script(GCRA_SCRIPT)
+        self.allowed = 0
+        self.limited = 0
+        self.errors = 0
+        self._down_until = float("-inf")
+
+    async def hit(
+        self, key: str, rate: str, scope: str = "default"
+    ) -> Optional[RateLimitResult]:
+        """
+        Count a request against the limit of the key.
+        Parameters:
+        - key (str): Client the limit applies to, e.g. "user:1" or "ip:127.0.0.1".
+        - rate (str): Allowed rate, e.g. "10/minute".
+        - scope (str): Name of the limit, keys are counted separately per scope.
+        Returns:
+        - RateLimitResult: Outcome of the check, None if Redis is unavailable.
+        """
+        now = time.monotonic()
+        if now < self._down_until:
+            return None
+        item = parse_rate(rate)
+        period = item.get_expiry() * 1_000_000
+        try:
+            allowed, remaining, retry_after, reset_after = await self.script(
+                keys=[f"{self.prefix}:{scope}:{key}"],
+                args=[int(self.clock() * 1_000_000), period // item.amount, period],
+            )
+        except (RedisError, OSError) as e:
+            self.errors += 1
+            self._down_until = now + self.retry
+            logger.warning("Rate limiter is unavailable, allowing requests: %s", e)
+            return None
+        result = RateLimitResult(
+            allowed=bool(allowed),
+            limit=item.amount,
+            remaining=remaining,
+            retry_after=retry_after / 1_000_000,
+            reset_after=reset_after / 1_000_000,
+        )
+        if result.allowed:
+            self.allowed += 1
+        else:
+            self.limited += 1
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the limiter statistics.
+        Returns:
+        - dict: Number of allowed and limited requests and Redis errors.
+        """
+        return {"allowed": self.allowed, "limited": self.limited, "errors": self.errors}
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the application rate limiter, backed by the configured Redis.
+    Returns:
+    - RateLimiter: Shared rate limiter.
+    """
+    redis = Redis(
+        host=config.REDIS_HOST,
+        port=config.REDIS_PORT,
+        socket_timeout=config.RATE_LIMIT_TIMEOUT,
+        socket_connect_timeout=config.RATE_LIMIT_TIMEOUT,
+    )
+    return RateLimiter(redis, retry=config.RATE_LIMIT_RETRY)
+
+
+def rate_limit_key(conn: HTTPConnection) -> str:
+    """
+    Get the client a request is counted for.
+    Requests with a valid access token are counted per user, so users behind
+    one address do not share a limit; other requests are counted per address.
+    Parameters:
+    - conn (HTTPConnection): The request.
+    Returns:
+    - str: "user:<id>" or "ip:<address>".
+    """
+    scheme, _, token = conn.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(
+                token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
+            )
+        except JWTError:
+            payload = {}
+        user = payload.get("uid") or payload.get("sub")
+        if user is not None:
+            return f"user:{user}"
+    return f"ip:{conn.client.host if conn.client else 'unknown'}"
+
+
+def rate_limited_response(result: RateLimitResult) -> JSONResponse:
+    """
+    Build the 429 response of a limited request.
+    Parameters:
+    - result (RateLimitResult): Outcome of the check.
+    Returns:
+    - JSONResponse: Response with the rate limit headers.
+    """
+    return JSONResponse(
+        status_code=429, content=LIMIT_EXCEEDED, headers=result.headers()
+    )
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying one rate limit to every HTTP request.
+    Responses carry the X-RateLimit-* headers of the check.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate: str,
+        exempt: Iterable[str] = (),
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.app = app
+        self.rate = rate
+        self.exempt = tuple(exempt)
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (
+            self.exempt and scope["path"].startswith(self.exempt)
+        ):
+            await self.app(scope, receive, send)
+            return
+        conn = HTTPConnection(scope)
+        key = rate_limit_key(conn)
+        conn.state.rate_limit_key = key
+        limiter = self.limiter or get_rate_limiter()
+        result = await limiter.hit(key, self.rate)
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+        if not result.allowed:
+            await rate_limited_response(result)(scope, receive, send)
+            return
+        headers = [
+            (name.lower().encode(), value.encode())
+            for name, value in result.headers().items()
+        ]
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class RateLimit:
+    """
+    Dependency applying a stricter limit to a single route.
+    Usage: ``dependencies=[Depends(RateLimit("10/minute", "users_me"))]``.
+    """
+
+    def __init__(self, rate: str, scope: str):
+        self.rate = rate
+        self.scope = scope
+
+    async def __call__(self, request: Request) -> None:
+        """
+        Count the request against the route limit.
+        Parameters:
+        - request (Request): The request.
+        Raises:
+        - RateLimitExceeded: If the client is over the limit.
+        """
+        if not config.RATE_LIMIT_ENABLED:
+            return
+        key = getattr(request.state, "rate_limit_key", None) or rate_limit_key(request)
+        result = await get_rate_limiter().hit(key, self.rate, self.scope)
+        if result is not None and not result.allowed:
+            raise RateLimitExceeded(result)
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from email.message import Message
+from typing import Dict, List, Optional
+
+import aiosmtplib
+
+from src.services.tracing import traced_span
+
+logger = logging.getLogger(__name__)
+
+
+class PooledConnection:
+    """
+    An SMTP client kept open between messages.
+    """
+
+    def __init__(self, client: aiosmtplib.SMTP):
+        self.client = client
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    """
+    Small pool of long-lived SMTP connections.
+
+    Connections are opened on demand, at most ``size`` at a time, and are
+    returned to the pool after each message. A connection that was idle
+    longer than ``noop_interval`` is checked with NOOP before reuse, and one
+    idle longer than ``max_idle`` is closed, since servers drop idle clients.
+    A message that fails because the connection was lost is retried once on
+    a new connection.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        start_tls: Optional[bool] = False,
+        validate_certs: bool = True,
+        size: int = 2,
+        noop_interval: float = 30,
+        max_idle: float = 240,
+        timeout: float = 60,
+    ):
+        self.options = dict(
+            hostname=hostname,
+            port=port,
+            username=username or None,
+            password=password or None,
+            use_tls=use_tls,
+            start_tls=start_tls,
+            validate_certs=validate_certs,
+            timeout=timeout,
+        )
+        self.size = size
+        self.noop_interval = noop_interval
+        self.max_idle = max_idle
+        self._idle: List[PooledConnection] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.connects = 0
+        self.reuses = 0
+        self.reconnects = 0
+        self.sent = 0
+        self.failures = 0
+
+    async def send(self, message: Message) -> None:
+        """
+        Send a message over a pooled connection.
+        Parameters:
+        - message (Message): Message to send.
+        Raises:
+        - aiosmtplib.SMTPException: If the server rejects the message.
+        - OSError: If the server cannot be reached.
+        """
+        with traced_span("smtp send", **{"server.address": self.options["hostname"]}):
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.size)
+            async with self._semaphore:
+                conn = await self._acquire()
+                try:
+                    await conn.client.send_message(message)
+                except (aiosmtplib.SMTPServerDisconnected, ConnectionError):
+                    self.reconnects += 1
+                    await self._close(conn)
+                    conn = await self._connect()
+                    try:
+                        await conn.client.send_message(message)
+                    except Exception:
+                        self.failures += 1
+                        await self._close(conn)
+                        raise
+                except Exception:
+                    self.failures += 1
+                    await self._close(conn)
+                    raise
+                self.sent += 1
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+
+    async def _acquire(self) -> PooledConnection:
+        """
+        Take a healthy idle connection or open a new one.
+        Returns:
+        - PooledConnection: Connected client.
+        """
+        while self._idle:
+            conn = self._idle.pop()
+            idle_for = time.monotonic() - conn.last_used
+            if not conn.client.is_connected or idle_for > self.max_idle:
+                await self._close(conn)
+                continue
+            if idle_for > self.noop_interval:
+                try:
+                    await conn.client.noop()
+                except (aiosmtplib.SMTPException, OSError):
+                    self.reconnects += 1
+                    await self._close(conn)
+                    continue
+            self.reuses += 1
+            return conn
+        return await self._connect()
+
+    async def _connect(self) -> PooledConnection:
+        """
+        Open and authenticate a new connection.
+        Returns:
+        - PooledConnection: Connected client.
+        """
+        client = aiosmtplib.SMTP(**self.options)
+        await client.connect()
+        self.connects += 1
+        return PooledConnection(client)
+
+    @staticmethod
+    async def _close(conn: PooledConnection) -> None:
+        """
+        Close a connection, ignoring errors of connections that are already broken.
+        Parameters:
+        - conn (PooledConnection): Connection to close.
+        """
+        try:
+            if conn.client.is_connected:
+                await conn.client.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            conn.client.close()
+
+    async def close(self) -> None:
+        """
+        Close all idle connections.
+        """
+        while self._idle:
+            await self._close(self._idle.pop())
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the pool statistics.
+        Returns:
+        - dict: Idle connections, opened, reused and reconnected connections,
+          sent and failed messages.
+        """
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "reconnects": self.reconnects,
+            "sent": self.sent,
+            "failures": self.failures,
+        }
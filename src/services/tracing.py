@@ -0,0 +1,242 @@
+import contextlib
+import functools
+import inspect
+import random
+from contextvars import ContextVar
+from typing import Callable
+
+from opentelemetry import propagate, trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.config import config
+
+# Without a configured provider the API hands out no-op spans, so the
+# spans below cost next to nothing while tracing is disabled.
+tracer = trace.get_tracer("contacts-api")
+
+# Set for requests that were not sampled. Even an unsampled span costs
+# the SDK several microseconds, so no spans are started for them at all.
+_suppressed: ContextVar[bool] = ContextVar("tracing_suppressed", default=False)
+
+_provider = None
+
+
+def setup_tracing():
+    """
+    Install the tracer provider and trace SQL statements of all engines.
+    The SDK and the exporters are only imported here, when tracing is enabled.
+    Returns:
+    - TracerProvider: The installed provider, None if tracing is disabled.
+    """
+    global _provider, tracer
+    if _provider is not None or not config.TRACING_ENABLED:
+        return _provider
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import (
+        ALWAYS_ON,
+        ParentBased,
+        Sampler,
+        TraceIdRatioBased,
+    )
+
+    ratio = TraceIdRatioBased(config.TRACING_SAMPLE_RATIO)
+
+    class RootSampler(Sampler):
+        """
+        Sample server spans, which TracingMiddleware only starts for sampled
+        requests, and other root spans, e.g. of the email worker, by ratio.
+        """
+
+        def should_sample(
+            self, parent_context, trace_id, name, kind=None, *args, **kwargs
+        ):
+            sampler = ALWAYS_ON if kind == SpanKind.SERVER else ratio
+            return sampler.should_sample(
+                parent_context, trace_id, name, kind, *args, **kwargs
+            )
+
+        def get_description(self) -> str:
+            return f"RootSampler{{{ratio.get_description()}}}"
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": config.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(RootSampler()),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_exporter()))
+    trace.set_tracer_provider(provider)
+    tracer = provider.get_tracer("contacts-api")
+    event.listen(Engine, "before_cursor_execute", _start_query_span)
+    event.listen(Engine, "after_cursor_execute", _end_query_span)
+    event.listen(Engine, "handle_error", _fail_query_span)
+    _provider = provider
+    return provider
+
+
+def _exporter():
+    """
+    Build the exporter selected by TRACING_EXPORTER.
+    Returns:
+    - SpanExporter: OTLP over HTTP, or JSON lines appended to TRACING_FILE.
+    """
+    if config.TRACING_EXPORTER == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter(
+            out=open(config.TRACING_FILE, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+    return OTLPSpanExporter(endpoint=config.TRACING_OTLP_ENDPOINT)
+
+
+def _start_query_span(conn, cursor, statement, parameters, context, executemany):
+    if _suppressed.get():
+        conn.info.setdefault("query_spans", []).append(None)
+        return
+    span = tracer.start_span(
+        statement.split(None, 1)[0].upper() if statement else "SQL",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": conn.dialect.name,
+            "db.statement": statement,
+        },
+    )
+    conn.info.setdefault("query_spans", []).append(span)
+
+
+def _end_query_span(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("query_spans")
+    span = spans.pop() if spans else None
+    if span is not None:
+        span.end()
+
+
+def _fail_query_span(context):
+    spans = context.connection.info.get("query_spans") if context.connection else None
+    span = spans.pop() if spans else None
+    if span is not None:
+        span.record_exception(context.original_exception)
+        span.set_status(Status(StatusCode.ERROR))
+        span.end()
+
+
+@contextlib.contextmanager
+def traced_span(name: str, **attributes):
+    """
+    Run a block inside a client span, e.g. a call to Redis or SMTP.
+    Parameters:
+    - name (str): Name of the span.
+    - attributes: Attributes of the span.
+    """
+    if _suppressed.get():
+        yield trace.INVALID_SPAN
+        return
+    with tracer.start_as_current_span(
+        name, kind=SpanKind.CLIENT, attributes=attributes
+    ) as span:
+        yield span
+
+
+def traced(layer: str) -> Callable[[type], type]:
+    """
+    Class decorator wrapping the public async methods in a span named
+    "<layer> <Class>.<method>".
+    The class is left unchanged when tracing is disabled, so the layers
+    pay nothing for it.
+    Parameters:
+    - layer (str): Layer of the class, e.g. "service" or "repository".
+    Returns:
+    - Callable: The decorator.
+    """
+
+    def decorate(cls: type) -> type:
+        if not config.TRACING_ENABLED:
+            return cls
+        for name, func in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.iscoroutinefunction(func):
+                continue
+            setattr(cls, name, _traced_method(func, f"{layer} {cls.__name__}.{name}"))
+        return cls
+
+    return decorate
+
+
+def _traced_method(func: Callable, name: str) -> Callable:
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if _suppressed.get():
+            return await func(*args, **kwargs)
+        with tracer.start_as_current_span(name):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a server span for sampled HTTP requests.
+    Requests continuing a trace from the traceparent header follow its
+    sampling decision, other requests are sampled by TRACING_SAMPLE_RATIO.
+    The span is named after the route template once the request has been
+    routed.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        context = None
+        sampled = None
+        # Most requests carry no trace context, skip parsing the headers then.
+        if any(name == b"traceparent" for name, _ in scope["headers"]):
+            context = propagate.extract(
+                {
+                    name.decode("latin-1"): value.decode("latin-1")
+                    for name, value in scope["headers"]
+                }
+            )
+            parent = trace.get_current_span(context).get_span_context()
+            if parent.is_valid:
+                sampled = parent.trace_flags.sampled
+        if sampled is None:
+            sampled = random.random() < config.TRACING_SAMPLE_RATIO
+        if not sampled:
+            token = _suppressed.set(True)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _suppressed.reset(token)
+            return
+        with tracer.start_as_current_span(
+            scope["method"],
+            context=context,
+            kind=SpanKind.SERVER,
+            attributes={
+                "http.request.method": scope["method"],
+                "url.path": scope["path"],
+            },
+        ) as span:
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.set_attribute("http.route", route.path)
+                    span.update_name(f"{scope['method']} {route.path}")
@@ -1,10 +1,90 @@
+import io
+import os
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
 import cloudinary
 import cloudinary.uploader
+from fastapi import UploadFile
+from PIL import Image, ImageOps, UnidentifiedImageError
 
+from src.config.config import config
+from src.services.tracing import traced_span
+from src.services.workers import WorkerPool
 
-class UploadFileService:
+upload_pool = WorkerPool("avatar_upload", config.AVATAR_UPLOAD_WORKERS)
+image_pool = WorkerPool("avatar_image", config.AVATAR_IMAGE_WORKERS)
+
+MAX_PIXELS = 50_000_000
+
+
+class FileTooLargeError(Exception):
+    """
+    Raised when an uploaded file exceeds the allowed size.
+    """
+
+
+class InvalidImageError(Exception):
     """
-    A service class for uploading files to Cloudinary.
+    Raised when an uploaded file is not an image that can be processed.
+    """
+
+
+def resize_avatar(data: bytes, size: int, image_format: str, quality: int) -> bytes:
+    """
+    Decode an image, crop it to a centered square and re-encode it.
+    Parameters:
+    - data (bytes): Content of the uploaded image.
+    - size (int): Width and height of the result in pixels.
+    - image_format (str): Output format, "webp" or "jpeg".
+    - quality (int): Encoder quality, 1-100.
+    Returns:
+    - bytes: The encoded avatar.
+    Raises:
+    - InvalidImageError: If the data is not a supported image or is too large.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if img.width * img.height > MAX_PIXELS:
+                raise InvalidImageError("Image is too large")
+            has_alpha = img.mode in ("RGBA", "LA") or "transparency" in img.info
+            mode = "RGBA" if has_alpha and image_format == "webp" else "RGB"
+            # JPEG can decode at a reduced scale, which is much cheaper than
+            # decoding the full image and downscaling it afterwards.
+            img.draft("RGB", (size * 2, size * 2))
+            img = ImageOps.exif_transpose(img).convert(mode)
+            img = ImageOps.fit(img, (size, size), Image.Resampling.LANCZOS)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImageError("Unsupported image") from e
+    out = io.BytesIO()
+    img.save(out, format=image_format.upper(), quality=quality)
+    return out.getvalue()
+
+
+class StorageBackend(ABC):
+    """
+    Interface of the storages avatars are uploaded to.
+    """
+
+    @abstractmethod
+    async def save(self, data: bytes, key: str, image_format: str) -> str:
+        """
+        Store a file and return its public URL.
+        Parameters:
+        - data (bytes): Content of the file.
+        - key (str): Storage key of the file, e.g. "RestApp/<username>".
+        - image_format (str): Format of the image, e.g. "webp".
+        Returns:
+        - str: The URL of the stored file.
+        """
+
+
+class CloudinaryStorage(StorageBackend):
+    """
+    Storage backend that uploads files to Cloudinary.
+
+    The Cloudinary SDK is synchronous, so uploads run in the upload worker
+    pool, which also caps the number of uploads in flight.
     """
 
     def __init__(self, cloud_name, api_key, api_secret):
@@ -18,19 +98,149 @@ class UploadFileService:
             secure=True,
         )
 
-    @staticmethod
-    def upload_file(file, username) -> str:
+    async def save(self, data: bytes, key: str, image_format: str) -> str:
         """
-        Uploads a file to Cloudinary and returns the URL of the uploaded file.
+        Upload a file to Cloudinary.
         Parameters:
-        - file: The file to be uploaded.
+        - data (bytes): Content of the file.
+        - key (str): Public ID of the file.
+        - image_format (str): Format of the image, e.g. "webp".
+        Returns:
+        - str: The URL of the uploaded file.
+        """
+        with traced_span("cloudinary upload", **{"cloudinary.public_id": key}):
+            r = await upload_pool.run(
+                cloudinary.uploader.upload,
+                data,
+                public_id=key,
+                overwrite=True,
+                format=image_format,
+            )
+        return cloudinary.CloudinaryImage(key).build_url(
+            version=r.get("version"), format=image_format
+        )
+
+
+class LocalStorage(StorageBackend):
+    """
+    Storage backend that writes files to a local directory.
+    Used for development and tests instead of Cloudinary.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    async def save(self, data: bytes, key: str, image_format: str) -> str:
+        """
+        Write a file to the local directory.
+        Parameters:
+        - data (bytes): Content of the file.
+        - key (str): Key of the file, slashes are replaced in the file name.
+        - image_format (str): Format of the image, used as the file extension.
+        Returns:
+        - str: The URL of the file under base_url.
+        """
+        name = key.replace("/", "_").replace("\\", "_") + f".{image_format}"
+        await upload_pool.run(self._write, os.path.join(self.root, name), data)
+        return f"{self.base_url}/{name}"
+
+    def _write(self, path: str, data: bytes) -> None:
+        """
+        Write the file, creating the directory if needed.
+        Parameters:
+        - path (str): Path of the file.
+        - data (bytes): Content of the file.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+class UploadFileService:
+    """
+    A service class for uploading avatars to a storage backend.
+
+    Avatars are cropped to size x size and re-encoded in the image worker
+    pool before the upload, so the storage only receives small files.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        max_size: int,
+        size: int = 250,
+        image_format: str = "webp",
+        quality: int = 80,
+    ):
+        self.storage = storage
+        self.max_size = max_size
+        self.size = size
+        self.image_format = image_format
+        self.quality = quality
+
+    async def upload_file(self, file: UploadFile, username) -> str:
+        """
+        Uploads a file to the storage and returns the URL of the uploaded file.
+        Parameters:
+        - file (UploadFile): The file to be uploaded.
         - username: The username of the user.
         Returns:
         - str: The URL of the uploaded file.
+        Raises:
+        - FileTooLargeError: If the file is larger than max_size.
+        - InvalidImageError: If the file is not a supported image.
         """
-        public_id = f"RestApp/{username}"
-        r = cloudinary.uploader.upload(file.file, public_id=public_id, overwrite=True)
-        src_url = cloudinary.CloudinaryImage(public_id).build_url(
-            width=250, height=250, crop="fill", version=r.get("version")
+        data = await self.read_limited(file)
+        avatar = await image_pool.run(
+            resize_avatar, data, self.size, self.image_format, self.quality
         )
-        return src_url
+        return await self.storage.save(avatar, f"RestApp/{username}", self.image_format)
+
+    async def read_limited(self, file: UploadFile) -> bytes:
+        """
+        Read an uploaded file in chunks, stopping as soon as it gets too large.
+        Parameters:
+        - file (UploadFile): The uploaded file.
+        Returns:
+        - bytes: Content of the file.
+        Raises:
+        - FileTooLargeError: If the file is larger than max_size.
+        """
+        if file.size is not None and file.size > self.max_size:
+            raise FileTooLargeError
+        data = bytearray()
+        while chunk := await file.read(self.CHUNK_SIZE):
+            data += chunk
+            if len(data) > self.max_size:
+                raise FileTooLargeError
+        return bytes(data)
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    """
+    Get the storage backend selected by AVATAR_STORAGE.
+    Returns:
+    - StorageBackend: Local storage for "local", Cloudinary otherwise.
+    """
+    if config.AVATAR_STORAGE == "local":
+        return LocalStorage(config.AVATAR_LOCAL_DIR, config.AVATAR_LOCAL_URL)
+    return CloudinaryStorage(config.CLD_NAME, config.CLD_API_KEY, config.CLD_API_SECRET)
+
+
+def get_upload_service() -> UploadFileService:
+    """
+    Dependency that provides the avatar upload service.
+    Returns:
+    - UploadFileService: Upload service using the configured storage backend.
+    """
+    return UploadFileService(
+        get_storage(),
+        config.AVATAR_MAX_SIZE,
+        config.AVATAR_SIZE,
+        config.AVATAR_FORMAT,
+        config.AVATAR_QUALITY,
+    )
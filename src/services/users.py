@@ -4,8 +4,11 @@ from libgravatar import Gravatar
 
 from src.repository.users import UserRepository
 from src.schemas.auth import UserCreate
+from src.services.cache import invalidate_user
+from src.services.tracing import traced
 
 
+@traced("service")
 class UserService:
     """
     Service class for managing users.
@@ -16,11 +19,12 @@ class UserService:
     def __init__(self, db: AsyncSession):
         self.repository = UserRepository(db)
 
-    async def create_user(self, body: UserCreate):
+    async def create_user(self, body: UserCreate, commit: bool = True):
         """
         Create a new user.
         Parameters:
         - body (UserCreate): User creation data.
+        - commit (bool): Commit the transaction, False leaves it to the caller.
         Returns:
         - User: The created user object.
         """
@@ -32,7 +36,7 @@ class UserService:
         except Exception as e:
             print(e)
 
-        return await self.repository.create_user(body, avatar)
+        return await self.repository.create_user(body, avatar, commit)
 
     async def get_user_by_id(self, user_id: int):
         """
@@ -72,7 +76,8 @@ class UserService:
         Returns:
         - None
         """
-        return await self.repository.confirmed_email(email)
+        user = await self.repository.confirmed_email(email)
+        await invalidate_user(user.id)
 
     async def update_avatar_url(self, email: str, url: str):
         """
@@ -83,4 +88,19 @@ class UserService:
         Returns:
         - User: The updated user object.
         """
-        return await self.repository.update_avatar_url(email, url)
+        user = await self.repository.update_avatar_url(email, url)
+        await invalidate_user(user.id)
+        return user
+
+    async def reset_password(self, user_id: int, password: str):
+        """
+        Reset the user's password.
+        Parameters:
+        - user_id (int): ID of the user.
+        - password (str): New hashed password.
+        Returns:
+        - User: The updated user object if found, otherwise None.
+        """
+        user = await self.repository.reset_password(user_id, password)
+        await invalidate_user(user_id)
+        return user
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict
+
+worker_pools: Dict[str, "WorkerPool"] = {}
+
+
+class WorkerPool:
+    """
+    Bounded thread pool for blocking work called from async handlers.
+
+    At most ``max_workers`` calls run at the same time, the rest wait in the
+    executor queue. The pool keeps counters of the queue depth and of the time
+    calls spent waiting for a free worker.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.pending_max = 0
+        self.completed = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        worker_pools[name] = self
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking function in the pool without blocking the event loop.
+        A call cancelled while it is still queued never runs, it is taken off
+        the queue depth and not counted as completed.
+        Parameters:
+        - func (Callable): Function to call.
+        - args, kwargs: Arguments of the function.
+        Returns:
+        - The result of the function.
+        """
+        with self._lock:
+            self.pending += 1
+            self.pending_max = max(self.pending_max, self.pending)
+        loop = asyncio.get_running_loop()
+        state = {"started": False, "abandoned": False}
+        call = partial(self._call, state, time.perf_counter(), func, *args, **kwargs)
+        try:
+            return await loop.run_in_executor(self._executor, call)
+        finally:
+            with self._lock:
+                if not state["started"]:
+                    state["abandoned"] = True
+                    self.pending -= 1
+
+    def _call(
+        self,
+        state: Dict[str, bool],
+        queued_at: float,
+        func: Callable[..., Any],
+        *args,
+        **kwargs,
+    ):
+        """
+        Execute a queued call in a worker thread and record its wait time.
+        Parameters:
+        - state (dict): Whether the call started and whether run() gave up on
+          it before, in which case it already left the queue depth.
+        - queued_at (float): perf_counter value when the call was queued.
+        - func (Callable): Function to call.
+        - args, kwargs: Arguments of the function.
+        Returns:
+        - The result of the function.
+        """
+        waited = time.perf_counter() - queued_at
+        with self._lock:
+            state["started"] = True
+            if not state["abandoned"]:
+                self.pending -= 1
+            self.running += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the pool statistics.
+        Returns:
+        - dict: Worker limit, queue depth, running and completed calls, and wait times.
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "pending": self.pending,
+                "pending_max": self.pending_max,
+                "running": self.running,
+                "completed": self.completed,
+                "wait_time_total": self.wait_time_total,
+                "wait_time_max": self.wait_time_max,
+            }
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker threads after the queued calls finish.
+        """
+        self._executor.shutdown(wait=True)
+        worker_pools.pop(self.name, None)
+
+
+def get_worker_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get the statistics of all worker pools.
+    Returns:
+    - dict: Pool name mapped to its statistics.
+    """
+    return {name: pool.stats() for name, pool in worker_pools.items()}
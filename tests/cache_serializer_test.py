@@ -0,0 +1,54 @@
+from datetime import date
+
+import pytest
+from aiocache.serializers import PickleSerializer
+
+from src.schemas.schemas import ContactResponse
+from src.services.cache import VersionedJsonSerializer
+
+
+@pytest.fixture
+def serializer():
+    return VersionedJsonSerializer()
+
+
+@pytest.fixture
+def contact():
+    return ContactResponse(
+        id=1,
+        name="Evan",
+        last_name="Jedi",
+        email="evan@example.com",
+        phone="111-222-3333",
+        birthday=date(2002, 2, 2),
+    )
+
+
+def test_round_trip(serializer, contact):
+    value = {"2026-10-17:7:100": [contact]}
+
+    result = serializer.loads(serializer.dumps(value))
+
+    assert result == {"2026-10-17:7:100": [contact.model_dump(mode="json")]}
+    assert ContactResponse.model_validate(result["2026-10-17:7:100"][0]) == contact
+
+
+def test_dumps_is_version_prefixed(serializer):
+    assert serializer.dumps({"a": 1}).startswith(b"v1:")
+
+
+def test_other_version_is_a_miss(serializer):
+    assert serializer.loads(b'v0:{"a":1}') is None
+
+
+def test_pickled_entry_is_a_miss(serializer, contact):
+    assert serializer.loads(PickleSerializer().dumps(contact)) is None
+
+
+def test_none_is_a_miss(serializer):
+    assert serializer.loads(None) is None
+
+
+def test_unsupported_type_raises(serializer):
+    with pytest.raises(TypeError):
+        serializer.dumps(object())
@@ -94,7 +94,7 @@ def init_models_wrap():
             await conn.run_sync(Base.metadata.drop_all)
             await conn.run_sync(Base.metadata.create_all)
         async with TestingSessionLocal() as session:
-            hash_password = Hash().get_password_hash(test_user["password"])
+            hash_password = await Hash().get_password_hash(test_user["password"])
             current_user = User(
                 username=test_user["username"],
                 email=test_user["email"],
@@ -0,0 +1,143 @@
+import gzip
+import json
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.config.config import config
+from src.database.models import Base, Contact, User
+from src.repository.contacts import ContactRepository
+from src.services.contact_export import render_vcard, vcard_fold
+from src.services.contact_import import iter_csv_records, iter_ndjson_records
+from src.services.contacts import ContactService
+
+
+async def read_all(chunks):
+    return [chunk async for chunk in chunks]
+
+
+async def from_chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def users(session):
+    owner = User(username="owner", email="owner@example.com", role="user")
+    other = User(username="other", email="other@example.com", role="user")
+    session.add_all([owner, other])
+    await session.commit()
+    session.add_all(
+        Contact(
+            name=f"Name{i}",
+            last_name=f"Last{i}",
+            email=f"c{i}@example.com",
+            phone=f"+380-{i}",
+            birthday=date(1990, 1, i % 28 + 1),
+            additional_data='note, "quoted"\nsecond line' if i == 1 else None,
+            user=owner if i <= 5 else other,
+        )
+        for i in range(1, 8)
+    )
+    await session.commit()
+    return owner, other
+
+
+@pytest.mark.asyncio
+async def test_contacts_are_streamed_in_batches(session, users):
+    owner, _ = users
+
+    batches = await read_all(ContactRepository(session).stream_contacts(owner, 2))
+
+    assert [len(rows) for rows in batches] == [2, 2, 1]
+    assert [row.email for rows in batches for row in rows] == [
+        f"c{i}@example.com" for i in range(1, 6)
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "format, parser", [("csv", iter_csv_records), ("ndjson", iter_ndjson_records)]
+)
+async def test_export_can_be_imported_again(
+    monkeypatch, session, users, format, parser
+):
+    monkeypatch.setattr(config, "EXPORT_BATCH_SIZE", 2)
+    owner, _ = users
+    service = ContactService(session)
+
+    chunks = await read_all(service.export_contacts(owner, format))
+
+    records = await read_all(parser(from_chunks(chunks)))
+    assert [data["email"] for _, data, _ in records] == [
+        f"c{i}@example.com" for i in range(1, 6)
+    ]
+    assert records[0][1]["additional_data"] == 'note, "quoted"\nsecond line'
+    assert records[0][1]["phone"] == "+380-1"
+
+
+@pytest.mark.asyncio
+async def test_gzip_export(session, users):
+    owner, _ = users
+
+    chunks = await read_all(
+        ContactService(session).export_contacts(owner, "ndjson", True)
+    )
+
+    lines = gzip.decompress(b"".join(chunks)).decode().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == [
+        f"Name{i}" for i in range(1, 6)
+    ]
+
+
+def test_vcard_escapes_values():
+    row = SimpleNamespace(
+        name="Ann",
+        last_name="Lee; Jr",
+        email="a@example.com",
+        phone="1",
+        birthday=date(1990, 1, 31),
+        additional_data="a,b\nc\\d",
+    )
+
+    assert render_vcard([row]) == (
+        "BEGIN:VCARD\r\n"
+        "VERSION:3.0\r\n"
+        "N:Lee\\; Jr;Ann;;;\r\n"
+        "FN:Ann Lee\\; Jr\r\n"
+        "EMAIL;TYPE=INTERNET:a@example.com\r\n"
+        "TEL:1\r\n"
+        "BDAY:1990-01-31\r\n"
+        "NOTE:a\\,b\\nc\\\\d\r\n"
+        "END:VCARD\r\n"
+    )
+
+
+def test_vcard_folds_long_lines_by_octets():
+    line = "NOTE:" + "é" * 100
+
+    folded = vcard_fold(line)
+
+    parts = folded.removesuffix("\r\n").split("\r\n")
+    assert all(len(part.encode()) <= 75 for part in parts)
+    assert all(part.startswith(" ") for part in parts[1:])
+    assert "".join(part.removeprefix(" ") for part in parts) == line
+    assert vcard_fold("FN:Ann") == "FN:Ann\r\n"
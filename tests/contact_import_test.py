@@ -0,0 +1,247 @@
+from datetime import date
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.config.config import config
+from src.database.models import Base, Contact, User
+from src.services.contact_import import (
+    ImportFormatError,
+    import_format,
+    iter_csv_records,
+    iter_ndjson_records,
+)
+from src.services.contacts import BIRTHDAYS_GENERATION_TTL, ContactService
+
+
+async def chunked(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def collect(records):
+    return [record async for record in records]
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    cache = MagicMock(set=AsyncMock())
+    monkeypatch.setattr("src.services.contacts.get_cache", lambda: cache)
+    return cache
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def user(session):
+    user = User(username="owner", email="owner@example.com", role="user")
+    session.add(user)
+    await session.commit()
+    return user
+
+
+def csv_row(i: int, birthday: str = "1990-01-31") -> str:
+    return f"Name{i},Last{i},c{i}@example.com,000-{i},{birthday}\r\n"
+
+
+@pytest.mark.asyncio
+async def test_csv_records_are_parsed_across_chunks():
+    data = (
+        "\ufeffName,Last_Name,Email,Phone,Birthday,Additional_Data\r\n"
+        'Ann,Lee,a@example.com,1,1990-01-31,"two\r\nlines, ""quoted"""\r\n'
+        "\r\n"
+        "Bob,Ray,b@example.com,2,1991-02-01,\r\n"
+        "Bad,Row\r\n"
+    ).encode()
+
+    records = await collect(iter_csv_records(chunked(data)))
+
+    assert records == [
+        (
+            1,
+            {
+                "name": "Ann",
+                "last_name": "Lee",
+                "email": "a@example.com",
+                "phone": "1",
+                "birthday": "1990-01-31",
+                "additional_data": 'two\r\nlines, "quoted"',
+            },
+            None,
+        ),
+        (
+            2,
+            {
+                "name": "Bob",
+                "last_name": "Ray",
+                "email": "b@example.com",
+                "phone": "2",
+                "birthday": "1991-02-01",
+            },
+            None,
+        ),
+        (3, None, "Expected 6 values, got 2"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_stray_quote_does_not_swallow_later_rows():
+    data = (
+        "name,last_name,email,phone,birthday\n"
+        'Ann,O"Neil,a@example.com,1,1990-01-31\n' + csv_row(2) + csv_row(3)
+    ).encode()
+
+    records = await collect(iter_csv_records(chunked(data)))
+
+    assert [(row, data and data["last_name"]) for row, data, _ in records] == [
+        (1, 'O"Neil'),
+        (2, "Last2"),
+        (3, "Last3"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_records_over_the_size_limit_are_rejected(monkeypatch):
+    monkeypatch.setattr(config, "IMPORT_MAX_RECORD_SIZE", 100)
+    header = "name,last_name,email,phone,birthday\n"
+    data = (
+        header
+        + csv_row(1)
+        + "x" * 150
+        + "\n"
+        + csv_row(2)
+        + 'Open,"quoted\n'
+        + "more\n" * 20
+        + csv_row(3)
+    ).encode()
+
+    records = await collect(iter_csv_records(chunked(data)))
+    unterminated = await collect(
+        iter_csv_records(chunked((header + 'Open,"quoted\n' + csv_row(1)).encode()))
+    )
+
+    assert [(row, error) for row, _, error in records] == [
+        (1, None),
+        (2, "Record is longer than 100 characters"),
+        (3, None),
+        (4, "Record is longer than 100 characters"),
+        (5, "Expected 5 values, got 1"),
+        (6, "Expected 5 values, got 1"),
+        (7, None),
+    ]
+    assert unterminated == [(1, None, "Invalid CSV: unterminated quoted value")]
+
+
+@pytest.mark.asyncio
+async def test_csv_without_required_columns_is_rejected():
+    with pytest.raises(ImportFormatError, match="birthday"):
+        await collect(iter_csv_records(chunked(b"name,last_name,email,phone\n")))
+    with pytest.raises(ImportFormatError, match="empty"):
+        await collect(iter_csv_records(chunked(b"")))
+    with pytest.raises(ImportFormatError, match="UTF-8"):
+        await collect(iter_csv_records(chunked(b"name,\xff\n")))
+
+
+@pytest.mark.asyncio
+async def test_ndjson_records_are_parsed_per_line():
+    data = b'{"name": "\xc3\x89va"}\n\n[1]\n{oops\n{"name": "Bob"}'
+
+    records = await collect(iter_ndjson_records(chunked(data, 3)))
+
+    assert records == [
+        (1, {"name": "Éva"}, None),
+        (2, None, "Expected a JSON object"),
+        (3, None, records[2][2]),
+        (4, {"name": "Bob"}, None),
+    ]
+    assert records[2][2].startswith("Invalid JSON")
+
+
+def test_import_format_from_content_type():
+    assert import_format("text/csv; charset=utf-8") == "csv"
+    assert import_format("application/x-ndjson") == "ndjson"
+    assert import_format("application/json") is None
+    assert import_format(None) is None
+
+
+@pytest.mark.asyncio
+async def test_import_inserts_in_batches_and_reports_errors(
+    monkeypatch, session, user, cache
+):
+    monkeypatch.setattr(config, "IMPORT_BATCH_SIZE", 2)
+    session.add(
+        Contact(
+            name="Old",
+            last_name="Old",
+            email="c3@example.com",
+            phone="0",
+            birthday=date(1980, 5, 5),
+            user_id=user.id,
+        )
+    )
+    await session.commit()
+    data = (
+        "name,last_name,email,phone,birthday\n"
+        + csv_row(1)
+        + csv_row(2, "not a date")
+        + csv_row(3)
+        + csv_row(4)
+        + csv_row(1)
+        + csv_row(5, "")
+        + csv_row(6)
+    ).encode()
+
+    result = await ContactService(session).import_contacts(
+        iter_csv_records(chunked(data, 64)), user
+    )
+
+    assert (result.rows, result.imported, result.failed) == (7, 3, 4)
+    errors = {error.row: error.error for error in result.errors}
+    assert sorted(errors) == [2, 3, 5, 6]
+    assert errors[2].startswith("birthday:")
+    assert errors[3] == "Contact with this email already exists"
+    assert errors[5] == "Contact with this email already exists"
+    assert errors[6] == "birthday: Field required"
+    emails = (await session.execute(select(Contact.email))).scalars().all()
+    assert sorted(emails) == [f"c{i}@example.com" for i in (1, 3, 4, 6)]
+    cache.set.assert_awaited_once_with(
+        f"birthdays_generation:{user.id}", ANY, ttl=BIRTHDAYS_GENERATION_TTL
+    )
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_duplicates_within_a_batch_and_caps_errors(
+    monkeypatch, session, user
+):
+    monkeypatch.setattr(config, "IMPORT_MAX_ERRORS", 1)
+    data = b"\n".join(
+        [
+            b'{"name": "A", "last_name": "A", "email": "a@example.com", '
+            b'"phone": "1", "birthday": "1990-01-01"}'
+        ]
+        * 3
+        + [b'{"name": "' + b"x" * 51 + b'"}']
+    )
+
+    result = await ContactService(session).import_contacts(
+        iter_ndjson_records(chunked(data, 100)), user
+    )
+
+    assert (result.rows, result.imported, result.failed) == (4, 1, 3)
+    assert [(e.row, e.error) for e in result.errors] == [(2, "Duplicate email in file")]
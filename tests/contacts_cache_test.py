@@ -0,0 +1,130 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from aiocache import SimpleMemoryCache
+
+from src.database.models import Contact, User
+from src.services.cache import cache_counters, seconds_until_midnight
+from src.services.contacts import ContactService
+
+
+@pytest.fixture
+def user():
+    return User(id=1, username="testuser", role="user")
+
+
+@pytest.fixture
+def contact(user: User):
+    return Contact(
+        id=1,
+        name="Evan",
+        last_name="Jedi",
+        email="evan@example.com",
+        phone="111-222-3333",
+        birthday=date(2002, 2, 2),
+        user=user,
+    )
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SimpleMemoryCache()
+    monkeypatch.setattr("src.services.contacts.get_cache", lambda: cache)
+    cache_counters.clear()
+    return cache
+
+
+@pytest.fixture
+def contact_service(contact):
+    service = ContactService(AsyncMock())
+    service.contact_repository = MagicMock()
+    service.contact_repository.get_upcoming_birthdays = AsyncMock(
+        return_value=[contact]
+    )
+    service.contact_repository.create_contact = AsyncMock(return_value=contact)
+    service.contact_repository.delete_contact = AsyncMock(return_value=None)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_birthdays_are_cached(cache, contact_service, user):
+    first = await contact_service.get_upcoming_birthdays(user, 100, 7)
+    second = await contact_service.get_upcoming_birthdays(user, 100, 7)
+
+    assert first == second
+    assert first[0].email == "evan@example.com"
+    contact_service.contact_repository.get_upcoming_birthdays.assert_awaited_once()
+    assert cache_counters["birthdays"].as_dict() == {
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": 0.5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_birthdays_cache_is_keyed_by_window(cache, contact_service, user):
+    await contact_service.get_upcoming_birthdays(user, 100, 7)
+    await contact_service.get_upcoming_birthdays(user, 100, 30)
+    await contact_service.get_upcoming_birthdays(user, 10, 7)
+
+    assert contact_service.contact_repository.get_upcoming_birthdays.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_create_contact_invalidates_birthdays(
+    cache, contact_service, user, contact
+):
+    await contact_service.get_upcoming_birthdays(user, 100, 7)
+    await contact_service.create_contact(MagicMock(), user)
+    await contact_service.get_upcoming_birthdays(user, 100, 7)
+
+    assert contact_service.contact_repository.get_upcoming_birthdays.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_digest_read_before_invalidation_is_not_served(
+    cache, contact_service, user, contact
+):
+    async def read_then_write(*args, **kwargs):
+        # A contact is created while the birthdays are read from the database.
+        await contact_service.create_contact(MagicMock(), user)
+        return [contact]
+
+    contact_service.contact_repository.get_upcoming_birthdays.side_effect = (
+        read_then_write
+    )
+    await contact_service.get_upcoming_birthdays(user, 100, 7)
+    contact_service.contact_repository.get_upcoming_birthdays.side_effect = None
+    await contact_service.get_upcoming_birthdays(user, 100, 7)
+    await contact_service.get_upcoming_birthdays(user, 100, 7)
+
+    assert contact_service.contact_repository.get_upcoming_birthdays.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_contact_keeps_birthdays_cache(cache, contact_service, user):
+    await contact_service.get_upcoming_birthdays(user, 100, 7)
+    await contact_service.delete_contact(777, user)
+    await contact_service.get_upcoming_birthdays(user, 100, 7)
+
+    contact_service.contact_repository.get_upcoming_birthdays.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_birthdays_fall_back_when_cache_is_down(
+    monkeypatch, contact_service, user
+):
+    broken_cache = MagicMock()
+    broken_cache.get = AsyncMock(side_effect=ConnectionError("redis is down"))
+    broken_cache.set = AsyncMock(side_effect=ConnectionError("redis is down"))
+    monkeypatch.setattr("src.services.contacts.get_cache", lambda: broken_cache)
+
+    result = await contact_service.get_upcoming_birthdays(user, 100, 7)
+
+    assert result[0].email == "evan@example.com"
+
+
+def test_seconds_until_midnight():
+    assert seconds_until_midnight(datetime(2026, 1, 1, 23, 59, 30)) == 30
+    assert seconds_until_midnight(datetime(2026, 1, 1, 0, 0, 0)) == 86400
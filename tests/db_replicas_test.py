@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from src.database.db import DatabaseSessionManager
+
+
+async def create_marker(url: str, name: str):
+    manager = DatabaseSessionManager(url)
+    async with manager.session() as session:
+        await session.execute(text("CREATE TABLE marker (name TEXT)"))
+        await session.execute(text("INSERT INTO marker VALUES (:name)"), {"name": name})
+        await session.commit()
+    await manager._engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path):
+    urls = {
+        name: f"sqlite+aiosqlite:///{tmp_path / name}.db"
+        for name in ("primary", "replica1", "replica2")
+    }
+    for name, url in urls.items():
+        await create_marker(url, name)
+
+    manager = DatabaseSessionManager(
+        urls["primary"],
+        [urls["replica1"], urls["replica2"]],
+        max_replica_lag=1,
+        replica_check_interval=0,
+    )
+    yield manager
+    for engine in [manager._engine] + [r.engine for r in manager._replicas]:
+        await engine.dispose()
+
+
+async def read_marker(manager: DatabaseSessionManager) -> str:
+    async with manager.read_session() as session:
+        result = await session.execute(text("SELECT name FROM marker"))
+        return result.scalar_one()
+
+
+def set_lag(monkeypatch, replica, lag, delay=0):
+    async def measure_lag():
+        await asyncio.sleep(delay)
+        return lag
+
+    monkeypatch.setattr(replica, "_measure_lag", measure_lag)
+
+
+@pytest.mark.asyncio
+async def test_read_sessions_round_robin(manager):
+    names = [await read_marker(manager) for _ in range(4)]
+
+    assert names == ["replica1", "replica2", "replica1", "replica2"]
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_is_skipped(manager, monkeypatch):
+    set_lag(monkeypatch, manager._replicas[0], 30)
+
+    names = [await read_marker(manager) for _ in range(3)]
+
+    assert names == ["replica2", "replica2", "replica2"]
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_primary(manager, monkeypatch):
+    set_lag(monkeypatch, manager._replicas[0], float("inf"))
+    set_lag(monkeypatch, manager._replicas[1], 30)
+
+    assert await read_marker(manager) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_unanswered_lag_check_times_out(manager, monkeypatch):
+    manager.replica_check_timeout = 0.05
+    set_lag(monkeypatch, manager._replicas[0], 0, delay=10)
+    started = time.monotonic()
+
+    assert await read_marker(manager) == "replica2"
+    assert time.monotonic() - started < 1
+    assert manager._replicas[0].lag == float("inf")
+
+
+@pytest.mark.asyncio
+async def test_stale_lag_is_refreshed_in_background(manager, monkeypatch):
+    assert [await read_marker(manager) for _ in range(2)] == ["replica1", "replica2"]
+    set_lag(monkeypatch, manager._replicas[0], 30, delay=0.2)
+    started = time.monotonic()
+
+    assert await read_marker(manager) == "replica1"
+    assert time.monotonic() - started < 0.1
+    await manager._replicas[0].wait_for_check()
+    assert await read_marker(manager) == "replica2"
+    assert await read_marker(manager) == "replica2"
+
+
+@pytest.mark.asyncio
+async def test_writes_use_primary(manager):
+    async with manager.session() as session:
+        result = await session.execute(text("SELECT name FROM marker"))
+
+        assert result.scalar_one() == "primary"
+
+
+@pytest.mark.asyncio
+async def test_without_replicas_reads_use_primary(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'primary'}.db"
+    await create_marker(url, "primary")
+    manager = DatabaseSessionManager(url)
+
+    assert await read_marker(manager) == "primary"
+    assert manager.replica_stats() == []
+    await manager._engine.dispose()
@@ -0,0 +1,179 @@
+import asyncio
+import socket
+from email import message_from_bytes
+from email.header import decode_header, make_header
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from src.services import email
+from src.services.auth import get_email_from_token, get_password_from_token
+from src.services.email import build_message, reset_password_message, templates
+from src.services.smtp import SMTPPool
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.noops = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(message_from_bytes(envelope.content))
+        return "250 OK"
+
+    async def handle_NOOP(self, server, session, envelope, arg):
+        self.noops += 1
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(autouse=True)
+def sender(monkeypatch):
+    monkeypatch.setattr(email.config, "MAIL_FROM", "noreply@example.com")
+    monkeypatch.setattr(email.config, "MAIL_FROM_NAME", "Contacts")
+    monkeypatch.setattr(email.config, "JWT_SECRET", "secret")
+    monkeypatch.setattr(email.config, "JWT_ALGORITHM", "HS256")
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller
+    if controller._thread is not None:
+        controller.stop()
+
+
+def make_pool(server, **kwargs) -> SMTPPool:
+    return SMTPPool(server.hostname, server.port, **kwargs)
+
+
+def message(n: int):
+    return build_message(
+        f"user{n}@example.com",
+        "Confirm your email",
+        "email_verify.html",
+        host="http://test/",
+        username=f"user{n}",
+        token="token",
+    )
+
+
+@pytest.mark.asyncio
+async def test_connection_is_reused(smtp_server):
+    pool = make_pool(smtp_server)
+
+    await pool.send(message(1))
+    await pool.send(message(2))
+    await pool.close()
+
+    assert [m["To"] for m in smtp_server.handler.messages] == [
+        "user1@example.com",
+        "user2@example.com",
+    ]
+    assert pool.stats()["connects"] == 1
+    assert pool.stats()["reuses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_are_capped_by_pool_size(smtp_server):
+    pool = make_pool(smtp_server, size=2)
+
+    await asyncio.gather(*(pool.send(message(n)) for n in range(6)))
+    await pool.close()
+
+    assert len(smtp_server.handler.messages) == 6
+    assert pool.stats()["connects"] <= 2
+
+
+@pytest.mark.asyncio
+async def test_idle_connection_is_checked_with_noop(smtp_server):
+    pool = make_pool(smtp_server, noop_interval=0)
+
+    await pool.send(message(1))
+    await pool.send(message(2))
+    await pool.close()
+
+    assert smtp_server.handler.noops == 1
+    assert pool.stats()["connects"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_server_restart(smtp_server):
+    pool = make_pool(smtp_server)
+    await pool.send(message(1))
+
+    smtp_server.stop()
+    restarted = Controller(
+        smtp_server.handler, hostname=smtp_server.hostname, port=smtp_server.port
+    )
+    restarted.start()
+    try:
+        await pool.send(message(2))
+        await pool.close()
+    finally:
+        restarted.stop()
+
+    assert len(smtp_server.handler.messages) == 2
+    assert pool.stats()["connects"] == 2
+    assert pool.stats()["sent"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reset_password_message_renders_template(smtp_server):
+    pool = make_pool(smtp_server)
+
+    await pool.send(
+        reset_password_message("user@example.com", "user", "http://test/", "hash")
+    )
+    await pool.close()
+
+    sent = smtp_server.handler.messages[0]
+    body = sent.get_payload(decode=True).decode()
+    token = body.split("api/auth/confirm_reset_password/")[1].split('"')[0]
+    assert sent["To"] == "user@example.com"
+    assert sent["From"] == "Contacts <noreply@example.com>"
+    assert "http://test/api/auth/confirm_reset_password/" in body
+    assert await get_email_from_token(token) == "user@example.com"
+    assert await get_password_from_token(token) == "hash"
+
+
+@pytest.mark.asyncio
+async def test_non_ascii_headers_are_encoded(smtp_server, monkeypatch):
+    monkeypatch.setattr(email.config, "MAIL_FROM_NAME", "Контакти")
+    pool = make_pool(smtp_server)
+
+    await pool.send(
+        build_message(
+            "user@example.com",
+            "Підтвердіть email",
+            "email_verify.html",
+            host="http://test/",
+            username="Олена",
+            token="token",
+        )
+    )
+    await pool.close()
+
+    sent = smtp_server.handler.messages[0]
+    assert str(make_header(decode_header(sent["Subject"]))) == "Підтвердіть email"
+    assert str(make_header(decode_header(sent["From"]))) == (
+        "Контакти <noreply@example.com>"
+    )
+    assert "Олена" in sent.get_payload(decode=True).decode()
+
+
+def test_templates_are_not_loaded_per_message(monkeypatch):
+    def fail(*args):
+        raise AssertionError("template loaded from disk")
+
+    monkeypatch.setattr(templates.loader, "get_source", fail)
+
+    message(1)
+    reset_password_message("user@example.com", "user", "http://test/", "hash")
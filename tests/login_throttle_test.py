@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.config.config import config
+from src.database.db import get_db
+from src.routers import auth
+from src.services.login_throttle import LoginThrottle
+
+
+class Clock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(config, "LOGIN_USER_MAX_FAILURES", 3)
+    monkeypatch.setattr(config, "LOGIN_IP_MAX_FAILURES", 5)
+    monkeypatch.setattr(config, "LOGIN_LOCKOUT_BASE", 1)
+    monkeypatch.setattr(config, "LOGIN_LOCKOUT_MAX", 10)
+    monkeypatch.setattr(config, "LOGIN_FAILURE_WINDOW", 60)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def throttle(clock):
+    return LoginThrottle(FakeRedis(server=FakeServer()), clock=clock)
+
+
+@pytest.mark.asyncio
+async def test_lockout_doubles_with_each_failure_up_to_cap(throttle, clock):
+    waits = [await throttle.failure("Alice", "10.0.0.1") for _ in range(7)]
+
+    assert waits == [0, 0, 1, 2, 4, 8, 10]
+    assert await throttle.check("alice", "10.0.0.2") == 10
+    clock.now += 10
+    assert await throttle.check("alice", "10.0.0.2") == 0
+
+
+@pytest.mark.asyncio
+async def test_address_is_locked_across_usernames(throttle):
+    for i in range(5):
+        await throttle.failure(f"user{i}", "10.0.0.1")
+
+    assert await throttle.check("someone", "10.0.0.1") == 1
+    assert await throttle.check("someone", "10.0.0.2") == 0
+
+
+@pytest.mark.asyncio
+async def test_success_resets_username_but_not_address(throttle, clock):
+    for _ in range(3):
+        await throttle.failure("alice", "10.0.0.1")
+    await throttle.failure("bob", "10.0.0.1")
+    await throttle.success("alice")
+    clock.now += 2
+
+    assert await throttle.failure("alice", "10.0.0.9") == 0
+    assert await throttle.failure("carol", "10.0.0.1") == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_expire_after_window(throttle, clock):
+    redis = throttle.redis
+    await throttle.failure("alice", "10.0.0.1")
+
+    assert 0 < await redis.pttl("login:user:alice") <= 60_000
+    assert await redis.hget("login:user:alice", "f") == b"1"
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fail_open(clock):
+    class BrokenRedis(FakeRedis):
+        async def evalsha(self, *args, **kwargs):
+            raise RedisConnectionError("Redis is down")
+
+    throttle = LoginThrottle(BrokenRedis(server=FakeServer()), clock=clock, retry=60)
+
+    assert await throttle.failure("alice", "10.0.0.1") == 0
+    assert await throttle.check("alice", "10.0.0.1") == 0
+    assert throttle.stats() == {"rejected": 0, "failures": 1, "errors": 1}
+
+
+@pytest_asyncio.fixture
+async def client(monkeypatch, throttle):
+    monkeypatch.setattr(auth, "get_login_throttle", lambda: throttle)
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api")
+    app.dependency_overrides[get_db] = lambda: None
+    transport = ASGITransport(app=app, client=("10.0.0.1", 1234))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_locked_out_login_skips_lookup_and_password_check(monkeypatch, client):
+    user = SimpleNamespace(hashed_password="hash", confirmed=True)
+    lookup = AsyncMock(return_value=user)
+    verify = AsyncMock(return_value=False)
+    monkeypatch.setattr(auth.UserService, "get_user_by_username", lookup)
+    monkeypatch.setattr(auth.Hash, "verify_password", verify)
+    form = {"username": "alice", "password": "wrong"}
+
+    responses = [await client.post("/api/auth/login", data=form) for _ in range(4)]
+
+    assert [r.status_code for r in responses] == [401, 401, 401, 429]
+    assert responses[3].headers["Retry-After"] == "1"
+    assert lookup.await_count == verify.await_count == 3
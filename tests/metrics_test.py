@@ -0,0 +1,184 @@
+import ipaddress
+import os
+import subprocess
+import sys
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.config.config import config
+from src.database.db import get_db, sessionmanager
+from src.database.models import Base
+from src.routers import metrics
+from src.services.cache import cache_counters
+from src.services.metrics import (
+    ApplicationCollector,
+    MetricsMiddleware,
+    is_allowed_client,
+    registry,
+)
+
+
+def sample(name: str, **labels) -> float:
+    return registry.get_sample_value(name, labels) or 0.0
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(bind=engine)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def client(session):
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+    app.dependency_overrides[get_db] = lambda: session
+
+    @app.get("/items/{id}")
+    async def item(id: int):
+        return {"id": id}
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template(client):
+    count = "http_request_duration_seconds_count"
+    before = {
+        "ok": sample(count, method="GET", route="/items/{id}", status="200"),
+        "invalid": sample(count, method="GET", route="/items/{id}", status="422"),
+        "unmatched": sample(count, method="GET", route="<unmatched>", status="404"),
+        "error": sample(count, method="GET", route="/fail", status="500"),
+    }
+
+    for path in ("/items/1", "/items/2", "/items/x", "/missing/1", "/fail"):
+        await client.get(path)
+
+    assert sample(count, method="GET", route="/items/{id}", status="200") == (
+        before["ok"] + 2
+    )
+    assert sample(count, method="GET", route="/items/{id}", status="422") == (
+        before["invalid"] + 1
+    )
+    assert sample(count, method="GET", route="<unmatched>", status="404") == (
+        before["unmatched"] + 1
+    )
+    assert sample(count, method="GET", route="/fail", status="500") == (
+        before["error"] + 1
+    )
+    assert sample("http_requests_in_progress") == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_methods_share_one_label(client):
+    count = "http_request_duration_seconds_count"
+    labels = {"method": "OTHER", "route": "<unmatched>", "status": "404"}
+    before = sample(count, **labels)
+
+    for method in ("FOO", "BAR"):
+        await client.request(method, "/x")
+
+    assert sample(count, **labels) == before + 2
+    assert sample(count, method="FOO", route="<unmatched>", status="404") == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exports_application_statistics(client):
+    cache_counters["metrics_test"].hit()
+    cache_counters["metrics_test"].miss()
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'cache_hit_ratio{cache="metrics_test"} 0.5' in response.text
+    assert 'email_outbox_emails{status="pending"} 0.0' in response.text
+    assert "http_request_duration_seconds_bucket" in response.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_is_limited_to_allowed_networks(monkeypatch, client):
+    monkeypatch.setattr(
+        config, "METRICS_ALLOWED_NETWORKS", [ipaddress.ip_network("10.0.0.0/8")]
+    )
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 403
+    assert is_allowed_client("10.1.2.3")
+    assert not is_allowed_client("127.0.0.1")
+    assert not is_allowed_client(None)
+
+
+def test_replicas_are_labelled_by_position(monkeypatch):
+    stats = {
+        "checked_in": 1,
+        "checked_out": 0,
+        "overflow": 0,
+        "size": 5,
+        "checkouts": 3,
+        "wait_time_total": 0.0,
+        "timeouts": 0,
+    }
+    monkeypatch.setattr(sessionmanager, "pool_stats", lambda: stats)
+    monkeypatch.setattr(
+        sessionmanager,
+        "replica_stats",
+        lambda: [{"host": "db-replica.internal", "pool": stats}],
+    )
+
+    (size,) = [
+        family
+        for family in ApplicationCollector(process="1").collect()
+        if family.name == "db_pool_size"
+    ]
+
+    assert [sample.labels for sample in size.samples] == [
+        {"pool": "primary", "process": "1"},
+        {"pool": "replica0", "process": "1"},
+    ]
+
+
+def test_multiprocess_metrics_are_aggregated_over_processes(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    record = (
+        "from src.services.metrics import REQUEST_DURATION, generate_metrics; "
+        "REQUEST_DURATION.labels('GET', '/items/{id}', 200).observe(0.1); "
+        "print(generate_metrics().decode())"
+    )
+
+    subprocess.run(
+        [sys.executable, "-c", record], env=env, check=True, capture_output=True
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", record],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/items/{id}",'
+        'status="200"} 2.0'
+    ) in output
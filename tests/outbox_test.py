@@ -0,0 +1,220 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.config.config import config
+from src.database.models import Base, EmailOutbox, OutboxStatus, User
+from src.repository.outbox import OutboxRepository
+from src.routers.auth import register_user
+from src.schemas.auth import UserCreate
+from src.services.outbox import OutboxService, retry_delay
+
+
+class RecordingPool:
+    def __init__(self, fail_for=()):
+        self.messages = []
+        self.fail_for = set(fail_for)
+
+    async def send(self, message):
+        if message["To"] in self.fail_for:
+            raise ConnectionRefusedError("SMTP server is down")
+        self.messages.append(message)
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(config, "MAIL_FROM", "noreply@example.com")
+    monkeypatch.setattr(config, "JWT_SECRET", "secret")
+    monkeypatch.setattr(config, "JWT_ALGORITHM", "HS256")
+    monkeypatch.setattr(config, "OUTBOX_MAX_ATTEMPTS", 2)
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(bind=engine)() as session:
+        yield session
+    await engine.dispose()
+
+
+async def outbox_rows(session):
+    session.expire_all()
+    result = await session.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+    return result.scalars().all()
+
+
+async def make_due(session):
+    past = datetime.now(UTC) - timedelta(days=1)
+    for row in await outbox_rows(session):
+        row.next_attempt_at = past
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_dedups_pending_email_per_kind_and_recipient(session):
+    service = OutboxService(session)
+
+    await service.enqueue_reset_password_email("a@example.com", "a", "h/", "t1")
+    await service.enqueue_reset_password_email("a@example.com", "a", "h/", "t2")
+    await service.enqueue_verification_email("a@example.com", "a", "h/")
+
+    rows = await outbox_rows(session)
+    assert [(r.kind, r.payload.get("password_hash")) for r in rows] == [
+        ("reset_password", "t2"),
+        ("verify", None),
+    ]
+
+
+def new_user():
+    return UserCreate(
+        id=1,
+        username="alice",
+        email="a@example.com",
+        avatar="http://client/avatar.png",
+        password="secret",
+    )
+
+
+@pytest.mark.asyncio
+async def test_register_commits_user_and_verification_email(session):
+    await register_user(new_user(), MagicMock(base_url="http://h/"), session)
+    await session.rollback()
+
+    users = (await session.execute(select(User.email))).scalars().all()
+    rows = await outbox_rows(session)
+    assert users == ["a@example.com"]
+    assert [(r.kind, r.recipient) for r in rows] == [("verify", "a@example.com")]
+
+
+@pytest.mark.asyncio
+async def test_register_writes_no_user_when_email_is_not_queued(session, monkeypatch):
+    enqueue = AsyncMock(side_effect=ConnectionError("database is gone"))
+    monkeypatch.setattr(OutboxRepository, "enqueue", enqueue)
+
+    with pytest.raises(ConnectionError):
+        await register_user(new_user(), MagicMock(base_url="http://h/"), session)
+    await session.rollback()
+
+    assert (await session.execute(select(User))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_process_batch_sends_and_marks_emails(session):
+    service = OutboxService(session)
+    pool = RecordingPool()
+    await service.enqueue_verification_email("a@example.com", "a", "http://h/")
+    await service.enqueue_reset_password_email("b@example.com", "b", "http://h/", "t")
+
+    result = await service.process_batch(pool)
+
+    assert result == {"claimed": 2, "sent": 2, "failed": 0}
+    assert [m["To"] for m in pool.messages] == ["a@example.com", "b@example.com"]
+    rows = await outbox_rows(session)
+    assert all(r.status == OutboxStatus.SENT and r.sent_at for r in rows)
+    assert all(r.payload == {} for r in rows)
+    assert await service.process_batch(pool) == {"claimed": 0, "sent": 0, "failed": 0}
+    assert await service.stats() == {"pending": 0, "sent": 2, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_enqueue_after_sent_creates_new_email(session):
+    service = OutboxService(session)
+    await service.enqueue_verification_email("a@example.com", "a", "http://h/")
+    await service.process_batch(RecordingPool())
+
+    await service.enqueue_verification_email("a@example.com", "a", "http://h/")
+
+    assert await service.stats() == {"pending": 1, "sent": 1, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_failed_email_is_retried_with_backoff_then_given_up(session):
+    service = OutboxService(session)
+    pool = RecordingPool(fail_for={"a@example.com"})
+    await service.enqueue_verification_email("a@example.com", "a", "http://h/")
+    before = datetime.now(UTC).replace(tzinfo=None)
+
+    assert await service.process_batch(pool) == {"claimed": 1, "sent": 0, "failed": 1}
+
+    (row,) = await outbox_rows(session)
+    assert row.status == OutboxStatus.PENDING
+    assert row.attempts == 1
+    assert "SMTP server is down" in row.last_error
+    assert row.next_attempt_at.replace(tzinfo=None) >= before + retry_delay(1)
+    assert (await service.process_batch(pool))["claimed"] == 0
+
+    await make_due(session)
+    await service.process_batch(pool)
+
+    (row,) = await outbox_rows(session)
+    assert row.status == OutboxStatus.FAILED
+    assert row.attempts == 2
+    assert row.payload == {}
+
+
+@pytest.mark.asyncio
+async def test_claimed_emails_are_leased(session):
+    repository = OutboxRepository(session)
+    service = OutboxService(session)
+    await service.enqueue_verification_email("a@example.com", "a", "http://h/")
+    now = datetime.now(UTC)
+
+    assert len(await repository.claim(10, now, 60)) == 1
+    assert await repository.claim(10, now, 60) == []
+    assert len(await repository.claim(10, now + timedelta(seconds=61), 60)) == 1
+
+
+@pytest.mark.asyncio
+async def test_email_enqueued_again_while_sending_is_not_marked_sent(session):
+    repository = OutboxRepository(session)
+    service = OutboxService(session)
+    await service.enqueue_reset_password_email("a@example.com", "a", "h/", "old")
+    now = datetime.now(UTC)
+    claimed = await repository.claim(10, now, 60)
+
+    await service.enqueue_reset_password_email("a@example.com", "a", "h/", "new")
+    await repository.complete(claimed, [], now)
+
+    (row,) = await outbox_rows(session)
+    assert row.status == OutboxStatus.PENDING
+    assert row.payload["password_hash"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_only_old_finished_emails(monkeypatch, session):
+    monkeypatch.setattr(config, "OUTBOX_RETENTION_DAYS", 7)
+    service = OutboxService(session)
+    for recipient in ("old@example.com", "new@example.com", "due@example.com"):
+        await service.enqueue_verification_email(recipient, "a", "http://h/")
+    await service.process_batch(RecordingPool())
+    await service.enqueue_verification_email("due@example.com", "a", "http://h/")
+    for row in await outbox_rows(session):
+        if row.recipient != "new@example.com":
+            row.created_at = datetime.now(UTC) - timedelta(days=8)
+    await session.commit()
+
+    assert await service.purge(batch_size=1) == 2
+
+    rows = await outbox_rows(session)
+    assert [(r.recipient, r.status) for r in rows] == [
+        ("new@example.com", OutboxStatus.SENT),
+        ("due@example.com", OutboxStatus.PENDING),
+    ]
+
+
+def test_retry_delay_doubles_and_is_capped(monkeypatch):
+    monkeypatch.setattr(config, "OUTBOX_BACKOFF_BASE", 30)
+    monkeypatch.setattr(config, "OUTBOX_BACKOFF_MAX", 100)
+
+    assert [retry_delay(n).total_seconds() for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
@@ -0,0 +1,95 @@
+import logging
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.config.config import config
+from src.database.db import QueryStats, instrument_engine, query_stats
+from src.services.metrics import QueryStatsMiddleware
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = instrument_engine(
+        create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def client(engine):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/items/{count}")
+    async def items(count: int):
+        async with engine.connect() as conn:
+            for _ in range(count):
+                await conn.execute(text("SELECT 1"))
+        return {"count": count}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_statements_are_counted_per_request(client):
+    first = await client.get("/items/3")
+    second = await client.get("/items/0")
+
+    assert first.headers["Server-Timing"].startswith("db;dur=")
+    assert 'desc="3 queries"' in first.headers["Server-Timing"]
+    assert 'desc="0 queries"' in second.headers["Server-Timing"]
+    assert "app;dur=" in second.headers["Server-Timing"]
+
+
+@pytest.mark.asyncio
+async def test_requests_with_many_statements_are_logged(monkeypatch, caplog, client):
+    monkeypatch.setattr(config, "DB_QUERY_COUNT_WARNING", 2)
+
+    with caplog.at_level(logging.WARNING, logger="src.services.metrics"):
+        await client.get("/items/2")
+        await client.get("/items/3")
+
+    assert [r.getMessage().split(" in ")[0] for r in caplog.records] == [
+        "GET /items/{count} ran 3 queries"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_slow_statements_are_logged_with_route(monkeypatch, caplog, client):
+    monkeypatch.setattr(config, "DB_SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger="src.database.db"):
+        await client.get("/items/1")
+
+    assert len(caplog.records) == 1
+    assert "in GET /items/{count}: SELECT 1" in caplog.records[0].getMessage()
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_do_not_break_timing(engine):
+    stats = QueryStats({"method": "GET", "path": "/"})
+    token = query_stats.set(stats)
+    try:
+        async with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM missing"))
+            await conn.execute(text("SELECT 1"))
+            assert not conn.sync_connection.info["query_started"]
+    finally:
+        query_stats.reset(token)
+
+    assert stats.count == 1
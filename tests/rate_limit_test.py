@@ -0,0 +1,160 @@
+import pytest
+import pytest_asyncio
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from fastapi import Depends, FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from jose import jwt
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.config.config import config
+from src.services import rate_limit
+from src.services.rate_limit import (
+    RateLimit,
+    RateLimiter,
+    RateLimitExceeded,
+    RateLimitMiddleware,
+    rate_limited_response,
+)
+
+
+class Clock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(config, "JWT_SECRET", "secret")
+    monkeypatch.setattr(config, "JWT_ALGORITHM", "HS256")
+    monkeypatch.setattr(config, "RATE_LIMIT_ENABLED", True)
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def limiter(server, clock):
+    return RateLimiter(FakeRedis(server=server), clock=clock)
+
+
+@pytest_asyncio.fixture
+async def client(monkeypatch, limiter):
+    monkeypatch.setattr(rate_limit, "get_rate_limiter", lambda: limiter)
+    app = FastAPI()
+    app.add_middleware(
+        RateLimitMiddleware, rate="5/minute", exempt=["/health"], limiter=limiter
+    )
+
+    @app.exception_handler(RateLimitExceeded)
+    async def handler(request: Request, exc: RateLimitExceeded):
+        return rate_limited_response(exc.result)
+
+    @app.get("/items")
+    async def items():
+        return {"ok": True}
+
+    @app.get("/me", dependencies=[Depends(RateLimit("2/minute", "me"))])
+    async def me():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    transport = ASGITransport(app=app, client=("10.0.0.1", 1234))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+def bearer(uid: int) -> dict:
+    token = jwt.encode({"sub": f"user{uid}", "uid": uid}, "secret", algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_burst_is_allowed_then_limited_until_refill(limiter, clock):
+    results = [await limiter.hit("ip:1", "3/minute") for _ in range(4)]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results] == [2, 1, 0, 0]
+    assert results[3].retry_after == pytest.approx(20)
+    assert results[2].reset_after == pytest.approx(60)
+
+    clock.now += 19.9
+    assert not (await limiter.hit("ip:1", "3/minute")).allowed
+    clock.now += 0.1
+    assert (await limiter.hit("ip:1", "3/minute")).allowed
+    assert limiter.stats() == {"allowed": 4, "limited": 2, "errors": 0}
+
+
+@pytest.mark.asyncio
+async def test_limit_is_shared_between_limiters(server, clock):
+    first = RateLimiter(FakeRedis(server=server), clock=clock)
+    second = RateLimiter(FakeRedis(server=server), clock=clock)
+
+    assert (await first.hit("user:1", "2/second")).allowed
+    assert (await second.hit("user:1", "2/second")).allowed
+    assert not (await first.hit("user:1", "2/second")).allowed
+    assert (await second.hit("user:2", "2/second")).allowed
+    assert (await second.hit("user:1", "2/second", scope="other")).allowed
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fail_open(clock):
+    class BrokenRedis(FakeRedis):
+        async def evalsha(self, *args, **kwargs):
+            raise RedisConnectionError("Redis is down")
+
+    limiter = RateLimiter(BrokenRedis(server=FakeServer()), clock=clock, retry=60)
+
+    assert await limiter.hit("ip:1", "1/minute") is None
+    assert await limiter.hit("ip:1", "1/minute") is None
+    assert limiter.stats()["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_limits_per_address_and_user(client):
+    responses = [await client.get("/items") for _ in range(6)]
+
+    assert [r.status_code for r in responses] == [200] * 5 + [429]
+    assert responses[0].headers["X-RateLimit-Limit"] == "5"
+    assert responses[0].headers["X-RateLimit-Remaining"] == "4"
+    assert responses[5].json() == {
+        "error": "Request limit exceeded. Please try again later."
+    }
+    assert responses[5].headers["Retry-After"] == "12"
+    assert (await client.get("/items", headers=bearer(1))).status_code == 200
+    assert (await client.get("/health")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_route_limit_applies_on_top_of_default(client):
+    headers = bearer(7)
+    responses = [await client.get("/me", headers=headers) for _ in range(3)]
+
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert "Retry-After" in responses[2].headers
+    assert (await client.get("/items", headers=headers)).status_code == 200
+
+
+def test_invalid_token_is_counted_by_address():
+    conn = rate_limit.HTTPConnection(
+        {
+            "type": "http",
+            "headers": [(b"authorization", b"Bearer not-a-token")],
+            "client": ("10.0.0.2", 1),
+        }
+    )
+
+    assert rate_limit.rate_limit_key(conn) == "ip:10.0.0.2"
@@ -0,0 +1,37 @@
+from typing import List
+
+import pytest
+from sqlalchemy import event
+
+
+class StatementLog(list):
+    """
+    SQL statements sent by an engine, in order.
+    Lets tests assert the round trips of a repository method, e.g.
+    ``assert statements.verbs == ["UPDATE"]``.
+    """
+
+    @property
+    def verbs(self) -> List[str]:
+        """
+        Get the first keyword of every statement.
+        Returns:
+        - List[str]: Keywords such as SELECT, INSERT, UPDATE or DELETE.
+        """
+        return [statement.split(None, 1)[0].upper() for statement in self]
+
+
+@pytest.fixture
+def statements(engine):
+    """
+    Record the SQL statements sent by the engine of the test module.
+    Statements of the fixtures that ran before are not included.
+    """
+    log = StatementLog()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        log.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield log
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
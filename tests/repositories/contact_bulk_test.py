@@ -0,0 +1,135 @@
+from datetime import date
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.database.models import Base, Contact, User
+from src.schemas.schemas import ContactBulkUpdate, ContactSelection
+from src.services.contacts import BIRTHDAYS_GENERATION_TTL, ContactService
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    cache = MagicMock(set=AsyncMock())
+    monkeypatch.setattr("src.services.contacts.get_cache", lambda: cache)
+    return cache
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session(engine):
+    async with async_sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def contacts(session):
+    owner = User(username="owner", email="owner@example.com", role="user")
+    other = User(username="other", email="other@example.com", role="user")
+    session.add_all([owner, other])
+    await session.commit()
+    rows = [
+        Contact(
+            name="Ann" if i % 2 else "Bob",
+            last_name=f"Last{i}",
+            email=f"c{i}@example.com",
+            phone=f"000-{i}",
+            birthday=date(1990, 1, i),
+            user=owner if i <= 6 else other,
+        )
+        for i in range(1, 9)
+    ]
+    session.add_all(rows)
+    await session.commit()
+    return owner
+
+
+async def contact_rows(session):
+    session.expire_all()
+    result = await session.execute(select(Contact).order_by(Contact.id))
+    return {row.id: row for row in result.scalars().all()}
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_sets_passed_fields_of_own_contacts(
+    session, contacts, statements, cache
+):
+    owner = contacts
+    key = f"birthdays_generation:{owner.id}"
+    body = ContactBulkUpdate(
+        ids=[1, 2, 3, 7], changes={"phone": "111", "additional_data": None}
+    )
+
+    result = await ContactService(session).bulk_update_contacts(body, owner)
+
+    assert (result.count, result.ids) == (3, [1, 2, 3])
+    assert statements.verbs == ["UPDATE"]
+    updated = await contact_rows(session)
+    assert [updated[i].phone for i in range(1, 9)] == ["111"] * 3 + [
+        f"000-{i}" for i in range(4, 9)
+    ]
+    assert updated[1].last_name == "Last1"
+    cache.set.assert_awaited_once_with(key, ANY, ttl=BIRTHDAYS_GENERATION_TTL)
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_by_filter_and_ids(session, contacts, statements):
+    owner = contacts
+    service = ContactService(session)
+
+    by_filter = await service.bulk_delete_contacts(
+        ContactSelection(filters={"name": "an"}), owner
+    )
+    by_both = await service.bulk_delete_contacts(
+        ContactSelection(ids=[2, 4, 8], filters={"last_name": "last4"}), owner
+    )
+
+    assert by_filter.ids == [1, 3, 5]
+    assert by_both.ids == [4]
+    assert statements.verbs == ["DELETE", "DELETE"]
+    assert sorted(await contact_rows(session)) == [2, 6, 7, 8]
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_without_matches_keeps_cache(session, contacts, cache):
+    owner = contacts
+
+    result = await ContactService(session).bulk_delete_contacts(
+        ContactSelection(ids=[7, 8]), owner
+    )
+
+    assert (result.count, result.ids) == (0, [])
+    cache.set.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"changes": {"phone": "1"}},
+        {"ids": [], "changes": {"phone": "1"}},
+        {"filters": {"name": ""}, "changes": {"phone": "1"}},
+        {"ids": [1], "changes": {}},
+        {"ids": [1], "changes": {"email": "a@example.com"}},
+        {"ids": [1], "changes": {"name": None}},
+    ],
+)
+def test_bulk_update_rejects_invalid_body(body):
+    with pytest.raises(ValidationError):
+        ContactBulkUpdate.model_validate(body)
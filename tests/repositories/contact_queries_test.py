@@ -0,0 +1,293 @@
+import re
+
+import pytest
+import pytest_asyncio
+from datetime import date
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.database.models import Base, Contact, User
+from src.repository.contacts import ContactRepository
+from src.schemas.schemas import ContactBase, ContactUpdate
+from src.services.contacts import ContactService
+from src.services.pagination import decode_cursor, encode_cursor
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session(engine):
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_maker() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def users(session):
+    owner = User(username="owner", email="owner@example.com", role="user")
+    other = User(username="other", email="other@example.com", role="user")
+    session.add_all([owner, other])
+    await session.commit()
+    return owner, other
+
+
+@pytest_asyncio.fixture
+async def contacts(session, users):
+    owner, other = users
+    rows = [
+        Contact(
+            name=f"Name{i}",
+            last_name=f"Last{i}",
+            email=f"contact{i}@example.com",
+            phone=f"000-{i}",
+            birthday=date(1990, 1, 1),
+            user=owner if i % 2 else other,
+        )
+        for i in range(1, 12)
+    ]
+    session.add_all(rows)
+    await session.commit()
+    return [row for row in rows if row.user_id == owner.id]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(0.5, 42)
+
+    assert decode_cursor(cursor, 2) == [0.5, 42]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor("a", "b")])
+def test_decode_cursor_invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_after(session, users, contacts):
+    repository = ContactRepository(session)
+
+    result = await repository.get_contacts_after(2, contacts[1].id, users[0])
+
+    assert [c.id for c in result] == [c.id for c in contacts[2:4]]
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_page_walks_all_pages(session, users, contacts):
+    service = ContactService(session)
+    seen, cursor = [], ""
+
+    while True:
+        page = await service.get_contacts_page(4, cursor, users[0])
+        seen.extend(item.id for item in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == [c.id for c in contacts]
+
+
+@pytest.mark.asyncio
+async def test_search_contacts_substring_is_case_insensitive(session, users, contacts):
+    repository = ContactRepository(session)
+
+    result = await repository.search_contacts({"email": "CONTACT11@"}, users[0])
+
+    assert [c.email for c in result] == ["contact11@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_search_contacts_escapes_wildcards(session, users, contacts):
+    repository = ContactRepository(session)
+
+    result = await repository.search_contacts({"name": "%"}, users[0])
+
+    assert result == []
+
+
+@pytest.mark.asyncio
+async def test_search_contacts_is_scoped_to_user(session, users, contacts):
+    repository = ContactRepository(session)
+
+    result = await repository.search_contacts({"email": "@example.com"}, users[0])
+
+    assert [c.id for c in result] == [c.id for c in contacts]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("field", ["email", "last_name", "name"])
+async def test_search_contacts_uses_index(session, users, contacts, field):
+    repository = ContactRepository(session)
+    stmt = repository._search_stmt({field: "x"}, users[0], 10)
+    sql = stmt.compile(session.bind, compile_kwargs={"literal_binds": True})
+
+    result = await session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    plan = " ".join(row[-1] for row in result.all())
+
+    # Substring filters cannot use a btree, only the (user_id, ...) prefix of
+    # the owner indexes can; PostgreSQL adds the pg_trgm GIN indexes.
+    assert re.search(r"USING INDEX ix_contacts_user_id_\w+ \(user_id=\?\)", plan)
+    assert "SCAN contacts" not in plan
+
+
+@pytest.mark.asyncio
+async def test_search_contacts_page_walks_all_pages(session, users, contacts):
+    service = ContactService(session)
+    filters = {"email": "@example.com", "name": None, "last_name": None}
+    seen, cursor = [], ""
+
+    while True:
+        page = await service.search_contacts_page(filters, users[0], 4, cursor)
+        seen.extend(item.id for item in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen))
+
+
+@pytest_asyncio.fixture
+async def birthdays(session, users):
+    owner = users[0]
+    rows = {
+        day: Contact(
+            name="Birthday",
+            last_name=day.isoformat(),
+            email=f"{day.isoformat()}@example.com",
+            phone="000",
+            birthday=day,
+            user=owner,
+        )
+        for day in [
+            date(1980, 12, 30),
+            date(1991, 1, 2),
+            date(1992, 2, 29),
+            date(1985, 3, 1),
+            date(1970, 6, 15),
+        ]
+    }
+    session.add_all(rows.values())
+    await session.commit()
+    return rows
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "today, days, expected",
+    [
+        (date(2026, 12, 28), 7, [date(1980, 12, 30), date(1991, 1, 2)]),
+        (date(2027, 2, 21), 7, [date(1992, 2, 29)]),
+        (date(2028, 2, 21), 7, []),
+        (date(2028, 2, 23), 7, [date(1992, 2, 29), date(1985, 3, 1)]),
+        (date(2026, 6, 15), 0, [date(1970, 6, 15)]),
+    ],
+)
+async def test_get_upcoming_birthdays(session, users, birthdays, today, days, expected):
+    repository = ContactRepository(session)
+
+    result = await repository.get_upcoming_birthdays(users[0], 100, days, today)
+
+    assert [c.birthday for c in result] == expected
+
+
+@pytest.mark.asyncio
+async def test_get_upcoming_birthdays_whole_year(session, users, birthdays):
+    repository = ContactRepository(session)
+
+    result = await repository.get_upcoming_birthdays(
+        users[0], 100, 365, date(2026, 6, 16)
+    )
+
+    assert [c.birthday for c in result][:2] == [date(1980, 12, 30), date(1991, 1, 2)]
+    assert len(result) == len(birthdays)
+
+
+@pytest.mark.asyncio
+async def test_update_contact_is_one_statement(session, users, contacts, statements):
+    owner, _ = users
+    contact = contacts[0]
+    repository = ContactRepository(session)
+
+    updated = await repository.update_contact(
+        contact.id, ContactUpdate(phone="111", additional_data=None), owner
+    )
+
+    assert statements.verbs == ["UPDATE"]
+    assert (updated.id, updated.phone, updated.additional_data) == (
+        contact.id,
+        "111",
+        None,
+    )
+    assert (updated.name, updated.email) == (contact.name, contact.email)
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_contact_of_other_user(
+    session, users, contacts, statements
+):
+    _, other = users
+    repository = ContactRepository(session)
+
+    assert (
+        await repository.update_contact(
+            contacts[0].id, ContactUpdate(phone="111"), other
+        )
+        is None
+    )
+    assert await repository.delete_contact(contacts[0].id, other) is None
+    assert statements.verbs == ["UPDATE", "DELETE"]
+    assert await repository.get_contact_by_id(contacts[0].id, users[0]) is not None
+
+
+@pytest.mark.asyncio
+async def test_delete_contact_is_one_statement(session, users, contacts, statements):
+    owner, _ = users
+    contact = contacts[0]
+    repository = ContactRepository(session)
+
+    deleted = await repository.delete_contact(contact.id, owner)
+
+    assert statements.verbs == ["DELETE"]
+    assert (deleted.id, deleted.email) == (contact.id, contact.email)
+    assert await repository.get_contact_by_id(contact.id, owner) is None
+
+
+def test_contact_update_rejects_null_required_fields():
+    assert ContactUpdate(additional_data=None).model_dump(exclude_unset=True) == {
+        "additional_data": None
+    }
+    with pytest.raises(ValidationError):
+        ContactUpdate(email=None)
+
+
+@pytest.mark.asyncio
+async def test_create_contact_is_one_statement(session, users, statements):
+    owner, _ = users
+
+    contact = await ContactRepository(session).create_contact(
+        ContactBase(
+            name="New",
+            last_name="Contact",
+            email="new@example.com",
+            phone="123",
+            birthday=date(1992, 2, 29),
+        ),
+        owner,
+    )
+
+    assert statements.verbs == ["INSERT"]
+    assert contact.id is not None
+    assert (contact.user_id, contact.birthday_md) == (owner.id, 229)
@@ -0,0 +1,51 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.database.models import Base, UserRole
+from src.repository.users import UserRepository
+from src.schemas.auth import UserCreate
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session(engine):
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_maker() as session:
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_create_user_is_one_statement(session, statements):
+    body = UserCreate(
+        id=42,
+        username="jack",
+        email="jack@example.com",
+        avatar="http://client/avatar.png",
+        password="hashed",
+    )
+
+    user = await UserRepository(session).create_user(body, "http://gravatar/jack")
+
+    assert statements.verbs == ["INSERT"]
+    assert user.id == 1
+    assert (user.username, user.hashed_password, user.avatar) == (
+        "jack",
+        "hashed",
+        "http://gravatar/jack",
+    )
+    assert (user.confirmed, user.role) == (False, UserRole.USER)
+    assert user.created_at is not None
@@ -0,0 +1,148 @@
+import json
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.config.config import config
+from src.services.tracing import TracingMiddleware, setup_tracing, traced
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+@pytest.fixture(scope="module")
+def spans(tmp_path_factory):
+    path = tmp_path_factory.mktemp("tracing") / "traces.jsonl"
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(config, "TRACING_ENABLED", True)
+        monkeypatch.setattr(config, "TRACING_SAMPLE_RATIO", 1.0)
+        monkeypatch.setattr(config, "TRACING_EXPORTER", "file")
+        monkeypatch.setattr(config, "TRACING_FILE", str(path))
+        provider = setup_tracing()
+
+    def read():
+        provider.force_flush()
+        with open(path, encoding="utf-8") as file:
+            spans = [json.loads(line) for line in file]
+        path.write_text("")
+        return {span["name"]: span for span in spans}
+
+    return read
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    yield engine
+    await engine.dispose()
+
+
+def items_service(monkeypatch, engine):
+    monkeypatch.setattr(config, "TRACING_ENABLED", True)
+
+    @traced("service")
+    class ItemService:
+        async def get_item(self, id: int) -> int:
+            async with engine.connect() as conn:
+                return (await conn.execute(text("SELECT :id"), {"id": id})).scalar()
+
+        async def _helper(self):
+            pass
+
+    return ItemService
+
+
+@pytest.mark.asyncio
+async def test_request_spans_nest_across_layers(monkeypatch, spans, engine):
+    spans()
+    service = items_service(monkeypatch, engine)
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/items/{id}")
+    async def item(id: int):
+        return {"id": await service().get_item(id)}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/items/5",
+            headers={"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01"},
+        )
+
+    assert response.json() == {"id": 5}
+    exported = spans()
+    server = exported["GET /items/{id}"]
+    method = exported["service ItemService.get_item"]
+    query = exported["SELECT"]
+    assert server["context"]["trace_id"] == f"0x{TRACE_ID}"
+    assert server["parent_id"] == "0x00f067aa0ba902b7"
+    assert server["attributes"]["http.route"] == "/items/{id}"
+    assert server["attributes"]["http.response.status_code"] == 200
+    assert method["parent_id"] == server["context"]["span_id"]
+    assert query["parent_id"] == method["context"]["span_id"]
+    assert query["attributes"] == {"db.system": "sqlite", "db.statement": "SELECT ?"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "ratio, headers",
+    [
+        (0.0, {}),
+        (1.0, {"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-00"}),
+    ],
+)
+async def test_unsampled_requests_start_no_spans(
+    monkeypatch, spans, engine, ratio, headers
+):
+    spans()
+    service = items_service(monkeypatch, engine)
+    monkeypatch.setattr(config, "TRACING_SAMPLE_RATIO", ratio)
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/items/{id}")
+    async def item(id: int):
+        return {"id": await service().get_item(id)}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/items/5", headers=headers)
+
+    assert response.json() == {"id": 5}
+    assert spans() == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_span_records_error(spans, engine):
+    spans()
+    async with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            await conn.execute(text("SELECT * FROM missing"))
+
+    query = spans()["SELECT"]
+    assert query["status"]["status_code"] == "ERROR"
+    assert query["events"][0]["name"] == "exception"
+
+
+def test_private_methods_and_disabled_tracing_are_not_wrapped(monkeypatch, engine):
+    service = items_service(monkeypatch, engine)
+    monkeypatch.setattr(config, "TRACING_ENABLED", False)
+
+    @traced("service")
+    class Plain:
+        async def get_item(self):
+            pass
+
+    assert service.get_item.__wrapped__
+    assert not hasattr(service._helper, "__wrapped__")
+    assert not hasattr(Plain.get_item, "__wrapped__")
@@ -0,0 +1,136 @@
+import io
+import threading
+
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+
+from src.services import uplaod
+from src.services.uplaod import (
+    CloudinaryStorage,
+    FileTooLargeError,
+    InvalidImageError,
+    LocalStorage,
+    UploadFileService,
+    resize_avatar,
+)
+
+
+class CountingFile(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def upload_file(data: bytes, size=None) -> UploadFile:
+    return UploadFile(CountingFile(data), size=size, filename="avatar.png")
+
+
+def image_bytes(width: int, height: int, image_format: str, mode="RGB") -> bytes:
+    out = io.BytesIO()
+    color = (255, 0, 0, 128) if mode == "RGBA" else "red"
+    Image.new(mode, (width, height), color).save(out, format=image_format)
+    return out.getvalue()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(str(tmp_path / "avatars"), "/media/avatars/")
+
+
+@pytest.mark.asyncio
+async def test_local_storage_writes_file(storage, tmp_path):
+    service = UploadFileService(storage, 1024 * 1024)
+
+    url = await service.upload_file(
+        upload_file(image_bytes(800, 600, "JPEG")), "testuser"
+    )
+
+    assert url == "/media/avatars/RestApp_testuser.webp"
+    with Image.open(tmp_path / "avatars" / "RestApp_testuser.webp") as img:
+        assert img.format == "WEBP"
+        assert img.size == (250, 250)
+
+
+@pytest.mark.parametrize(
+    "source, image_format, expected_mode",
+    [
+        (("PNG", "RGBA"), "webp", "RGBA"),
+        (("PNG", "RGBA"), "jpeg", "RGB"),
+        (("GIF", "P"), "webp", "RGB"),
+        (("JPEG", "RGB"), "jpeg", "RGB"),
+    ],
+)
+def test_resize_avatar_crops_and_reencodes(source, image_format, expected_mode):
+    data = image_bytes(300, 1200, *source)
+
+    result = resize_avatar(data, 100, image_format, 80)
+
+    with Image.open(io.BytesIO(result)) as img:
+        assert img.format == image_format.upper()
+        assert img.size == (100, 100)
+        assert img.mode == expected_mode
+
+
+def test_resize_avatar_rejects_non_images():
+    with pytest.raises(InvalidImageError):
+        resize_avatar(b"not an image", 100, "webp", 80)
+
+
+def test_resize_avatar_rejects_huge_images(monkeypatch):
+    monkeypatch.setattr(uplaod, "MAX_PIXELS", 100)
+
+    with pytest.raises(InvalidImageError):
+        resize_avatar(image_bytes(20, 20, "PNG"), 10, "webp", 80)
+
+
+@pytest.mark.asyncio
+async def test_upload_stops_reading_when_too_large(storage, tmp_path):
+    service = UploadFileService(storage, 10)
+    service.CHUNK_SIZE = 4
+    file = upload_file(b"x" * 100)
+
+    with pytest.raises(FileTooLargeError):
+        await service.upload_file(file, "testuser")
+
+    assert file.file.reads == 3
+    assert not (tmp_path / "avatars").exists()
+
+
+@pytest.mark.asyncio
+async def test_upload_rejects_declared_size(storage):
+    service = UploadFileService(storage, 10)
+    file = upload_file(b"x", size=11)
+
+    with pytest.raises(FileTooLargeError):
+        await service.upload_file(file, "testuser")
+
+    assert file.file.reads == 0
+
+
+@pytest.mark.asyncio
+async def test_cloudinary_upload_runs_in_worker_pool(monkeypatch):
+    calls = []
+
+    def upload(data, **kwargs):
+        calls.append((data, kwargs, threading.current_thread().name))
+        return {"version": 7}
+
+    monkeypatch.setattr(uplaod.cloudinary.uploader, "upload", upload)
+    storage = CloudinaryStorage("demo", "key", "secret")
+
+    url = await storage.save(b"avatar", "RestApp/testuser", "webp")
+
+    data, kwargs, thread = calls[0]
+    assert data == b"avatar"
+    assert kwargs == {
+        "public_id": "RestApp/testuser",
+        "overwrite": True,
+        "format": "webp",
+    }
+    assert thread.startswith("avatar_upload")
+    assert url.endswith("v7/RestApp/testuser.webp")
@@ -0,0 +1,142 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from aiocache import SimpleMemoryCache
+from fastapi import HTTPException
+
+from src.database.models import User, UserRole
+from src.services import auth
+from src.services.cache import (
+    LocalTTLCache,
+    get_cached_user,
+    invalidate_user,
+    user_from_snapshot,
+    user_local_cache,
+    user_to_snapshot,
+)
+from src.services.users import UserService
+
+
+@pytest.fixture
+def user():
+    return User(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        avatar="https://example.com/avatar.jpg",
+        confirmed=True,
+        role=UserRole.ADMIN,
+        created_at=datetime(2025, 1, 1, 12, 0),
+        hashed_password="secret-hash",
+    )
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SimpleMemoryCache()
+    monkeypatch.setattr("src.services.cache.get_cache", lambda: cache)
+    user_local_cache.clear()
+    return cache
+
+
+@pytest.fixture
+def token_payload(monkeypatch, user):
+    payload = {"sub": user.username, "uid": user.id}
+    monkeypatch.setattr("src.services.auth.jwt.decode", MagicMock(return_value=payload))
+    return payload
+
+
+@pytest.fixture
+def get_user_by_username(monkeypatch, user):
+    mock = AsyncMock(return_value=user)
+    monkeypatch.setattr(UserService, "get_user_by_username", mock)
+    return mock
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_local_cache_expires_entries():
+    cache = LocalTTLCache(maxsize=2, ttl=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+def test_snapshot_round_trip_drops_password(user):
+    snapshot = user_to_snapshot(user)
+    restored = user_from_snapshot(snapshot)
+
+    assert "hashed_password" not in snapshot
+    assert restored.id == user.id
+    assert restored.role == UserRole.ADMIN
+    assert restored.created_at == user.created_at
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_hits_database_once(
+    cache, token_payload, get_user_by_username
+):
+    first = await auth.get_current_user("token", AsyncMock())
+    second = await auth.get_current_user("token", AsyncMock())
+
+    assert first.id == second.id == token_payload["uid"]
+    get_user_by_username.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_uses_redis_tier(
+    cache, token_payload, get_user_by_username
+):
+    await auth.get_current_user("token", AsyncMock())
+    user_local_cache.clear()
+
+    await auth.get_current_user("token", AsyncMock())
+
+    get_user_by_username.assert_awaited_once()
+    assert await get_cached_user(token_payload["uid"]) is not None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_user_forces_reload(
+    cache, token_payload, get_user_by_username
+):
+    await auth.get_current_user("token", AsyncMock())
+    await invalidate_user(token_payload["uid"])
+
+    await auth.get_current_user("token", AsyncMock())
+
+    assert get_user_by_username.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_update_avatar_invalidates_user(cache, user):
+    user_service = UserService(AsyncMock())
+    user_service.repository.update_avatar_url = AsyncMock(return_value=user)
+    await cache.set("user:1", user_to_snapshot(user))
+
+    await user_service.update_avatar_url(user.email, "https://example.com/new.jpg")
+
+    assert await get_cached_user(user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_unknown_user(cache, token_payload, monkeypatch):
+    monkeypatch.setattr(
+        UserService, "get_user_by_username", AsyncMock(return_value=None)
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await auth.get_current_user("token", AsyncMock())
+
+    assert exc_info.value.status_code == 401
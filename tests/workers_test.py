@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.services.auth import Hash
+from src.services.workers import WorkerPool, get_worker_stats
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool("test", 2)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result_from_worker_thread(pool):
+    result = await pool.run(
+        lambda a, b=0: (a + b, threading.current_thread().name), 1, b=2
+    )
+
+    assert result[0] == 3
+    assert result[1].startswith("test")
+
+
+@pytest.mark.asyncio
+async def test_run_propagates_exceptions(pool):
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await pool.run(fail)
+
+    assert pool.stats()["completed"] == 1
+    assert pool.stats()["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_and_queue_depth_recorded(pool):
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    await asyncio.gather(*(pool.run(work) for _ in range(6)))
+    stats = pool.stats()
+
+    assert peak == 2
+    assert stats["pending"] == 0
+    assert stats["pending_max"] >= 4
+    assert stats["completed"] == 6
+    assert stats["wait_time_max"] > 0
+    assert get_worker_stats()["test"] == stats
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_call_leaves_the_queue():
+    pool = WorkerPool("cancel_test", 1)
+    release = threading.Event()
+    try:
+        blocking = asyncio.create_task(pool.run(release.wait))
+        queued = asyncio.create_task(pool.run(lambda: None))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["pending"] == 1
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        release.set()
+        await blocking
+    finally:
+        release.set()
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert stats["pending"] == 0
+    assert stats["running"] == 0
+    assert stats["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_does_not_block_event_loop():
+    hash_handler = Hash()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    hashed = await hash_handler.get_password_hash("secret")
+    task.cancel()
+
+    assert ticks > 1
+    assert await hash_handler.verify_password("secret", hashed)
+    assert not await hash_handler.verify_password("wrong", hashed)